@@ -0,0 +1 @@
+"""Performance benchmarks for parsers and converters"""
@@ -0,0 +1,89 @@
+"""Synthetic mind map generator"""
+
+import random
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+from xmind_converter.models import MindMap, Node, TopicNode, DetachedNode, Relation
+
+LABEL_POOL = ["todo", "done", "P0", "P1", "P2", "blocked", "backend", "frontend", "infra", "research"]
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet "
+    "kilo lima mike november oscar papa quebec romeo sierra tango"
+).split()
+
+
+def generate_mindmap(
+    nodes: int,
+    depth: int = 8,
+    fanout: int = 10,
+    notes_density: float = 0.2,
+    labels_density: float = 0.3,
+    relation_count: int = 0,
+    detached_count: int = 0,
+    seed: Optional[int] = 0,
+) -> MindMap:
+    """Generate a synthetic mind map
+
+    Nodes are added breadth-first, so the tree is as shallow as the fan-out
+    allows while never exceeding ``depth`` levels.
+
+    Args:
+        nodes: Number of nodes in the topic tree (including the root)
+        depth: Maximum tree depth, counting the root as level 1
+        fanout: Maximum number of children per node
+        notes_density: Fraction of nodes that carry notes
+        labels_density: Fraction of nodes that carry one to three labels
+        relation_count: Number of relations between random nodes
+        detached_count: Number of detached nodes
+        seed: Random seed, for reproducible maps
+
+    Returns:
+        Generated MindMap
+    """
+    if nodes < 1:
+        raise ValueError("nodes must be at least 1")
+    capacity = sum(fanout**level for level in range(depth))
+    if nodes > capacity:
+        raise ValueError(f"depth={depth} and fanout={fanout} allow at most {capacity} nodes")
+
+    rng = random.Random(seed)
+    counter = 0
+
+    def make(node_class: type, level: int) -> Node:
+        nonlocal counter
+        counter += 1
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {counter}"
+        notes = None
+        if rng.random() < notes_density:
+            notes = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+        labels: List[str] = []
+        if rng.random() < labels_density:
+            labels = rng.sample(LABEL_POOL, rng.randint(1, 3))
+        return node_class(title=title, node_id=f"n{counter:08d}", notes=notes, labels=labels)
+
+    root = make(TopicNode, 1)
+    all_nodes: List[Node] = [root]
+    queue: Deque[Tuple[Node, int]] = deque([(root, 1)])
+    while len(all_nodes) < nodes:
+        parent, level = queue.popleft()
+        for _ in range(min(fanout, nodes - len(all_nodes))):
+            child = make(Node, level + 1)
+            parent.add_child(child)
+            all_nodes.append(child)
+            if level + 1 < depth:
+                queue.append((child, level + 1))
+
+    detached_nodes = [make(DetachedNode, 1) for _ in range(detached_count)]
+    all_nodes.extend(detached_nodes)
+
+    relations = []
+    for i in range(relation_count):
+        source, target = rng.choice(all_nodes), rng.choice(all_nodes)
+        relations.append(Relation(source.id, target.id, relation_id=f"r{i:08d}", title=rng.choice(WORDS)))
+
+    return MindMap(
+        title=f"Synthetic {nodes}",
+        topic_node=root,  # type: ignore[arg-type]
+        detached_nodes=detached_nodes,  # type: ignore[arg-type]
+        relations=relations,
+    )
@@ -0,0 +1,243 @@
+"""Benchmark runner for every parser and converter
+
+Usage:
+    python -m benchmarks.run --sizes 1000,100000 --output results.json
+    python -m benchmarks.run --compare baseline.json results.json --threshold 0.10
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from xmind_converter import json_backend
+from xmind_converter.core import CoreConverter
+from .generate import generate_mindmap
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+EXTENSIONS = {"xmind": "xmind", "csv": "csv", "md": "md", "html": "html", "json": "json", "sqlite": "sqlite"}
+#: Formats whose speed depends on the JSON backend
+JSON_FORMATS = ("json", "xmind")
+
+
+def measure(func: Callable[[], Any], repeat: int = 3, memory: bool = True) -> Dict[str, float]:
+    """Time a callable and optionally record its peak traced memory
+
+    Timing runs use no tracing; peak memory comes from one extra traced run.
+
+    Args:
+        func: Callable to measure
+        repeat: Number of timed runs
+        memory: Whether to record peak memory with tracemalloc
+
+    Returns:
+        Best and mean wall time in seconds, and peak memory in bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    peak = 0
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {"best": min(timings), "mean": sum(timings) / len(timings), "peak_bytes": peak}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    sizes: List[int],
+    formats: List[str],
+    repeat: int = 3,
+    memory: bool = True,
+    generator_options: Optional[Dict[str, Any]] = None,
+    backends: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Benchmark convert_to and parse for every format at every size
+
+    Args:
+        sizes: Node counts to generate
+        formats: Formats to benchmark
+        repeat: Number of timed runs per measurement
+        memory: Whether to record peak memory
+        generator_options: Extra keyword arguments for generate_mindmap
+        backends: JSON backends to compare for JSON and XMind (default: every installed backend)
+
+    Returns:
+        Machine-readable results
+    """
+    core = CoreConverter()
+    results: List[Dict[str, Any]] = []
+    backends = backends or json_backend.available_backends()
+    previous_backend = json_backend.get_backend()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for size in sizes:
+                mindmap = generate_mindmap(size, **(generator_options or {}))
+                for format_type in formats:
+                    output_path = os.path.join(tmpdir, f"bench_{size}.{EXTENSIONS[format_type]}")
+                    converter = core.converters[format_type]
+                    parser = core.parsers[format_type]
+
+                    for backend in backends if format_type in JSON_FORMATS else [None]:
+                        row = {"size": size, "format": format_type}
+                        if backend is not None:
+                            json_backend.set_backend(backend)
+                            row["backend"] = backend
+
+                        stats = measure(lambda m=mindmap: converter.convert_to(m, output_path), repeat, memory)
+                        output_bytes = os.path.getsize(output_path)
+                        results.append({**row, "operation": "convert_to", "bytes": output_bytes, **stats})
+                        _report(results[-1])
+
+                        stats = measure(lambda: parser.parse(output_path), repeat, memory)
+                        results.append({**row, "operation": "parse", "bytes": output_bytes, **stats})
+                        _report(results[-1])
+                        os.unlink(output_path)
+                del mindmap
+    finally:
+        json_backend.set_backend(previous_backend)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _report(row: Dict[str, Any]) -> None:
+    peak = f"{row['peak_bytes'] / 1e6:10.1f} MB" if row["peak_bytes"] else " " * 13
+    print(
+        f"{row['operation']:<11}{row['format']:<7}{row.get('backend') or '':<8}{row['size']:>10} nodes "
+        f"{row['best'] * 1000:12.1f} ms {peak}",
+        file=sys.stderr,
+    )
+
+
+def _key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(row.get(name) for name in ("size", "format", "operation", "backend"))
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Compare two result files
+
+    Args:
+        old: Baseline results
+        new: New results
+        threshold: Relative slowdown (or memory growth) above which a row is a regression
+
+    Returns:
+        One row per measurement present in both files
+    """
+    baseline = {_key(row): row for row in old["results"]}
+    rows = []
+    for row in new["results"]:
+        base = baseline.get(_key(row))
+        if base is None:
+            continue
+        time_ratio = row["best"] / base["best"] if base["best"] else 1.0
+        memory_ratio = row["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] and row["peak_bytes"] else 1.0
+        rows.append(
+            {
+                "key": _key(row),
+                "old": base["best"],
+                "new": row["best"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": time_ratio > 1 + threshold or memory_ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark xmind-converter parsers and converters")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Node counts")
+    parser.add_argument("--formats", default=",".join(EXTENSIONS), help="Formats to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    parser.add_argument("--depth", type=int, default=8, help="Maximum tree depth")
+    parser.add_argument("--fanout", type=int, default=10, help="Maximum children per node")
+    parser.add_argument("--notes-density", type=float, default=0.2, help="Fraction of nodes with notes")
+    parser.add_argument("--labels-density", type=float, default=0.3, help="Fraction of nodes with labels")
+    parser.add_argument("--relations", type=int, default=100, help="Number of relations")
+    parser.add_argument("--backends", help="JSON backends to compare (default: every installed backend)")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold for --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], "r", encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.compare[1], "r", encoding="utf-8") as f:
+            new = json.load(f)
+        rows = compare(old, new, args.threshold)
+        for row in rows:
+            marker = "REGRESSION" if row["regression"] else ""
+            name = " ".join(str(part) for part in row["key"] if part is not None)
+            print(
+                f"{name:<32}{row['old'] * 1000:12.1f} ms {row['new'] * 1000:12.1f} ms "
+                f"x{row['time_ratio']:.2f} mem x{row['memory_ratio']:.2f} {marker}"
+            )
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    results = run_suite(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        formats=args.formats.split(","),
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        generator_options={
+            "depth": args.depth,
+            "fanout": args.fanout,
+            "notes_density": args.notes_density,
+            "labels_density": args.labels_density,
+            "relation_count": args.relations,
+        },
+        backends=args.backends.split(",") if args.backends else None,
+    )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
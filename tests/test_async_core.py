@@ -0,0 +1,90 @@
+"""Test asyncio front-end for CoreConverter"""
+
+import asyncio
+import os
+import tempfile
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from xmind_converter.async_core import AsyncCoreConverter
+from xmind_converter.exceptions import FileFormatError, ParserError
+
+
+@pytest.fixture
+def xmind_file():
+    """Get path to test XMind file"""
+    return os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+
+
+def test_load_from(xmind_file):
+    """Test async loading of an XMind file"""
+    converter = AsyncCoreConverter()
+    mindmap = asyncio.run(converter.load_from(xmind_file))
+    assert mindmap.title == "Sports Theme"
+    assert len(mindmap.topic_node.children) == 3
+
+
+def test_convert_to(xmind_file):
+    """Test async conversion of a loaded MindMap"""
+    converter = AsyncCoreConverter()
+
+    async def run(temp_file):
+        mindmap = await converter.load_from(xmind_file)
+        return await converter.convert_to(mindmap, "md", temp_file)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_file = os.path.join(tmpdir, "out.md")
+        result = asyncio.run(run(temp_file))
+        assert "Conversion completed" in result
+        with open(temp_file, "r", encoding="utf-8") as f:
+            assert "# Sports" in f.read()
+
+
+def test_loads_and_dumps(xmind_file):
+    """Test async in-memory loading and serialization"""
+    converter = AsyncCoreConverter()
+
+    async def run():
+        with open(xmind_file, "rb") as f:
+            mindmap = await converter.loads(f.read(), "xmind")
+        return await converter.dumps(mindmap, "md")
+
+    assert asyncio.run(run()).startswith("# Sports".encode("utf-8"))
+
+
+def test_concurrent_conversions_respect_limit(xmind_file):
+    """Test many simultaneous conversions with a concurrency limit"""
+    converter = AsyncCoreConverter(max_concurrency=2)
+
+    async def run(tmpdir):
+        jobs = [converter.convert(xmind_file, os.path.join(tmpdir, f"out{i}.json")) for i in range(10)]
+        return await asyncio.gather(*jobs)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = asyncio.run(run(tmpdir))
+        assert len(results) == 10
+        assert len(os.listdir(tmpdir)) == 10
+
+
+def test_convert_with_process_pool(xmind_file):
+    """Test offloading conversions to a process pool"""
+    with ProcessPoolExecutor(max_workers=2) as executor, tempfile.TemporaryDirectory() as tmpdir:
+        converter = AsyncCoreConverter(executor=executor)
+        output_path = os.path.join(tmpdir, "out.csv")
+        result = asyncio.run(converter.convert(xmind_file, output_path))
+        assert "Conversion completed" in result
+        assert os.path.exists(output_path)
+
+
+def test_errors_propagate():
+    """Test converter errors are raised to the awaiting caller"""
+    converter = AsyncCoreConverter()
+    with pytest.raises(ParserError):
+        asyncio.run(converter.load_from("nonexistent.xmind"))
+    with pytest.raises(FileFormatError):
+        asyncio.run(converter.convert("input.xyz", "output.md"))
+
+
+def test_invalid_concurrency():
+    """Test max_concurrency must be positive"""
+    with pytest.raises(ValueError):
+        AsyncCoreConverter(max_concurrency=0)
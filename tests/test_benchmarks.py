@@ -0,0 +1,50 @@
+"""Test benchmark suite helpers"""
+
+import pytest
+from benchmarks.generate import generate_mindmap
+from benchmarks.run import compare, run_suite
+from xmind_converter import json_backend
+
+
+def test_generate_mindmap_shape():
+    """Test generated maps honour size, depth and fan-out"""
+    mindmap = generate_mindmap(1000, depth=4, fanout=10, relation_count=5, detached_count=2)
+
+    count, stack = 0, [mindmap.topic_node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    assert count == 1000
+    assert mindmap.get_depth() == 4
+    assert len(mindmap.topic_node.children) == 10
+    assert len(mindmap.relations) == 5
+    assert len(mindmap.detached_nodes) == 2
+
+
+def test_generate_mindmap_is_reproducible():
+    """Test the same seed produces the same map"""
+    first = generate_mindmap(100, seed=1)
+    second = generate_mindmap(100, seed=1)
+    assert first.topic_node.children[3].title == second.topic_node.children[3].title
+
+
+def test_generate_mindmap_capacity():
+    """Test impossible shapes are rejected"""
+    with pytest.raises(ValueError):
+        generate_mindmap(100, depth=2, fanout=3)
+
+
+def test_run_suite_and_compare():
+    """Test a tiny suite run and regression comparison"""
+    results = run_suite([50], ["md", "json"], repeat=1, memory=True)
+    rows_expected = 2 + 2 * len(json_backend.available_backends())
+    assert len(results["results"]) == rows_expected
+    assert all(row["peak_bytes"] > 0 for row in results["results"])
+    assert {row.get("backend") for row in results["results"]} == {None, *json_backend.available_backends()}
+
+    slower = {"results": [dict(row, best=row["best"] * 2) for row in results["results"]]}
+    rows = compare(results, slower, threshold=0.5)
+    assert len(rows) == rows_expected
+    assert all(row["regression"] for row in rows)
+    assert not any(row["regression"] for row in compare(results, results))
@@ -1,5 +1,6 @@
 """CLI tests"""
 
+import json
 import pytest
 from click.testing import CliRunner
 from xmind_converter.cli import cli
@@ -27,3 +28,65 @@ def test_cli_convert_help():
     result = runner.invoke(cli, ["convert", "--help"])
     assert result.exit_code == 0
     assert "Convert between different formats" in result.output
+
+
+def test_cli_serve_help():
+    """Test serve command help information"""
+    runner = CliRunner()
+    result = runner.invoke(cli, ["serve", "--help"])
+    assert result.exit_code == 0
+    assert "conversion daemon" in result.output
+
+
+def test_cli_convert_stdin_to_stdout():
+    """Test - reads from stdin and writes to stdout"""
+    runner = CliRunner()
+    markdown = "# Root\n\n## Child\n- labels: [a, b]\n".encode("utf-8")
+    result = runner.invoke(cli, ["convert", "-", "-", "-i", "md", "-o", "json"], input=markdown)
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["topic_node"]["children"][0]["labels"] == ["a", "b"]
+    assert result.stderr == ""
+
+
+def test_cli_convert_xmind_through_pipes():
+    """Test XMind data round-trips through stdout and stdin"""
+    runner = CliRunner()
+    result = runner.invoke(cli, ["convert", "-", "-", "-i", "md", "-o", "xmind"], input=b"# Root\n\n## Child\n")
+    assert result.exit_code == 0
+    assert result.stdout_bytes.startswith(b"PK")
+
+    result = runner.invoke(cli, ["convert", "-", "-", "-i", "xmind", "-o", "md"], input=result.stdout_bytes)
+    assert result.exit_code == 0
+    assert result.stdout == "# Root\n\n## Child\n"
+
+
+def test_cli_convert_stdio_requires_formats():
+    """Test - needs an explicit format"""
+    runner = CliRunner()
+    result = runner.invoke(cli, ["convert", "-", "out.md"], input=b"")
+    assert result.exit_code == 2
+    assert "--input-format is required" in result.output
+
+
+def test_cli_convert_stdio_errors_go_to_stderr():
+    """Test failures exit non-zero without writing to stdout"""
+    runner = CliRunner()
+    result = runner.invoke(cli, ["convert", "-", "-", "-i", "xmind", "-o", "md"], input=b"not a zip")
+    assert result.exit_code == 1
+    assert result.stdout == ""
+    assert "Error:" in result.stderr
+
+
+def test_cli_convert_stdio_unexpected_errors_exit_1(monkeypatch):
+    """Test unexpected failures keep the stderr and exit status contract"""
+    from xmind_converter.core import CoreConverter
+
+    def fail(self, *args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(CoreConverter, "load_stream", fail)
+    runner = CliRunner()
+    result = runner.invoke(cli, ["convert", "-", "-", "-i", "md", "-o", "json"], input=b"# Root\n")
+    assert result.exit_code == 1
+    assert result.stdout == ""
+    assert "Unknown error: boom" in result.stderr
@@ -281,6 +281,27 @@ class TestXMindConverter:
         finally:
             os.unlink(temp_file)
 
+    def test_xmind_multi_sheet_conversion(self, sports_mindmap):
+        """Test writing several MindMaps as sheets of one XMind file"""
+        from xmind_converter.models import MindMap, TopicNode
+
+        second = MindMap(title="Second Sheet", topic_node=TopicNode("Second Root"))
+        converter = XMindConverter()
+        with tempfile.NamedTemporaryFile(suffix=".xmind", delete=False) as f:
+            temp_file = f.name
+
+        try:
+            converter.convert_to([sports_mindmap, second], temp_file)
+
+            with zipfile.ZipFile(temp_file, "r") as zf:
+                content_json = json.loads(zf.read("content.json").decode("utf-8"))
+            assert [sheet["title"] for sheet in content_json] == ["Sports Theme", "Second Sheet"]
+
+            mindmaps = XMindParser().parse_all(temp_file)
+            assert [m.topic_node.title for m in mindmaps] == ["Sports", "Second Root"]
+        finally:
+            os.unlink(temp_file)
+
     def test_xmind_conversion_with_notes_and_labels(self, sports_mindmap):
         """Test XMind conversion preserves notes and labels"""
         converter = XMindConverter()
@@ -351,3 +372,59 @@ class TestXMindConverter:
                         assert content_json[0]["relationships"][i]["title"] == rel.title
         finally:
             os.unlink(temp_file)
+
+
+class TestParallelSerialization:
+    """Test parallel subtree serialization"""
+
+    @pytest.mark.parametrize("converter_class", [CSVConverter, MarkdownConverter, HTMLConverter, JSONConverter])
+    @pytest.mark.parametrize("split_depth", [2, 3, 10])
+    def test_parallel_output_is_byte_identical(self, converter_class, split_depth):
+        """Test parallel output equals serial output"""
+        from benchmarks.generate import generate_mindmap
+
+        mindmap = generate_mindmap(1500, depth=5, fanout=6, relation_count=5, detached_count=2, seed=7)
+        converter = converter_class()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial_path = os.path.join(tmpdir, "serial.out")
+            parallel_path = os.path.join(tmpdir, "parallel.out")
+            converter.convert_to(mindmap, serial_path)
+            converter.convert_to(mindmap, parallel_path, workers=2, split_depth=split_depth)
+            with open(serial_path, "rb") as f1, open(parallel_path, "rb") as f2:
+                assert f1.read() == f2.read()
+
+    def test_no_fork_while_threads_run(self):
+        """Test units are shipped to non-forked workers while another thread is running"""
+        import threading
+        from benchmarks.generate import generate_mindmap
+        from xmind_converter.converters import parallel
+
+        assert parallel._start_method() in ("fork", "forkserver", "spawn")
+        mindmap = generate_mindmap(150, depth=4, fanout=5, seed=3)
+        converter = MarkdownConverter()
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            assert parallel._start_method() in ("forkserver", "spawn")
+            with tempfile.TemporaryDirectory() as tmpdir:
+                serial_path = os.path.join(tmpdir, "serial.md")
+                parallel_path = os.path.join(tmpdir, "parallel.md")
+                converter.convert_to(mindmap, serial_path)
+                converter.convert_to(mindmap, parallel_path, workers=2, split_depth=2)
+                with open(serial_path, "rb") as f1, open(parallel_path, "rb") as f2:
+                    assert f1.read() == f2.read()
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_balanced_chunks(self):
+        """Test chunks are contiguous and balanced by weight"""
+        from xmind_converter.converters.parallel import balanced_chunks
+
+        chunks = balanced_chunks([5, 1, 1, 1, 1, 1, 5, 1], 3)
+        assert chunks[0][0] == 0 and chunks[-1][1] == 8
+        assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+        assert len(chunks) == 3
+        assert balanced_chunks([], 4) == []
+        assert balanced_chunks([1, 2], 1) == [(0, 2)]
@@ -1,5 +1,6 @@
 """Test core functionality - Cross-format conversions"""
 
+import io
 import os
 import pytest
 import tempfile
@@ -431,3 +432,78 @@ class TestCoreConverter:
                 assert child1.labels == child2.labels
         finally:
             os.unlink(temp_file)
+
+
+class _Pipe(io.BytesIO):
+    """In-memory stream that behaves like a pipe: no seeking"""
+
+    def seekable(self):
+        return False
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation("seek")
+
+    def tell(self):
+        raise io.UnsupportedOperation("tell")
+
+
+class TestStreams:
+    """Test loading from and converting to binary streams"""
+
+    @pytest.fixture
+    def converter(self):
+        """Create CoreConverter instance"""
+        return CoreConverter()
+
+    @pytest.fixture
+    def mindmap(self, converter):
+        """Load the example XMind map"""
+        return converter.load_from(os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind"))
+
+    @pytest.mark.parametrize("format_type", ["xmind", "csv", "md", "html", "json"])
+    def test_round_trip_through_pipes(self, converter, mindmap, format_type):
+        """Test every format round-trips through unseekable streams"""
+        output = _Pipe()
+        converter.convert_stream(mindmap, format_type, output)
+        loaded = converter.load_stream(_Pipe(output.getvalue()), format_type)
+
+        assert loaded.topic_node.title == mindmap.topic_node.title
+        assert [c.title for c in loaded.topic_node.children] == [c.title for c in mindmap.topic_node.children]
+
+    @pytest.mark.parametrize("format_type", ["csv", "md", "html", "json"])
+    def test_stream_output_matches_file(self, converter, mindmap, format_type):
+        """Test text formats write the same bytes to streams and files"""
+        output = io.BytesIO()
+        converter.convert_stream(mindmap, format_type, output)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, f"out.{format_type}")
+            converter.convert_to(mindmap, format_type, path)
+            with open(path, "rb") as f:
+                assert f.read() == output.getvalue()
+
+    def test_stream_is_left_open(self, converter, mindmap):
+        """Test streams can be reused after loading and converting"""
+        stream = io.BytesIO()
+        converter.convert_stream(mindmap, "md", stream)
+        stream.seek(0)
+        converter.load_stream(stream, "md")
+        assert not stream.closed
+
+    def test_loads_and_dumps(self, converter, mindmap):
+        """Test in-memory round trips for bytes and str data"""
+        data = converter.dumps(mindmap, "xmind")
+        assert converter.loads(data, "xmind").topic_node.title == mindmap.topic_node.title
+
+        text = converter.dumps(mindmap, "md").decode("utf-8")
+        assert converter.loads(text, "md").topic_node.title == mindmap.topic_node.title
+
+        with pytest.raises(FileFormatError):
+            converter.dumps(mindmap, "txt")
+
+    def test_load_stream_errors(self, converter):
+        """Test invalid data and unknown formats raise package errors"""
+        with pytest.raises(ParserError):
+            converter.load_stream(_Pipe(b"not a zip"), "xmind")
+        with pytest.raises(FileFormatError):
+            converter.load_stream(_Pipe(b""), "txt")
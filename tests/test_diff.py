@@ -0,0 +1,180 @@
+"""Test structural diff between mind maps"""
+
+import json
+import os
+from click.testing import CliRunner
+from xmind_converter.cli import cli
+from xmind_converter.core import CoreConverter
+from xmind_converter.diff import (
+    DELETED,
+    INSERTED,
+    MOVED,
+    REANNOTATED,
+    RELATION_ADDED,
+    RELATION_CHANGED,
+    RELATION_REMOVED,
+    RETITLED,
+    diff,
+)
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def build_mindmap(with_ids=True):
+    """Build a small mind map, optionally with fresh ids"""
+
+    def node_id(value):
+        return value if with_ids else None
+
+    root = TopicNode("Root", node_id("root"))
+    a = Node("A", node_id("a"))
+    b = Node("B", node_id("b"))
+    a1 = Node("A1", node_id("a1"), notes="note")
+    a2 = Node("A2", node_id("a2"), labels=["x"])
+    a.add_child(a1)
+    a.add_child(a2)
+    root.add_child(a)
+    root.add_child(b)
+    mindmap = MindMap("Map", root)
+    mindmap.add_detached_node(DetachedNode("Floating", node_id("d")))
+    mindmap.add_relation(Relation(a1.id, b.id, "r1", "rel"))
+    return mindmap
+
+
+def find(mindmap, title):
+    stack = [mindmap.topic_node] + list(mindmap.detached_nodes)
+    while stack:
+        node = stack.pop()
+        if node.title == title:
+            return node
+        stack.extend(node.children)
+    raise KeyError(title)
+
+
+def test_identical_maps_have_no_changes():
+    """Test diffing a map against an equal copy"""
+    assert not diff(build_mindmap(), build_mindmap())
+    assert not diff(build_mindmap(with_ids=False), build_mindmap(with_ids=False))
+
+
+def test_changes_matched_by_id():
+    """Test inserted, deleted and retitled nodes when ids carry over"""
+    old, new = build_mindmap(), build_mindmap()
+    find(new, "A").remove_child(find(new, "A2"))
+    find(new, "A").add_child(Node("A3", "a3"))
+    find(new, "A1").title = "First"
+
+    changes = diff(old, new)
+    assert [(change.kind, change.id) for change in changes] == [
+        (RETITLED, "a1"),
+        (DELETED, "a2"),
+        (INSERTED, "a3"),
+    ]
+    assert changes.by_kind(RETITLED)[0].details == {"old_title": "A1"}
+    assert changes.by_kind(INSERTED)[0].to_dict()["parent_id"] == "a"
+
+
+def test_moved_and_reannotated():
+    """Test a node moving to another parent keeps its identity"""
+    old, new = build_mindmap(), build_mindmap()
+    a2 = find(new, "A2")
+    find(new, "A").remove_child(a2)
+    find(new, "B").add_child(a2)
+    a2.labels = ("y",)
+
+    changes = diff(old, new)
+    assert [change.kind for change in changes] == [MOVED, REANNOTATED]
+    assert changes.by_kind(MOVED)[0].details == {"old_parent_id": "a", "new_parent_id": "b"}
+    assert changes.by_kind(REANNOTATED)[0].details == {"old_labels": ["x"], "new_labels": ["y"]}
+
+
+def test_fallback_matching_without_ids():
+    """Test title and position heuristics for maps with fresh ids"""
+    old, new = build_mindmap(with_ids=False), build_mindmap(with_ids=False)
+    find(new, "A").title = "Renamed"
+    a2 = find(new, "A2")
+    find(new, "Renamed").remove_child(a2)
+    find(new, "B").add_child(a2)
+
+    changes = diff(old, new)
+    assert [(change.kind, change.title) for change in changes] == [
+        (RETITLED, "Renamed"),
+        (MOVED, "A2"),
+    ]
+    assert not changes.by_kind(RELATION_CHANGED)
+
+
+def test_moved_subtree_without_ids():
+    """Test a moved subtree is reported once, not as deletes and inserts"""
+    old, new = build_mindmap(with_ids=False), build_mindmap(with_ids=False)
+    a = find(new, "A")
+    new.topic_node.remove_child(a)
+    find(new, "B").add_child(a)
+
+    changes = diff(old, new)
+    assert [(change.kind, change.title) for change in changes] == [(MOVED, "A")]
+
+
+def test_relation_changes():
+    """Test relations are matched by id, then by endpoints"""
+    old, new = build_mindmap(), build_mindmap()
+    new.relations[0].title = "renamed"
+    new.add_relation(Relation("a", "b", "r2"))
+    old.add_relation(Relation("root", "d", "r3"))
+
+    changes = diff(old, new)
+    assert [change.kind for change in changes] == [RELATION_CHANGED, RELATION_REMOVED, RELATION_ADDED]
+    assert changes.by_kind(RELATION_CHANGED)[0].details == {"old_title": "rel"}
+
+
+def test_deep_map_does_not_recurse():
+    """Test diffing maps deeper than the recursion limit"""
+
+    def chain(depth, last_title):
+        root = TopicNode("Root", "root")
+        node = root
+        for index in range(depth):
+            child = Node(f"n{index}", f"n{index}")
+            node.add_child(child)
+            node = child
+        node.title = last_title
+        return MindMap("Deep", root)
+
+    changes = diff(chain(5000, "old"), chain(5000, "new"))
+    assert [change.kind for change in changes] == [RETITLED]
+
+
+def test_format_round_trip_diff():
+    """Test a map parsed from two formats differs only in relations"""
+    converter = CoreConverter()
+    old = converter.load_from(os.path.join(DATA_DIR, "sports_v8.json"))
+    new = converter.load_from(os.path.join(DATA_DIR, "sports_v8.md"))
+    changes = diff(old, new)
+    assert {change.kind for change in changes} <= {RELATION_REMOVED}
+
+
+def test_cli_diff():
+    """Test diff command output"""
+    runner = CliRunner()
+    old = os.path.join(DATA_DIR, "example_v8.xmind")
+    result = runner.invoke(cli, ["diff", old, old])
+    assert result.exit_code == 0
+    assert "No changes" in result.output
+
+    result = runner.invoke(cli, ["diff", old, os.path.join(DATA_DIR, "sports_v8.md"), "--json"])
+    assert result.exit_code == 0
+    assert {change["kind"] for change in json.loads(result.output)} == {RELATION_REMOVED}
+
+
+def test_cli_diff_unexpected_error(monkeypatch):
+    """Test unexpected failures are reported like in convert"""
+    old = os.path.join(DATA_DIR, "example_v8.xmind")
+
+    def fail(self, *args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(CoreConverter, "load_from", fail)
+    result = CliRunner().invoke(cli, ["diff", old, old])
+    assert result.exception is None
+    assert "Unknown error: boom" in result.output
@@ -0,0 +1,137 @@
+"""Test copy-on-write transformations with structural sharing"""
+
+import pytest
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+from xmind_converter.query import query
+
+
+def build_mindmap():
+    """Build a small map with a detached tree and a relation"""
+    root = TopicNode("Root", node_id="root")
+    a = Node("A", node_id="a", notes="note", labels=["x"])
+    a.children = [Node("A1", node_id="a1"), Node("A2", node_id="a2", labels=["secret"])]
+    b = Node("B", node_id="b")
+    b.children = [Node("B1", node_id="b1")]
+    root.children = [a, b]
+    loose = DetachedNode("Loose", node_id="loose")
+    loose.children = [Node("L1", node_id="l1")]
+    return MindMap("Map", root, detached_nodes=[loose], relations=[Relation("a1", "b1", relation_id="r")])
+
+
+def test_replace_shares_children():
+    """Test replace copies one node, keeps its class and shares its children"""
+    root = build_mindmap().topic_node
+    hash_before = root.content_hash()
+    copy = root.replace(title="New root", labels=["y"])
+    assert type(copy) is TopicNode
+    assert (copy.title, copy.id, copy.labels) == ("New root", "root", ("y",))
+    assert copy.children == root.children and copy.children is not root.children
+    assert root.title == "Root" and root.content_hash() == hash_before
+
+    # Cached hashes carry over while they are valid
+    renamed = root.replace(node_id="other")
+    assert renamed._digest == root._digest and renamed._id_digest is None
+    assert renamed.content_hash() == hash_before
+
+
+def test_replace_keeps_subclass_attributes():
+    """Test replace copies attributes added by subclasses"""
+
+    class TaskNode(Node):
+        def __init__(self, title, owner, **kwargs):
+            super().__init__(title, **kwargs)
+            self.owner = owner
+
+    task = TaskNode("Task", "ana", node_id="t", children=[Node("Step")])
+    copy = task.replace(title="Renamed")
+    assert type(copy) is TaskNode
+    assert (copy.title, copy.owner, copy.id) == ("Renamed", "ana", "t")
+    assert copy.children == task.children
+
+
+def test_shared_children_invalidate_every_holder():
+    """Test an in-place edit of a shared node clears the hashes of every tree holding it"""
+    root = build_mindmap().topic_node
+    copy = root.replace(title="Copy")
+    renamed = root.replace(node_id="renamed")
+    # Hash the copies first, so the shared children link to them before the original
+    hashes = [node.content_hash() for node in (copy, renamed, root)]
+
+    root.children[0].children[1].title = "Edited"
+    assert [node.content_hash() for node in (copy, renamed, root)] != hashes
+    assert copy.children[0].children[1].title == "Edited"
+    assert renamed.content_hash() == root.content_hash()
+
+
+def test_replace_node_copies_path():
+    """Test replace_node copies only the path to the edited node"""
+    mindmap = build_mindmap()
+    hash_before = mindmap.content_hash()
+    edited = mindmap.replace_node("a2", title="Changed", notes="n")
+
+    a_new, b_new = edited.topic_node.children
+    a_old, b_old = mindmap.topic_node.children
+    assert a_new.children[1].title == "Changed" and a_new.children[1].notes == "n"
+    assert a_new is not a_old and edited.topic_node is not mindmap.topic_node
+    assert b_new is b_old and a_new.children[0] is a_old.children[0]
+    assert edited.detached_nodes[0] is mindmap.detached_nodes[0]
+    assert edited.relations[0] is mindmap.relations[0]
+    assert mindmap.content_hash() == hash_before != edited.content_hash()
+
+    detached = mindmap.replace_node("l1", title="L!")
+    assert detached.detached_nodes[0].children[0].title == "L!"
+    assert type(detached.detached_nodes[0]) is DetachedNode
+    assert detached.topic_node is mindmap.topic_node
+
+    with pytest.raises(ValueError):
+        mindmap.replace_node("missing", title="x")
+
+
+def test_transform_prunes_and_relabels():
+    """Test transform drops and replaces nodes, sharing untouched subtrees"""
+    mindmap = build_mindmap()
+
+    def step(node):
+        if "secret" in node.labels:
+            return None
+        if node.title == "B1":
+            return node.replace(title="Anonymous")
+        return node
+
+    result = mindmap.transform(step)
+    a_new, b_new = result.topic_node.children
+    assert [child.id for child in a_new.children] == ["a1"]
+    assert b_new.children[0].title == "Anonymous"
+    assert a_new.children[0] is mindmap.topic_node.children[0].children[0]
+    assert result.detached_nodes[0] is mindmap.detached_nodes[0]
+    assert [child.id for child in mindmap.topic_node.children[0].children] == ["a1", "a2"]
+
+    # Dropped endpoints leave relations dangling rather than removing them
+    pruned = mindmap.transform(lambda node: None if node.id in ("b1", "loose") else node)
+    assert pruned.detached_nodes == []
+    assert [issue.node_id for issue in pruned.validate_relations()] == ["b1"]
+
+
+def test_identity_transform_shares_everything():
+    """Test a transformation that changes nothing copies no node"""
+    mindmap = build_mindmap()
+    stages = [mindmap]
+    for _ in range(3):
+        stages.append(stages[-1].transform(lambda node: node))
+    assert stages[-1].topic_node is mindmap.topic_node
+    assert stages[-1].detached_nodes[0] is mindmap.detached_nodes[0]
+    assert stages[-1].content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+
+
+def test_evolve_and_views():
+    """Test evolve replaces map fields and views stay read-only"""
+    mindmap = build_mindmap()
+    evolved = mindmap.evolve(title="Copy", relations=[])
+    assert evolved.title == "Copy" and evolved.relations == [] and len(mindmap.relations) == 1
+    assert evolved.topic_node is mindmap.topic_node
+    evolved.detached_nodes.append(DetachedNode("New"))
+    assert len(mindmap.detached_nodes) == 1
+
+    view = query(mindmap, max_depth=2)
+    with pytest.raises(TypeError):
+        view.topic_node.replace(title="x")
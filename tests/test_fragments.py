@@ -0,0 +1,162 @@
+"""Test the rendered-fragment cache of the Markdown, HTML and JSON converters"""
+
+import pytest
+from xmind_converter import json_backend
+from xmind_converter.converters.fragments import FragmentCache
+from xmind_converter.core import CoreConverter
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+from xmind_converter.query import query
+
+FORMATS = ["md", "html", "json"]
+
+
+def build_mindmap(width=6, depth=3):
+    """Build a full tree with notes, labels, a detached tree and a relation"""
+    root = TopicNode("Root", node_id="root", notes='Quotes "here"\nand ünicode 😀', labels=["a", "b\\c"])
+    level = [root]
+    for current_depth in range(depth):
+        next_level = []
+        for parent in level:
+            for index in range(width):
+                child = Node(f"{parent.title}.{index}", node_id=f"{parent.id}.{index}")
+                if index % 2:
+                    child.notes = f"Notes of {child.title}"
+                if index % 3 == 0:
+                    child.add_label(f"label{current_depth}")
+                parent.add_child(child)
+                next_level.append(child)
+        level = next_level
+    loose = DetachedNode("Loose", node_id="loose")
+    loose.add_child(Node("Loose child", node_id="loose.0"))
+    return MindMap("Map", root, detached_nodes=[loose], relations=[Relation("root.0", "root.1", relation_id="r")])
+
+
+@pytest.fixture(params=json_backend.available_backends())
+def backend(request):
+    json_backend.set_backend(request.param)
+    yield request.param
+    json_backend.set_backend(None)
+
+
+@pytest.mark.parametrize("format_type", FORMATS)
+def test_cached_output_identical(backend, format_type):
+    """Test cold, warm and post-edit cached exports match the plain export byte for byte"""
+    converter = CoreConverter()
+    mindmap = build_mindmap()
+    cache = FragmentCache(max_fragment_bytes=2048)
+
+    expected = converter.dumps(mindmap, format_type)
+    assert converter.dumps(mindmap, format_type, cache=cache) == expected
+    assert len(cache) > 0
+    assert converter.dumps(mindmap, format_type, cache=cache) == expected
+
+    mindmap.topic_node.children[2].children[1].title = "Edited"
+    mindmap.topic_node.children[4].add_label("new")
+    assert converter.dumps(mindmap, format_type, cache=cache) == converter.dumps(mindmap, format_type)
+
+
+def test_edit_rerenders_only_changed_path():
+    """Test unchanged branches are served from the cache after an edit"""
+    converter = CoreConverter()
+    mindmap = build_mindmap()
+    cache = FragmentCache(min_fragment_bytes=0, max_fragment_bytes=4096)
+    converter.dumps(mindmap, "md", cache=cache)
+
+    cache.hits = cache.misses = 0
+    converter.dumps(mindmap, "md", cache=cache)
+    # The whole tree is larger than a fragment, so the root is rebuilt from its children's fragments
+    assert cache.misses == 1 and cache.hits == 6
+
+    mindmap.topic_node.children[0].children[0].title = "Edited"
+    cache.hits = cache.misses = 0
+    converter.dumps(mindmap, "md", cache=cache)
+    # Only the edited child of the root is rendered again, at most once per node
+    assert cache.hits == 5
+    assert cache.misses <= 2 + 6 + 36
+
+
+def test_fragment_size_limits():
+    """Test small and large fragments are not stored and nested fragments are dropped"""
+    converter = CoreConverter()
+    mindmap = build_mindmap()
+    output = converter.dumps(mindmap, "md")
+
+    # The root fragment also holds the final newline that the Markdown output drops
+    cache = FragmentCache(min_fragment_bytes=len(output) + 2)
+    converter.dumps(mindmap, "md", cache=cache)
+    assert len(cache) == 0
+
+    cache = FragmentCache(max_fragment_bytes=len(output) * 2)
+    converter.dumps(mindmap, "md", cache=cache)
+    # The root fragment holds every other one
+    assert len(cache) == 1
+    assert cache.nbytes == len(output) + 1
+
+    with pytest.raises(ValueError):
+        FragmentCache(max_bytes=-1)
+
+
+def test_lru_eviction():
+    """Test the least recently used fragments are evicted beyond max_bytes"""
+    cache = FragmentCache(max_bytes=10, min_fragment_bytes=0)
+    first, second, third = ("md", 1, b"1"), ("md", 1, b"2"), ("md", 1, b"3")
+    assert cache.put(first, b"aaaa")
+    assert cache.put(second, b"bbbb")
+    assert cache.get(first) == b"aaaa"
+    cache.put(third, b"cccc")
+    assert first in cache and third in cache and second not in cache
+    assert cache.nbytes == 8
+    assert not cache.put(("md", 1, b"4"), b"x" * 11)
+
+    cache.discard(first)
+    assert first not in cache and cache.nbytes == 4
+
+
+def test_directory_reused(tmp_path):
+    """Test fragments written to a directory are reused by a new cache"""
+    converter = CoreConverter()
+    mindmap = build_mindmap()
+    expected = converter.dumps(mindmap, "json")
+    converter.dumps(mindmap, "json", cache=FragmentCache(directory=str(tmp_path), max_fragment_bytes=4096))
+    assert list(tmp_path.glob("json-*.frag"))
+
+    cache = FragmentCache(directory=str(tmp_path), max_fragment_bytes=4096)
+    assert len(cache) == 0
+    assert converter.dumps(mindmap, "json", cache=cache) == expected
+    assert cache.hits > 0
+
+    cache.clear()
+    assert len(cache) == 0 and not list(tmp_path.iterdir())
+
+
+def test_views_and_empty_maps():
+    """Test query views and maps without a topic node export through the cache"""
+    converter = CoreConverter()
+    view = query(build_mindmap(), max_depth=2)
+    cache = FragmentCache(min_fragment_bytes=0)
+    for format_type in FORMATS:
+        assert converter.dumps(view, format_type, cache=cache) == converter.dumps(view, format_type)
+
+    empty = MindMap("Empty")
+    for format_type in FORMATS:
+        assert converter.dumps(empty, format_type, cache=cache) == converter.dumps(empty, format_type)
+
+
+@pytest.mark.parametrize("format_type", FORMATS)
+def test_edit_of_subtree_shared_with_snapshot(format_type):
+    """Test editing a node shared with an exported snapshot still reaches the cached export"""
+    mindmap = build_mindmap()
+    converter = CoreConverter()
+    cache = FragmentCache(min_fragment_bytes=0)
+    converter.dumps(mindmap, format_type, cache=cache)
+
+    snapshot = mindmap.evolve(topic_node=mindmap.topic_node.replace(title="snapshot"))
+    converter.dumps(snapshot, format_type, cache=cache)
+    hash_before = mindmap.content_hash()
+
+    mindmap.topic_node.children[1].children[3].title = "EDITED"
+    assert mindmap.content_hash() != hash_before
+    expected = converter.dumps(mindmap, format_type)
+    assert b"EDITED" in expected
+    assert converter.dumps(mindmap, format_type, cache=cache) == expected
+    assert converter.dumps(snapshot, format_type, cache=cache) == converter.dumps(snapshot, format_type)
@@ -0,0 +1,141 @@
+"""Test Merkle-style content hashes of subtrees and mind maps"""
+
+import pickle
+from xmind_converter.core import CoreConverter
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+
+
+def build_mindmap(suffix=""):
+    """Build a small map; suffix changes every id but no content"""
+    root = TopicNode("Root", node_id="root" + suffix)
+    a = Node("A", node_id="a" + suffix, notes="note", labels=["x"])
+    a.children = [Node("A1", node_id="a1" + suffix), Node("A2", node_id="a2" + suffix)]
+    b = Node("B", node_id="b" + suffix)
+    root.children = [a, b]
+    loose = DetachedNode("Loose", node_id="loose" + suffix)
+    relations = [Relation("a1" + suffix, "b" + suffix, relation_id="r" + suffix)]
+    return MindMap("Map", root, detached_nodes=[loose], relations=relations)
+
+
+def test_equal_content_equal_hash():
+    """Test hashes depend on content, and on ids only when asked"""
+    first, second = build_mindmap(), build_mindmap("-copy")
+    assert first.topic_node.content_hash() == second.topic_node.content_hash()
+    assert first.topic_node.content_equals(second.topic_node)
+    assert not first.topic_node.content_equals(second.topic_node, include_ids=True)
+    assert first.content_equals(second)
+    assert not first.content_equals(second, include_ids=True)
+    assert first.content_hash(include_ids=True) == build_mindmap().content_hash(include_ids=True)
+    assert len(first.topic_node.content_hash()) == 32
+
+
+def test_hash_fields():
+    """Test title, notes, labels, child order and structure all change the hash"""
+    base = build_mindmap().topic_node.content_hash()
+    edits = [
+        lambda root: setattr(root.children[0], "title", "A!"),
+        lambda root: setattr(root.children[0], "notes", "other"),
+        lambda root: root.children[0].add_label("y"),
+        lambda root: root.children.reverse(),
+        # Same titles, different nesting
+        lambda root: root.children[0].children[0].children.append(root.children[0].children.pop()),
+    ]
+    for edit in edits:
+        root = build_mindmap().topic_node
+        edit(root)
+        root.invalidate_hash()
+        assert root.content_hash() != base
+
+    # Empty and missing notes are the same content
+    root = build_mindmap().topic_node
+    root.children[1].notes = ""
+    assert root.content_hash() == base
+
+
+def test_mutation_invalidates_ancestors():
+    """Test edits through Node clear cached hashes up to the root"""
+    mindmap = build_mindmap()
+    root = mindmap.topic_node
+    a, b = root.children
+    before = root.content_hash()
+    b_hash = b.content_hash()
+
+    a.children[0].title = "Changed"
+    assert root.content_hash() != before
+    # Siblings keep their cached hash
+    assert b._digest is not None and b.content_hash() == b_hash
+
+    a.children[0].title = "A1"
+    assert root.content_hash() == before
+
+    extra = Node("New")
+    b.add_child(extra)
+    with_child = root.content_hash()
+    assert with_child != before
+    extra.title = "Renamed"
+    assert root.content_hash() != with_child
+    b.remove_child(extra)
+    assert root.content_hash() == before
+
+    a.id = "renamed"
+    assert root.content_hash() == before
+    assert root.content_hash(include_ids=True) != build_mindmap().topic_node.content_hash(include_ids=True)
+
+
+def test_mindmap_hash_covers_relations_and_detached():
+    """Test relations and detached trees are part of the map hash"""
+    base = build_mindmap().content_hash()
+
+    retargeted = build_mindmap()
+    retargeted.relations[0].target_id = "a2"
+    assert retargeted.content_hash() != base
+
+    retitled = build_mindmap()
+    retitled.detached_nodes[0].title = "Free"
+    assert retitled.content_hash() != base
+
+    dangling = build_mindmap()
+    dangling.relations[0].source_id = "missing"
+    assert dangling.content_hash() != base
+
+
+def test_hash_survives_round_trip_and_pickle(tmp_path):
+    """Test hashes are stable through JSON conversion and pickling"""
+    mindmap = build_mindmap()
+    converter = CoreConverter()
+    loaded = converter.loads(converter.dumps(mindmap, "json"), "json")
+    assert loaded.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+
+    mindmap.content_hash()
+    child = pickle.loads(pickle.dumps(mindmap.topic_node.children[0]))
+    assert child._parent is None and child._digest is None
+    assert child.content_hash() == mindmap.topic_node.children[0].content_hash()
+
+
+def test_deep_tree_hash():
+    """Test hashing does not recurse"""
+    root = TopicNode("Root")
+    node = root
+    for level in range(5000):
+        child = Node(f"Level {level}")
+        node.add_child(child)
+        node = child
+    first = root.content_hash()
+    node.title = "Bottom"
+    assert root.content_hash() != first
+
+
+def test_unhashed_trees_hold_no_parent_links():
+    """Test add_child does not create back references until the tree is hashed"""
+    root = TopicNode("Root")
+    child = Node("Child")
+    root.add_child(child)
+    assert "_parent" not in child.__dict__ and "_digest" not in root.__dict__
+
+    first = root.content_hash()
+    grandchild = Node("Grandchild")
+    child.add_child(grandchild)
+    second = root.content_hash()
+    assert second != first
+    grandchild.title = "Renamed"
+    assert root.content_hash() != second
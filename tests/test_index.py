@@ -0,0 +1,89 @@
+"""Test the inverted full-text index"""
+
+import json
+import pytest
+from xmind_converter.index import MindMapIndex, tokenize
+from xmind_converter.models import MindMap, Node, TopicNode
+
+
+@pytest.fixture
+def mindmap():
+    """Create a small map with notes, labels and a detached node"""
+    root = TopicNode("Training Plan", node_id="root")
+    running = Node("Running", node_id="running", labels=["cardio"])
+    sprint = Node("Sprint intervals", node_id="sprint", notes="Train on the track")
+    tempo = Node("Tempo run", node_id="tempo", labels=["cardio", "follow-up"])
+    running.children = [sprint, tempo]
+    strength = Node("Strength", node_id="strength", notes="Gym training")
+    root.children = [running, strength]
+    return MindMap("Plan", root, detached_nodes=[Node("Rest day", node_id="rest")])
+
+
+def test_tokenize():
+    """Test tokens are lowercase words"""
+    assert tokenize("Follow-up: Sprint 2x") == ["follow", "up", "sprint", "2x"]
+    assert tokenize(None) == []
+
+
+def test_search_terms(mindmap):
+    """Test titles, notes and labels are searchable with AND semantics"""
+    index = MindMapIndex(mindmap)
+    assert len(index) == 6
+    assert index.search("cardio") == ["running", "tempo"]
+    assert index.search("TRACK") == ["sprint"]
+    assert index.search("cardio run") == ["tempo"]
+    assert index.search("cardio gym") == []
+    assert index.search("unknown") == []
+    assert index.search("  ") == []
+    assert index.search("follow-up") == ["tempo"]
+    assert [node.title for node in index.search_nodes("day")] == ["Rest day"]
+
+
+def test_search_prefix(mindmap):
+    """Test trailing * matches token prefixes"""
+    index = MindMapIndex(mindmap)
+    assert index.prefix("tra") == ["track", "train", "training"]
+    assert index.search("train*") == ["root", "sprint", "strength"]
+    assert index.search("train* cardio") == []
+    assert index.search("r*") == ["running", "tempo", "rest"]
+    assert index.search("r*", limit=2) == ["running", "tempo"]
+
+
+def test_incremental_updates(mindmap):
+    """Test adding, updating and removing nodes"""
+    index = MindMapIndex(mindmap)
+    running = mindmap.topic_node.children[0]
+
+    hills = Node("Hill repeats", node_id="hills", labels=["cardio"])
+    running.add_child(hills)
+    index.add(hills)
+    assert index.search("cardio") == ["running", "tempo", "hills"]
+
+    running.title = "Jogging"
+    index.update(running)
+    assert index.search("running") == []
+    # Re-indexing keeps the node's position
+    assert index.search("cardio") == ["running", "tempo", "hills"]
+
+    index.remove(running)
+    assert index.search("cardio") == []
+    assert "sprint" not in index
+    assert index.prefix("hill") == []
+    assert "jogging" not in index.vocabulary
+    index.remove_id("missing")
+    assert len(index) == 3
+
+
+def test_serialization_round_trip(mindmap):
+    """Test to_dict/from_dict preserves results and resolves nodes"""
+    index = MindMapIndex(mindmap)
+    data = json.loads(json.dumps(index.to_dict()))
+    loaded = MindMapIndex.from_dict(data, mindmap)
+
+    assert loaded.vocabulary == index.vocabulary
+    assert loaded.search("train*") == index.search("train*")
+    assert [node.id for node in loaded.search_nodes("cardio")] == ["running", "tempo"]
+    assert MindMapIndex.from_dict(data).search_nodes("cardio") == []
+
+    with pytest.raises(ValueError):
+        MindMapIndex.from_dict({"version": 99, "nodes": []})
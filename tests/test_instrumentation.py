@@ -0,0 +1,135 @@
+"""Test per-stage timing instrumentation"""
+
+import logging
+import os
+import tempfile
+import pytest
+from click.testing import CliRunner
+from xmind_converter.cli import cli
+from xmind_converter.core import CoreConverter
+from xmind_converter.instrumentation import (
+    CallbackSink,
+    CollectorSink,
+    Instrumentation,
+    LoggingSink,
+    NULL_INSTRUMENTATION,
+)
+
+
+@pytest.fixture
+def xmind_file():
+    """Get path to test XMind file"""
+    return os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+
+
+@pytest.mark.parametrize("output_format", ["csv", "md", "html", "json", "xmind"])
+def test_stage_spans_for_every_converter(xmind_file, output_format):
+    """Test parsers and converters emit named stage spans"""
+    collector = CollectorSink()
+    converter = CoreConverter(Instrumentation(collector))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        converter.convert(xmind_file, os.path.join(tmpdir, f"out.{output_format}"))
+
+    names = [span.name for span in collector.spans]
+    assert names[:3] == ["xmind.unzip", "xmind.decode", "xmind.build"]
+    assert all(name.startswith(output_format + ".") for name in names[3:])
+    assert len(names) > 3
+
+    build = collector.spans[2]
+    assert build.nodes == 7
+    assert collector.spans[0].bytes_out > 0
+    assert collector.spans[-1].bytes_out > 0
+    assert all(span.duration >= 0 for span in collector.spans)
+
+
+@pytest.mark.parametrize("input_name", ["sports_v8.csv", "sports_v8.md", "sports_v8.html", "sports_v8.json"])
+def test_stage_spans_for_every_parser(input_name):
+    """Test every parser reports a build span with a node count"""
+    collector = CollectorSink()
+    converter = CoreConverter(Instrumentation(collector))
+    converter.load_from(os.path.join(os.path.dirname(__file__), "..", "data", input_name))
+
+    prefix = os.path.splitext(input_name)[1][1:]
+    names = [span.name for span in collector.spans]
+    assert all(name.startswith(prefix + ".") for name in names)
+    assert names[-1] == f"{prefix}.build"
+    assert collector.spans[-1].nodes == 7
+
+
+@pytest.mark.parametrize("fmt", ["md", "html", "json"])
+def test_byte_counts_are_utf8_sizes(fmt):
+    """Test text stages report encoded byte sizes, not character counts"""
+    from xmind_converter.models import MindMap, TopicNode
+
+    mindmap = MindMap("思维导图", TopicNode("中心主题", children=[TopicNode("分支 ✓")]))
+    data = CoreConverter().dumps(mindmap, fmt)
+
+    collector = CollectorSink()
+    converter = CoreConverter(Instrumentation(collector))
+    converter.loads(data, fmt)
+    assert collector.spans[0].bytes_out == len(data)
+
+    collector.spans.clear()
+    converter.dumps(mindmap, fmt)
+    assert collector.spans[-1].bytes_out == len(data)
+    if fmt == "json":
+        encode = next(span for span in collector.spans if span.name == "json.encode")
+        assert encode.bytes_out == len(data)
+
+
+def test_disabled_by_default(xmind_file):
+    """Test instrumentation is disabled unless configured"""
+    converter = CoreConverter()
+    assert converter.instrumentation is NULL_INSTRUMENTATION
+    assert all(parser.instrumentation is NULL_INSTRUMENTATION for parser in converter.parsers.values())
+    with NULL_INSTRUMENTATION.span("anything") as span:
+        span.nodes = 1
+
+
+def test_setting_instrumentation_propagates():
+    """Test replacing instrumentation updates every parser and converter"""
+    converter = CoreConverter()
+    instrumentation = Instrumentation()
+    converter.instrumentation = instrumentation
+    assert all(c.instrumentation is instrumentation for c in converter.converters.values())
+    assert all(p.instrumentation is instrumentation for p in converter.parsers.values())
+
+
+def test_callback_and_logging_sinks(xmind_file, caplog):
+    """Test callback and logger sinks receive spans"""
+    received = []
+    instrumentation = Instrumentation(CallbackSink(received.append))
+    instrumentation.add_sink(LoggingSink())
+    converter = CoreConverter(instrumentation)
+
+    with caplog.at_level(logging.INFO, logger="xmind_converter.timings"):
+        converter.load_from(xmind_file)
+
+    assert [span.name for span in received] == ["xmind.unzip", "xmind.decode", "xmind.build"]
+    assert "xmind.build" in caplog.text
+    assert received[-1].to_dict()["nodes"] == 7
+
+
+def test_collector_summary():
+    """Test collector aggregates durations per span name"""
+    collector = CollectorSink()
+    instrumentation = Instrumentation(collector)
+    for _ in range(2):
+        with instrumentation.span("stage"):
+            pass
+    assert list(collector.summary()) == ["stage"]
+    assert collector.total() == pytest.approx(collector.summary()["stage"])
+    collector.clear()
+    assert collector.spans == []
+
+
+def test_cli_timings(xmind_file):
+    """Test convert --timings prints a breakdown"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result = runner.invoke(cli, ["convert", xmind_file, os.path.join(tmpdir, "out.json"), "--timings"])
+    assert result.exit_code == 0
+    assert "xmind.unzip" in result.output
+    assert "json.encode" in result.output
+    assert "total" in result.output
@@ -0,0 +1,75 @@
+"""Test pluggable JSON backends"""
+
+import json
+import os
+import tempfile
+import pytest
+from xmind_converter import json_backend
+from xmind_converter.core import CoreConverter
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+BACKENDS = json_backend.available_backends()
+
+
+@pytest.fixture
+def restore_backend():
+    """Restore the active backend after the test"""
+    previous = json_backend.get_backend()
+    yield
+    json_backend.set_backend(previous)
+
+
+def test_stdlib_always_available():
+    """Test the stdlib backend is always usable"""
+    assert "stdlib" in BACKENDS
+    assert json_backend.get_backend().name in BACKENDS
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_dumps_matches_stdlib(name, restore_backend):
+    """Test every backend produces exactly the stdlib output"""
+    backend = json_backend.set_backend(name)
+    document = {
+        "title": "".join(chr(code) for code in range(0x300)) + "\u2028\U0001f600",
+        "empty_list": [],
+        "empty_dict": {},
+        "values": [1, -2, True, False, None, {"nested": [[]]}],
+    }
+    for indent in (None, 2, 4):
+        assert backend.dumps(document, indent) == json.dumps(document, ensure_ascii=False, indent=indent)
+    # Lone surrogates are not valid UTF-8 and fall back to the stdlib
+    assert backend.dumps(["\ud800"], 2) == json.dumps(["\ud800"], ensure_ascii=False, indent=2)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_loads_matches_stdlib(name, restore_backend):
+    """Test every backend decodes like the stdlib, including its extensions and errors"""
+    backend = json_backend.set_backend(name)
+    assert backend.loads(b'{"a": [1, "\xc3\xa9"]}') == {"a": [1, "\u00e9"]}
+    assert backend.loads("\ufeff{}".encode("utf-8")) == {}
+    assert backend.loads("[18446744073709551616]") == [18446744073709551616]
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads("{bad")
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_converter_output_identical_across_backends(name, restore_backend):
+    """Test JSON conversion output does not depend on the backend"""
+    converter = CoreConverter()
+    mindmap = converter.load_from(os.path.join(DATA_DIR, "example_v8.xmind"))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outputs = []
+        for backend in ("stdlib", name):
+            json_backend.set_backend(backend)
+            path = os.path.join(tmpdir, f"{backend}.json")
+            converter.convert_to(mindmap, "json", path)
+            with open(path, "rb") as f:
+                outputs.append(f.read())
+            assert converter.load_from(path).topic_node.title == mindmap.topic_node.title
+    assert outputs[0] == outputs[1]
+
+
+def test_unknown_backend(restore_backend):
+    """Test selecting an unknown backend"""
+    with pytest.raises(ValueError):
+        json_backend.set_backend("yaml")
@@ -0,0 +1,167 @@
+"""Test merging many mind maps"""
+
+import json
+import os
+import pytest
+from click.testing import CliRunner
+from xmind_converter.cli import cli
+from xmind_converter.merge import GRAFT, UNIFY, merge
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+
+
+def team_map(team, tasks, relations=True):
+    """Create a map Projects/<team>/<tasks> with one relation between the first two tasks"""
+    root = TopicNode("Projects", node_id="root")
+    branch = Node(team, node_id="team")
+    branch.children = [Node(task, node_id=f"t{index}") for index, task in enumerate(tasks)]
+    root.children = [branch]
+    rels = [Relation("t0", "t1", relation_id="r1", title="blocks")] if relations else []
+    return MindMap(team, root, detached_nodes=[DetachedNode("Ideas", node_id="ideas")], relations=rels)
+
+
+def titles(node):
+    return [child.title for child in node.children]
+
+
+def all_ids(mindmap):
+    ids, stack = [], [mindmap.topic_node, *mindmap.detached_nodes]
+    while stack:
+        node = stack.pop()
+        ids.append(node.id)
+        stack.extend(node.children)
+    return ids
+
+
+def test_graft():
+    """Test maps are grafted under a new root with colliding ids remapped"""
+    merged = merge([team_map("Web", ["Login", "Search"]), team_map("Mobile", ["Push", "Sync"])], GRAFT, title="All")
+
+    assert isinstance(merged.topic_node, TopicNode)
+    assert merged.title == merged.topic_node.title == "All"
+    assert titles(merged.topic_node) == ["Projects", "Projects"]
+    branches = merged.topic_node.children
+    assert [titles(child.children[0]) for child in branches] == [["Login", "Search"], ["Push", "Sync"]]
+    # Identical detached trees are kept once
+    assert [node.title for node in merged.detached_nodes] == ["Ideas"]
+    assert isinstance(merged.detached_nodes[0], DetachedNode)
+
+    ids = all_ids(merged)
+    assert len(ids) == len(set(ids))
+    # The first map keeps its ids, relations of the second follow its new ids
+    first, second = merged.relations
+    assert (first.id, first.source_id, first.target_id) == ("r1", "t0", "t1")
+    assert second.id != "r1"
+    assert merged.get_node_by_id(second.source_id).title == "Push"
+    assert merged.get_node_by_id(second.target_id).title == "Sync"
+    assert merged.validate_relations() == []
+
+
+def test_graft_deduplicates_identical_maps():
+    """Test identical maps are grafted once and their relations collapse"""
+    maps = [team_map("Web", ["Login", "Search"]) for _ in range(3)]
+    merged = merge(maps)
+    assert titles(merged.topic_node) == ["Projects"]
+    assert len(merged.relations) == 1
+
+    kept = merge(maps, dedupe=False)
+    assert len(merged.topic_node.children) == 1 and len(kept.topic_node.children) == 3
+    assert len(kept.relations) == 3
+    assert kept.validate_relations() == []
+
+
+def test_unify():
+    """Test maps are overlaid by title paths"""
+    web = team_map("Web", ["Login", "Search"])
+    web_again = team_map("Web", ["Search", "Billing"])
+    web_again.topic_node.children[0].children[0].notes = "Use the new index"
+    web_again.topic_node.children[0].add_label("frontend")
+    mobile = team_map("Mobile", ["Push"], relations=False)
+
+    merged = merge([web, web_again, mobile], UNIFY)
+    assert merged.topic_node.title == "Projects"
+    assert titles(merged.topic_node) == ["Web", "Mobile"]
+    web_branch = merged.topic_node.children[0]
+    assert titles(web_branch) == ["Login", "Search", "Billing"]
+    assert web_branch.labels == ("frontend",)
+    assert web_branch.children[1].notes == "Use the new index"
+    assert [node.title for node in merged.detached_nodes] == ["Ideas"]
+
+    # Login->Search from the first map, Search->Billing from the second
+    node = merged.get_node_by_id
+    pairs = [(node(r.source_id).title, node(r.target_id).title) for r in merged.relations]
+    assert pairs == [("Login", "Search"), ("Search", "Billing")]
+    ids = all_ids(merged)
+    assert len(ids) == len(set(ids))
+
+
+def test_unify_different_roots():
+    """Test maps with different root titles are unified under a new root"""
+    other = team_map("Ops", ["Deploy"], relations=False)
+    other.topic_node.title = "Operations"
+    merged = merge([team_map("Web", ["Login", "Search"]), other], UNIFY, root_title="Company")
+    assert merged.topic_node.title == "Company"
+    assert titles(merged.topic_node) == ["Projects", "Operations"]
+
+
+def test_merge_leaves_inputs_untouched():
+    """Test merging copies nodes instead of moving them"""
+    web = team_map("Web", ["Login"], relations=False)
+    merged = merge([web, team_map("Web", ["Search"], relations=False)], UNIFY)
+    assert titles(web.topic_node.children[0]) == ["Login"]
+    assert merged.topic_node.children[0] is not web.topic_node.children[0]
+
+
+def test_merge_deep_and_empty_maps():
+    """Test deep trees do not hit the recursion limit and empty maps are skipped"""
+    root = TopicNode("Root")
+    node = root
+    for level in range(5000):
+        child = Node(f"Level {level}")
+        node.add_child(child)
+        node = child
+    merged = merge([MindMap("Empty"), MindMap("Deep", root), MindMap("Deep", root)], UNIFY)
+    assert merged.topic_node.title == "Root"
+    assert len(all_ids(merged)) == 5001
+
+
+def test_merge_unknown_strategy():
+    """Test unknown strategies are rejected"""
+    with pytest.raises(ValueError, match="Unknown merge strategy"):
+        merge([], "append")
+
+
+def test_cli_merge(tmp_path):
+    """Test the merge command writes the merged map"""
+    converter_inputs = []
+    for team in ("Web", "Mobile"):
+        path = tmp_path / f"{team}.md"
+        path.write_text(f"# Projects\n## {team}\n### Task\n", encoding="utf-8")
+        converter_inputs.append(str(path))
+    output = tmp_path / "all.json"
+
+    result = CliRunner().invoke(
+        cli, ["merge", *converter_inputs, "--output", str(output), "--strategy", "unify", "--title", "All"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Merged 2 maps" in result.output
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert [child["title"] for child in data["topic_node"]["children"]] == ["Web", "Mobile"]
+
+    result = CliRunner().invoke(cli, ["merge", *converter_inputs, "--output", str(tmp_path / "all.unknown")])
+    assert result.exit_code == 1
+    assert "Error: Cannot auto detect output format" in result.output
+    assert not os.path.exists(tmp_path / "all.unknown")
+
+
+def test_cli_merge_unknown_error(tmp_path, monkeypatch):
+    """Test unexpected failures are reported with a non-zero exit code"""
+    path = tmp_path / "map.md"
+    path.write_text("# Projects\n", encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("xmind_converter.merge.merge", fail)
+    result = CliRunner().invoke(cli, ["merge", str(path), "--output", str(tmp_path / "all.json")])
+    assert result.exit_code == 1
+    assert "Unknown error: boom" in result.output
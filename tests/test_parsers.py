@@ -10,6 +10,7 @@ from xmind_converter.parsers.md_parser import MarkdownParser
 from xmind_converter.parsers.json_parser import JSONParser
 from xmind_converter.parsers.html_parser import HTMLParser
 from xmind_converter.exceptions import ParserError
+from xmind_converter.models import TopicNode
 
 
 class TestXMindParser:
@@ -82,7 +83,7 @@ class TestXMindParser:
         mindmap = parser.parse(xmind_file)
 
         assert mindmap is not None
-        assert mindmap.title == "Untitled"
+        assert mindmap.title == "Sports Theme"
         assert mindmap.topic_node is not None
         assert mindmap.topic_node.title == "Sports"
 
@@ -103,7 +104,7 @@ class TestXMindParser:
         mindmap = parser.parse(xmind_file)
 
         assert mindmap is not None
-        assert mindmap.title == "Untitled"
+        assert mindmap.title == "Sports Theme"
         assert mindmap.topic_node is not None
         assert mindmap.topic_node.title == "Sports"
 
@@ -125,7 +126,7 @@ class TestXMindParser:
 
         assert mindmap.topic_node is not None
         assert mindmap.topic_node.notes == "This is a mind map about various sports"
-        assert mindmap.topic_node.labels == ["Healthy Living"]
+        assert mindmap.topic_node.labels == ("Healthy Living",)
 
     def test_parse_example_v8_with_relations(self):
         """Test parsing example_v8.xmind with relations"""
@@ -140,6 +141,116 @@ class TestXMindParser:
         assert "Aerobic Exercise" in relation_titles
         assert "Team Sport" in relation_titles
 
+    @pytest.fixture
+    def multi_sheet_xmind(self):
+        """Create a three-sheet XMind file"""
+        from xmind_converter.converters.xmind_converter import XMindConverter
+        from xmind_converter.models import MindMap, TopicNode
+
+        mindmaps = []
+        for i in range(3):
+            root = TopicNode(f"Root {i}")
+            root.add_child(TopicNode(f"Child {i}"))
+            mindmaps.append(MindMap(title=f"Sheet {i}", topic_node=root))
+
+        with tempfile.NamedTemporaryFile(suffix=".xmind", delete=False) as f:
+            temp_file = f.name
+        XMindConverter().convert_to(mindmaps, temp_file)
+        yield temp_file
+        os.unlink(temp_file)
+
+    def test_open_workbook_lists_sheets(self, multi_sheet_xmind):
+        """Test sheet metadata is available without parsing sheets"""
+        workbook = XMindParser().open_workbook(multi_sheet_xmind)
+
+        assert len(workbook) == 3
+        assert [info.title for info in workbook.sheets] == ["Sheet 0", "Sheet 1", "Sheet 2"]
+        assert [info.index for info in workbook.sheets] == [0, 1, 2]
+
+    def test_parse_sheet_by_index_and_title(self, multi_sheet_xmind):
+        """Test parsing a single sheet by index or title"""
+        parser = XMindParser()
+        workbook = parser.open_workbook(multi_sheet_xmind)
+
+        assert workbook.parse_sheet(1).topic_node.title == "Root 1"
+        assert workbook.parse_sheet("Sheet 2").topic_node.title == "Root 2"
+        assert parser.parse(multi_sheet_xmind).title == "Sheet 0"
+        assert parser.parse(multi_sheet_xmind, sheet="Sheet 1").topic_node.children[0].title == "Child 1"
+
+        with pytest.raises(ParserError):
+            workbook.parse_sheet("Missing")
+        with pytest.raises(ParserError):
+            workbook.parse_sheet(3)
+
+    def test_parse_all_sheets_in_parallel(self, multi_sheet_xmind):
+        """Test parsing all sheets across a process pool"""
+        parser = XMindParser()
+        serial = parser.parse_all(multi_sheet_xmind)
+        parallel = parser.parse_all(multi_sheet_xmind, workers=2)
+
+        assert [m.title for m in serial] == ["Sheet 0", "Sheet 1", "Sheet 2"]
+        assert [m.title for m in parallel] == [m.title for m in serial]
+        assert [m.topic_node.id for m in parallel] == [m.topic_node.id for m in serial]
+
+    def test_parse_all_xml_sheets(self):
+        """Test parsing a multi-sheet content.xml"""
+        content = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<xmap-content xmlns="urn:xmind:xmap:xmlns:content:2.0" version="2.0">'
+            '<sheet id="s1"><topic id="t1"><title>First</title></topic><title>One</title></sheet>'
+            '<sheet id="s2"><topic id="t2"><title>Second</title></topic><title>Two</title></sheet>'
+            "</xmap-content>"
+        )
+        with tempfile.NamedTemporaryFile(suffix=".xmind", delete=False) as f:
+            temp_file = f.name
+        with zipfile.ZipFile(temp_file, "w") as zf:
+            zf.writestr("content.xml", content)
+
+        try:
+            parser = XMindParser()
+            workbook = parser.open_workbook(temp_file)
+            assert [info.title for info in workbook.sheets] == ["One", "Two"]
+            assert workbook.parse_sheet("Two").topic_node.title == "Second"
+            assert workbook.parse_sheet("Two").title == "Two"
+            mindmaps = parser.parse_all(temp_file, workers=2)
+            assert [m.topic_node.title for m in mindmaps] == ["First", "Second"]
+            assert [m.title for m in mindmaps] == ["One", "Two"]
+        finally:
+            os.unlink(temp_file)
+
+    @pytest.mark.parametrize("name", ["example_v8.xmind", "example_v7.5.xmind"])
+    def test_parse_with_max_depth(self, name):
+        """Test topics below max_depth are not built"""
+        xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", name)
+        mindmap = XMindParser().parse(xmind_file, max_depth=2)
+        assert [child.title for child in mindmap.topic_node.children] == ["Running", "Swimming", "Basketball"]
+        assert all(not child.children for child in mindmap.topic_node.children)
+        assert XMindParser().parse(xmind_file, max_depth=1).topic_node.children == []
+
+    @pytest.mark.parametrize("name", ["example_v8.xmind", "example_v7.5.xmind"])
+    def test_parse_with_root_id(self, name):
+        """Test only the subtree of root_id is built and dangling relations are dropped"""
+        xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", name)
+        mindmap = XMindParser().parse(xmind_file, root_id="5qhp8mauhchjsnokqtevu72ula")
+        assert isinstance(mindmap.topic_node, TopicNode)
+        assert mindmap.topic_node.title == "Swimming"
+        assert [child.title for child in mindmap.topic_node.children] == ["Freestyle"]
+        assert mindmap.detached_nodes == []
+        assert mindmap.relations == []
+
+        with pytest.raises(ParserError, match="Topic not found"):
+            XMindParser().parse(xmind_file, root_id="missing")
+
+    def test_partial_parses_are_cached_separately(self):
+        """Test a workbook keeps full and partial sheets apart"""
+        xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+        workbook = XMindParser().open_workbook(xmind_file)
+        shallow = workbook.parse_sheet(0, max_depth=1)
+        full = workbook.parse_sheet(0)
+        assert shallow.topic_node.children == []
+        assert len(full.topic_node.children) == 3
+        assert workbook.parse_sheet(0, max_depth=1) is shallow
+
 
 class TestCSVParser:
     """Test CSV parser - CSV format to MindMap"""
@@ -233,31 +344,31 @@ class TestMarkdownParser:
 
         assert mindmap.topic_node is not None
         assert mindmap.topic_node.notes == "This is a mind map about various sports"
-        assert mindmap.topic_node.labels == ["Healthy Living"]
+        assert mindmap.topic_node.labels == ("Healthy Living",)
 
         running = mindmap.topic_node.children[0]
         assert running.notes == "A type of aerobic exercise"
-        assert running.labels == ["Aerobic"]
+        assert running.labels == ("Aerobic",)
 
         marathon = running.children[0]
         assert marathon.notes == "Long-distance running race"
-        assert marathon.labels == ["Challenge"]
+        assert marathon.labels == ("Challenge",)
 
         swimming = mindmap.topic_node.children[1]
         assert swimming.notes == "Full-body exercise"
-        assert swimming.labels == ["Full-body"]
+        assert swimming.labels == ("Full-body",)
 
         freestyle = swimming.children[0]
         assert freestyle.notes == "Most common swimming stroke"
-        assert freestyle.labels == ["Basic"]
+        assert freestyle.labels == ("Basic",)
 
         basketball = mindmap.topic_node.children[2]
         assert basketball.notes == "Team sport"
-        assert basketball.labels == ["Team"]
+        assert basketball.labels == ("Team",)
 
         nba = basketball.children[0]
         assert nba.notes == "American professional basketball league"
-        assert nba.labels == ["Professional"]
+        assert nba.labels == ("Professional",)
 
     def test_parse_markdown_nonexistent_file(self):
         """Test parsing nonexistent Markdown file"""
@@ -304,31 +415,31 @@ class TestJSONParser:
 
         assert mindmap.topic_node is not None
         assert mindmap.topic_node.notes == "This is a mind map about various sports"
-        assert mindmap.topic_node.labels == ["Healthy Living"]
+        assert mindmap.topic_node.labels == ("Healthy Living",)
 
         running = mindmap.topic_node.children[0]
         assert running.notes == "A type of aerobic exercise"
-        assert running.labels == ["Aerobic"]
+        assert running.labels == ("Aerobic",)
 
         marathon = running.children[0]
         assert marathon.notes == "Long-distance running race"
-        assert marathon.labels == ["Challenge"]
+        assert marathon.labels == ("Challenge",)
 
         swimming = mindmap.topic_node.children[1]
         assert swimming.notes == "Full-body exercise"
-        assert swimming.labels == ["Full-body"]
+        assert swimming.labels == ("Full-body",)
 
         freestyle = swimming.children[0]
         assert freestyle.notes == "Most common swimming stroke"
-        assert freestyle.labels == ["Basic"]
+        assert freestyle.labels == ("Basic",)
 
         basketball = mindmap.topic_node.children[2]
         assert basketball.notes == "Team sport"
-        assert basketball.labels == ["Team"]
+        assert basketball.labels == ("Team",)
 
         nba = basketball.children[0]
         assert nba.notes == "American professional basketball league"
-        assert nba.labels == ["Professional"]
+        assert nba.labels == ("Professional",)
 
     def test_parse_json_with_relations(self):
         """Test parsing JSON file with relations"""
@@ -411,3 +522,51 @@ class TestHTMLParser:
             assert mindmap.topic_node.children[0].title == "Child"
         finally:
             os.unlink(temp_file)
+
+
+class TestInterning:
+    """Test parsers share repeated titles and label sets"""
+
+    @pytest.mark.parametrize("format_type", ["xmind", "json", "md"])
+    def test_repeated_labels_and_titles_are_shared(self, format_type):
+        """Test equal labels are one tuple and equal titles one string"""
+        from xmind_converter.core import CoreConverter
+        from xmind_converter.models import MindMap, Node, TopicNode
+
+        root = TopicNode("Root", labels=["P1", "todo"])
+        for _ in range(3):
+            root.add_child(Node("Task", labels=["P1", "todo"]))
+        converter = CoreConverter()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, f"labels.{format_type}")
+            converter.convert_to(MindMap("Labels", root), format_type, path)
+            mindmap = converter.load_from(path)
+
+        nodes = [mindmap.topic_node] + mindmap.topic_node.children
+        assert all(node.labels == ("P1", "todo") for node in nodes)
+        assert all(node.labels is nodes[0].labels for node in nodes)
+        assert all(node.title is nodes[1].title for node in nodes[1:])
+
+    def test_intern_table(self):
+        """Test intern table returns shared objects"""
+        from xmind_converter.interning import InternTable
+
+        table = InternTable()
+        first = table.labels(["a", "b"])
+        assert table.labels(("a", "b")) is first
+        assert table.labels(None) == ()
+        assert table.string("".join(["ti", "tle"])) is table.string("title")
+
+    def test_node_labels_are_immutable_tuples(self):
+        """Test label helpers replace the shared tuple instead of mutating it"""
+        from xmind_converter.models import Node
+
+        shared = ("P1",)
+        first, second = Node("A", labels=shared), Node("B", labels=shared)
+        first.add_label("todo")
+        first.add_label("todo")
+        assert first.labels == ("P1", "todo")
+        assert second.labels == ("P1",)
+        first.remove_label("P1")
+        assert first.labels == ("todo",)
+        assert Node("C").labels == ()
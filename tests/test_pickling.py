@@ -0,0 +1,144 @@
+"""Test compact, non-recursive pickling of nodes and mind maps"""
+
+import copy
+import pickle
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+
+
+class TaggedNode(Node):
+    """Node subclass with an extra attribute"""
+
+    def __init__(self, title, tag=None, **kwargs):
+        super().__init__(title, **kwargs)
+        self.tag = tag
+
+
+class NamedMindMap(MindMap):
+    """Mind map subclass with an extra attribute"""
+
+    def __init__(self, *args, owner=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owner = owner
+
+
+def titles(node):
+    """Get nested [title, children] lists of a small tree"""
+    return [node.title, [titles(child) for child in node.children]]
+
+
+def build_mindmap():
+    """Build a map with notes, labels, every node class and a relation"""
+    root = TopicNode("Root", node_id="root", notes="Top", labels=["a", "b"])
+    first = Node("First", node_id="first", notes="", labels=["a", "b"])
+    first.children = [Node("Leaf", node_id="leaf"), TaggedNode("Tagged", tag={"x": 1}, node_id="tagged")]
+    root.children = [first, Node("", node_id="empty-title")]
+    loose = DetachedNode("Loose", node_id="loose", labels=["c"])
+    relations = [Relation("leaf", "loose", relation_id="r1", title="Link")]
+    return MindMap("Map", root, detached_nodes=[loose], relations=relations)
+
+
+def test_round_trip():
+    """Test every field, node class and relation survives pickling"""
+    mindmap = build_mindmap()
+    mindmap.content_hash()
+    restored = pickle.loads(pickle.dumps(mindmap))
+    # Parent links and cached hashes are not pickled
+    assert set(restored.topic_node.__dict__) == {"_id", "_title", "children", "_notes", "_labels"}
+
+    assert type(restored) is MindMap and restored.title == "Map"
+    assert restored.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+    assert titles(restored.topic_node) == titles(mindmap.topic_node)
+    assert type(restored.topic_node) is TopicNode and type(restored.detached_nodes[0]) is DetachedNode
+    first = restored.topic_node.children[0]
+    assert first.notes == "" and first.labels == ("a", "b") and restored.topic_node.children[1].notes is None
+    tagged = first.children[1]
+    assert type(tagged) is TaggedNode and tagged.tag == {"x": 1}
+    assert [relation.title for relation in restored.relations_of("leaf")] == ["Link"]
+
+    # Pickling a node pickles its subtree only, without parent links
+    restored_first = pickle.loads(pickle.dumps(mindmap.topic_node.children[0]))
+    assert titles(restored_first) == titles(mindmap.topic_node.children[0])
+
+
+def test_deep_and_wide_maps():
+    """Test maps far deeper than the recursion limit and very wide maps round-trip"""
+    root = TopicNode("Root", node_id="root")
+    node = root
+    for level in range(20000):
+        child = Node(f"Level {level}", node_id=f"deep-{level}")
+        node.children.append(child)
+        node = child
+    root.children.extend(Node(f"Wide {index}", node_id=f"wide-{index}") for index in range(20000))
+    mindmap = MindMap("Big", root)
+
+    restored = pickle.loads(pickle.dumps(mindmap, protocol=pickle.HIGHEST_PROTOCOL))
+    assert restored.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+    assert len(restored.topic_node.children) == 20001
+
+    # copy.deepcopy goes through the same flat representation
+    copied = copy.deepcopy(mindmap)
+    assert copied.topic_node is not root
+    assert copied.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+
+
+def test_compact_size():
+    """Test the pickle is little more than the node text"""
+    root = TopicNode("Root", node_id="root")
+    root.children = [Node(f"Topic {index}", node_id=f"id-{index}", labels=["tag"]) for index in range(10000)]
+    data = pickle.dumps(MindMap("Map", root))
+    text = sum(len(child.id) + len(child.title) for child in root.children)
+    assert len(data) < text * 1.3
+
+
+def test_nul_characters_and_subclass_state():
+    """Test strings containing NUL and mind map subclass attributes survive pickling"""
+    root = TopicNode("Ro\x00ot", node_id="id\x00root")
+    root.children = [Node("Child\x00", node_id="child")]
+    mindmap = NamedMindMap("Map", root, owner="me", relations=[Relation("root", "child")])
+    restored = pickle.loads(pickle.dumps(mindmap))
+    assert type(restored) is NamedMindMap and restored.owner == "me"
+    assert restored.topic_node.id == "id\x00root" and restored.topic_node.children[0].title == "Child\x00"
+    assert restored.relations[0].id == mindmap.relations[0].id
+
+    empty = pickle.loads(pickle.dumps(MindMap("Empty")))
+    assert empty.topic_node is None and empty.detached_nodes == [] and empty.relations == []
+
+
+def test_deep_node_and_shared_subtrees():
+    """Test a bare node far deeper than the recursion limit round-trips and shared subtrees keep their identity"""
+    root = Node("Root", node_id="root")
+    node = root
+    for level in range(5000):
+        child = Node(f"Level {level}", node_id=f"deep-{level}", notes=f"Note {level}")
+        node.children.append(child)
+        node = child
+    restored = pickle.loads(pickle.dumps(root))
+    assert restored.content_hash(include_ids=True) == root.content_hash(include_ids=True)
+    assert copy.deepcopy(root).content_hash(include_ids=True) == root.content_hash(include_ids=True)
+
+    shared = TaggedNode("Shared", tag=[1], node_id="shared", children=[Node("Leaf", node_id="leaf")])
+    root = TopicNode("Root", node_id="root", children=[shared, Node("Other", node_id="other", children=[shared])])
+    restored = pickle.loads(pickle.dumps([root, root]))
+    assert restored[0] is restored[1]
+    assert restored[0].children[0] is restored[0].children[1].children[0]
+    assert restored[0].children[0].tag == [1] and titles(restored[0]) == titles(root)
+
+    mindmap = MindMap("Map", root, detached_nodes=[DetachedNode("Loose", node_id="loose", children=[shared])])
+    restored_map = pickle.loads(pickle.dumps(mindmap))
+    assert restored_map.detached_nodes[0].children[0] is restored_map.topic_node.children[0]
+
+
+def test_shallow_copies():
+    """Test copy.copy shares children and trees instead of copying them"""
+    mindmap = build_mindmap()
+    tagged = mindmap.topic_node.children[0].children[1]
+    copied = copy.copy(tagged)
+    assert type(copied) is TaggedNode and copied.tag is tagged.tag and copied.id == tagged.id
+
+    first = mindmap.topic_node.children[0]
+    copied = copy.copy(first)
+    assert copied is not first and copied.children == first.children and copied.children is not first.children
+
+    copied_map = copy.copy(mindmap)
+    assert type(copied_map) is MindMap and copied_map.topic_node is mindmap.topic_node
+    assert copied_map.relations is mindmap.relations
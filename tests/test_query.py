@@ -0,0 +1,196 @@
+"""Test subtree selection and pruning views"""
+
+import json
+import os
+import pickle
+import pytest
+from click.testing import CliRunner
+from xmind_converter.cli import cli
+from xmind_converter.core import CoreConverter
+from xmind_converter.models import MindMap, Node, Relation, TopicNode
+from xmind_converter.query import NodeView, Query, query
+
+
+class _Untouchable(Node):
+    """Node whose children must never be visited"""
+
+    @property
+    def children(self):
+        raise AssertionError(f"children of {self.title} visited")
+
+    @children.setter
+    def children(self, value):
+        pass
+
+
+@pytest.fixture
+def mindmap():
+    """Create a small map with labels and relations"""
+    root = TopicNode("Root", node_id="root")
+    sports = Node("Sports", node_id="sports")
+    running = Node("Running", node_id="running", labels=["cardio"])
+    marathon = Node("Marathon", node_id="marathon", labels=["draft"])
+    sprint = Node("Sprint", node_id="sprint")
+    running.children = [marathon, sprint]
+    swimming = Node("Swimming", node_id="swimming", labels=["cardio"])
+    sports.children = [running, swimming]
+    food = Node("Food", node_id="food")
+    food.children = [Node("Running Buffet", node_id="buffet")]
+    root.children = [sports, food]
+    relations = [Relation("running", "sprint", "r1"), Relation("running", "food", "r2")]
+    return MindMap("Map", root, relations=relations)
+
+
+def titles(node):
+    return [node.title, [titles(child) for child in node.children]]
+
+
+def test_path_glob_selects_branch(mindmap):
+    """Test a title path glob re-roots the view at the match"""
+    view = query(mindmap, "Root/Sports/Run*")
+    assert titles(view.topic_node) == ["Running", [["Marathon", []], ["Sprint", []]]]
+    assert view.detached_nodes == []
+    assert [rel.id for rel in view.relations] == ["r1"]
+    assert view.title == "Map"
+
+
+def test_double_star_and_multiple_matches(mindmap):
+    """Test ** spans levels and extra matches become detached nodes"""
+    view = query(mindmap, "**/*Running*")
+    assert view.topic_node.title == "Running"
+    assert [node.title for node in view.detached_nodes] == ["Running Buffet"]
+
+
+def test_id_regex_and_label_selectors(mindmap):
+    """Test the non-path selectors"""
+    assert query(mindmap, "id:food").topic_node.title == "Food"
+    view = query(mindmap, "re:^(Swim|Spr)")
+    assert [view.topic_node.title] + [n.title for n in view.detached_nodes] == ["Sprint", "Swimming"]
+    view = query(mindmap, "label:cardio")
+    assert [view.topic_node.title] + [n.title for n in view.detached_nodes] == ["Running", "Swimming"]
+    assert query(mindmap, "id:missing").topic_node is None
+
+
+def test_multiple_selectors_drop_nested_matches(mindmap):
+    """Test selector results are merged in document order without duplicates"""
+    view = query(mindmap, ["id:marathon", "Root/Sports", "id:food"])
+    assert [view.topic_node.title] + [n.title for n in view.detached_nodes] == ["Sports", "Food"]
+
+
+def test_max_depth_and_exclude_labels(mindmap):
+    """Test depth limits and label exclusion prune the view"""
+    view = query(mindmap, max_depth=2)
+    assert titles(view.topic_node) == ["Root", [["Sports", []], ["Food", []]]]
+
+    view = query(mindmap, "id:running", exclude_labels=["draft"])
+    assert titles(view.topic_node) == ["Running", [["Sprint", []]]]
+
+    assert query(mindmap, exclude_labels=["cardio"]).relations == []
+
+
+def test_view_shares_nodes_and_is_read_only(mindmap):
+    """Test views wrap the original nodes instead of copying them"""
+    view = query(mindmap, "id:running")
+    assert isinstance(view.topic_node, NodeView)
+    assert view.topic_node.node is mindmap.topic_node.children[0].children[0]
+    with pytest.raises(TypeError):
+        view.topic_node.add_child(Node("x"))
+    with pytest.raises(AttributeError):
+        view.topic_node.title = "x"
+
+
+def test_path_selector_skips_other_branches(mindmap):
+    """Test path selection only walks branches matching the path"""
+    mindmap.topic_node.children.append(_Untouchable("Huge"))
+    assert query(mindmap, "Root/Food").topic_node.title == "Food"
+
+
+def test_views_convert_and_pickle(mindmap, tmp_path):
+    """Test every converter accepts a view, also when shipped to workers"""
+    converter = CoreConverter()
+    view = query(mindmap, "id:running", exclude_labels=["draft"])
+    for format_type in ["xmind", "csv", "md", "html", "json"]:
+        loaded = converter.loads(converter.dumps(view, format_type), format_type)
+        assert loaded.topic_node.title == "Running"
+        assert [child.title for child in loaded.topic_node.children] == ["Sprint"]
+
+    restored = pickle.loads(pickle.dumps(view.topic_node))
+    assert titles(restored) == ["Running", [["Sprint", []]]]
+
+
+def test_invalid_queries():
+    """Test invalid options are rejected"""
+    with pytest.raises(ValueError):
+        Query("re:(")
+    with pytest.raises(ValueError):
+        Query("/")
+    with pytest.raises(ValueError):
+        Query(max_depth=0)
+
+
+def test_cli_convert_with_query(tmp_path):
+    """Test --select, --max-depth and --exclude-label on the convert command"""
+    source = tmp_path / "in.md"
+    source.write_text("# Root\n\n## A\n\n### A1\n- labels: [draft]\n\n### A2\n\n#### Deep\n\n## B\n", encoding="utf-8")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["convert", str(source), "-", "-o", "md", "--select", "Root/A", "--max-depth", "2", "--exclude-label", "draft"],
+    )
+    assert result.exit_code == 0
+    assert result.stdout == "# A\n\n## A2\n"
+
+
+def test_parser_options_push_down_to_xmind(tmp_path):
+    """Test depth limits and id selections are applied while parsing XMind"""
+    assert Query("id:x", max_depth=2).parser_options() == {"root_id": "x", "max_depth": 2}
+    assert Query(max_depth=3).parser_options() == {"max_depth": 3}
+    assert Query(["id:x", "id:y"]).parser_options() == {}
+    assert Query("Root/A").parser_options() == {}
+
+    xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+    output = tmp_path / "out.md"
+    CoreConverter().convert(xmind_file, str(output), query=Query("id:6802mmk8fu0fisqfuvlp8o970m", max_depth=1))
+    assert output.read_text(encoding="utf-8").startswith("# Running\n- notes:")
+    assert "Marathon" not in output.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name", ["example_v8.xmind", "sports_v8.json", "sports_v8.md"])
+def test_missing_id_selects_nothing_in_every_format(tmp_path, name):
+    """Test a missing id: selection gives an empty view, also when pushed down to XMindParser"""
+    source = os.path.join(os.path.dirname(__file__), "..", "data", name)
+    output = tmp_path / "out.json"
+    CoreConverter().convert(source, str(output), query=Query("id:missing"))
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert data["topic_node"] is None
+    assert data["detached_nodes"] == [] and data["relations"] == []
+
+    with open(source, "rb") as f:
+        result = CliRunner().invoke(
+            cli,
+            ["convert", "-", "-", "-i", os.path.splitext(name)[1][1:], "-o", "json", "--select", "id:missing"],
+            input=f.read(),
+        )
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["topic_node"] is None
+
+
+def test_corrupt_xmind_is_not_parsed_twice(tmp_path, monkeypatch):
+    """Test only a missing id: falls back to a full parse, other parse errors propagate"""
+    import zipfile
+    from xmind_converter.exceptions import ParserError, TopicNotFound
+
+    source = tmp_path / "corrupt.xmind"
+    with zipfile.ZipFile(source, "w") as zf:
+        zf.writestr("content.json", "{not json")
+    converter = CoreConverter()
+    calls = []
+    load_from = converter.load_from
+    monkeypatch.setattr(
+        converter, "load_from", lambda *args, **kwargs: calls.append(kwargs) or load_from(*args, **kwargs)
+    )
+
+    with pytest.raises(ParserError) as error:
+        converter.convert(str(source), str(tmp_path / "out.json"), query=Query("id:missing"))
+    assert not isinstance(error.value, TopicNotFound)
+    assert len(calls) == 1 and calls[0]["root_id"] == "missing"
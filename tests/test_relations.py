@@ -0,0 +1,108 @@
+"""Test the relation adjacency index and relation validation"""
+
+import os
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+from xmind_converter.parsers.xmind_parser import XMindParser
+from xmind_converter.relations import SOURCE, TARGET, RelationIndex
+
+
+def build_mindmap():
+    """Build a map with a detached tree, a self-relation and a dangling relation"""
+    root = TopicNode("Root", node_id="root")
+    a = Node("A", node_id="a")
+    b = Node("B", node_id="b")
+    root.children = [a, b]
+    loose = DetachedNode("Loose", node_id="loose")
+    relations = [
+        Relation("a", "b", relation_id="r1"),
+        Relation("b", "loose", relation_id="r2"),
+        Relation("a", "a", relation_id="r3"),
+        Relation("ghost", "b", relation_id="r4"),
+    ]
+    return MindMap("Relations", root, detached_nodes=[loose], relations=relations)
+
+
+def ids(relations):
+    return [relation.id for relation in relations]
+
+
+def test_relation_index():
+    """Test outgoing, incoming and touching relations per node"""
+    mindmap = build_mindmap()
+    assert ids(mindmap.outgoing_relations("a")) == ["r1", "r3"]
+    assert ids(mindmap.incoming_relations("b")) == ["r1", "r4"]
+    assert ids(mindmap.relations_of("a")) == ["r1", "r3"]
+    assert ids(mindmap.relations_of("b")) == ["r2", "r1", "r4"]
+    assert mindmap.relations_of("root") == []
+    assert mindmap.relation_index.endpoint_ids() == {"a", "b", "loose", "ghost"}
+    assert len(mindmap.relation_index) == 4
+
+
+def test_relation_index_stays_in_sync():
+    """Test add_relation/remove_relation update the index and invalidation rebuilds it"""
+    mindmap = build_mindmap()
+    index = mindmap.relation_index
+
+    extra = Relation("root", "loose", relation_id="r5")
+    mindmap.add_relation(extra)
+    assert mindmap.relation_index is index
+    assert ids(mindmap.incoming_relations("loose")) == ["r2", "r5"]
+
+    mindmap.remove_relation(mindmap.relations[0])
+    assert mindmap.relation_index is index
+    assert ids(mindmap.outgoing_relations("a")) == ["r3"]
+
+    mindmap.relations.append(Relation("b", "root", relation_id="r6"))
+    mindmap.invalidate_relation_index()
+    assert ids(mindmap.incoming_relations("root")) == ["r6"]
+    mindmap.relations = []
+    assert mindmap.relations_of("b") == []
+
+
+def test_relation_index_after_same_length_edit():
+    """Test replacing a relation in place is picked up after invalidate_relation_index"""
+    mindmap = build_mindmap()
+    assert ids(mindmap.outgoing_relations("a")) == ["r1", "r3"]
+
+    mindmap.relations[0] = Relation("loose", "b", relation_id="r7")
+    mindmap.invalidate_relation_index()
+    assert ids(mindmap.outgoing_relations("a")) == ["r3"]
+    assert ids(mindmap.incoming_relations("b")) == ["r7", "r4"]
+
+    mindmap.relations.pop()
+    mindmap.relations.append(Relation("a", "loose", relation_id="r8"))
+    mindmap.invalidate_relation_index()
+    assert ids(mindmap.outgoing_relations("a")) == ["r3", "r8"]
+
+
+def test_relation_index_remove_unknown():
+    """Test removing a relation that is not indexed is a no-op"""
+    index = RelationIndex([Relation("a", "b", relation_id="r1")])
+    index.remove(Relation("a", "b", relation_id="other"))
+    assert len(index) == 1
+    index.remove(index.outgoing("a")[0])
+    assert len(index) == 0 and index.endpoint_ids() == set()
+
+
+def test_validate_relations():
+    """Test dangling endpoints are reported per relation end"""
+    mindmap = build_mindmap()
+    mindmap.add_relation(Relation("nowhere", "void", relation_id="r5"))
+    issues = mindmap.validate_relations()
+    assert [(issue.relation.id, issue.end, issue.node_id) for issue in issues] == [
+        ("r4", SOURCE, "ghost"),
+        ("r5", SOURCE, "nowhere"),
+        ("r5", TARGET, "void"),
+    ]
+    assert issues[0].to_dict() == {"relation_id": "r4", "end": "source", "node_id": "ghost"}
+    assert MindMap("Empty").validate_relations() == []
+
+
+def test_legacy_xmind_relation_endpoints():
+    """Test XMind 8 end1/end2 attributes and title elements are read"""
+    xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", "example_v7.5.xmind")
+    mindmap = XMindParser().parse(xmind_file)
+    first = mindmap.relations[0]
+    assert (first.source_id, first.target_id) == ("6802mmk8fu0fisqfuvlp8o970m", "5qhp8mauhchjsnokqtevu72ula")
+    assert first.title == "Aerobic Exercise"
+    assert ids(mindmap.incoming_relations("5qhp8mauhchjsnokqtevu72ula"))[0] == first.id
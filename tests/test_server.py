@@ -0,0 +1,172 @@
+"""Test conversion daemon"""
+
+import base64
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import pytest
+from xmind_converter.server import ConversionServer
+
+
+@pytest.fixture
+def xmind_file():
+    """Get path to test XMind file"""
+    return os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+
+
+@pytest.fixture
+def server():
+    """Start a one-worker HTTP daemon on a free port"""
+    server = ConversionServer(port=0, workers=1)
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def request(address, method, path, payload=None):
+    """Send a JSON request to the daemon"""
+    connection = http.client.HTTPConnection(*address, timeout=30)
+    body = json.dumps(payload) if payload is not None else None
+    connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read().decode("utf-8"))
+    connection.close()
+    return result
+
+
+def test_convert_paths(server, xmind_file):
+    """Test converting files on disk through the daemon"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "out.md")
+        status, payload = request(
+            server.address, "POST", "/convert", {"input_path": xmind_file, "output_path": output_path}
+        )
+        assert status == 200
+        assert payload["ok"] is True
+        assert "Conversion completed" in payload["result"]
+        with open(output_path, "r", encoding="utf-8") as f:
+            assert "# Sports" in f.read()
+
+
+def test_convert_bytes(server, xmind_file):
+    """Test converting a byte payload through the daemon"""
+    with open(xmind_file, "rb") as f:
+        data = base64.b64encode(f.read()).decode("ascii")
+
+    status, payload = request(
+        server.address, "POST", "/convert", {"data": data, "input_format": "xmind", "output_format": "csv"}
+    )
+    assert status == 200
+    assert "Sports,Running,contains" in base64.b64decode(payload["data"]).decode("utf-8")
+
+
+def test_invalid_jobs(server):
+    """Test malformed and failing jobs are reported"""
+    status, payload = request(server.address, "POST", "/convert", {"output_path": "out.md"})
+    assert status == 400
+    assert payload["ok"] is False
+
+    status, payload = request(
+        server.address, "POST", "/convert", {"input_path": "missing.xmind", "output_path": "x.md"}
+    )
+    assert status == 422
+    assert payload["ok"] is False
+
+
+def test_metrics(server, xmind_file):
+    """Test queue depth and latency metrics"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(3):
+            request(
+                server.address,
+                "POST",
+                "/convert",
+                {"input_path": xmind_file, "output_path": os.path.join(tmpdir, f"out{i}.json")},
+            )
+
+    status, metrics = request(server.address, "GET", "/metrics")
+    assert status == 200
+    assert metrics["completed"] == 3
+    assert metrics["queue_depth"] == 0
+    assert metrics["latency_ms"]["count"] == 3
+    assert metrics["latency_ms"]["p50"] > 0
+
+
+def test_root_confines_paths(xmind_file):
+    """Test paths are resolved against root and may not leave it"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = ConversionServer(port=0, workers=1, root=tmpdir)
+        server.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            status, payload = request(
+                server.address, "POST", "/convert", {"input_path": xmind_file, "output_path": "out.md"}
+            )
+            assert status == 403
+            assert "outside of root" in payload["error"]
+
+            status, payload = request(
+                server.address, "POST", "/convert", {"input_path": "../in.xmind", "output_path": "out.md"}
+            )
+            assert status == 403
+
+            with open(xmind_file, "rb") as src, open(os.path.join(tmpdir, "in.xmind"), "wb") as dst:
+                dst.write(src.read())
+            status, payload = request(
+                server.address, "POST", "/convert", {"input_path": "in.xmind", "output_path": "out.md"}
+            )
+            assert status == 200
+            assert os.path.exists(os.path.join(tmpdir, "out.md"))
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+def test_shutdown_without_serving():
+    """Test shutdown returns when serve_forever was never entered"""
+    server = ConversionServer(port=0, workers=1)
+    server.start()
+    thread = threading.Thread(target=server.shutdown, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
+    # A later serve_forever returns at once instead of serving a closed server
+    server.serve_forever()
+
+
+def test_unix_socket(xmind_file):
+    """Test serving over a Unix socket"""
+
+    class UnixConnection(http.client.HTTPConnection):
+        def __init__(self, path):
+            super().__init__("localhost", timeout=30)
+            self.path = path
+
+        def connect(self):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(self.path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = os.path.join(tmpdir, "daemon.sock")
+        server = ConversionServer(socket_path=socket_path, workers=1)
+        server.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            connection = UnixConnection(socket_path)
+            connection.request("GET", "/health")
+            response = connection.getresponse()
+            assert response.status == 200
+            assert json.loads(response.read().decode("utf-8")) == {"ok": True}
+            connection.close()
+        finally:
+            server.shutdown()
+            thread.join()
+        assert not os.path.exists(socket_path)
@@ -0,0 +1,118 @@
+"""Test publishing mind maps to shared memory and rendering them in workers"""
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pytest
+from xmind_converter.core import CoreConverter
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+from xmind_converter.shared import SharedMindMapView, attach, publish
+
+FORMATS = ["md", "json", "html", "csv"]
+
+
+def build_mindmap():
+    """Build a map with notes, labels, unicode, a detached tree and a relation"""
+    root = TopicNode("Root", node_id="root", notes="Top ünicode 😀", labels=["a", "b"])
+    first = Node("First", node_id="first", notes="", labels=["a", "b"])
+    first.children = [Node("Leaf", node_id="leaf", labels=["c"]), Node("Lé\x00af 2", node_id="leaf2")]
+    root.children = [first, Node("Second", node_id="second")]
+    loose = DetachedNode("Loose", node_id="loose", notes="Detached")
+    loose.children = [Node("Loose child", node_id="loose.0")]
+    relations = [Relation("leaf", "loose", relation_id="r1", title="Link")]
+    return MindMap("Map", root, detached_nodes=[loose], relations=relations)
+
+
+def render(shared_map, format_type):
+    """Render a map received by a worker process"""
+    with shared_map:
+        return type(shared_map).__name__, CoreConverter().dumps(shared_map, format_type)
+
+
+def test_round_trip():
+    """Test an attached view exports and hashes exactly like the original map"""
+    converter = CoreConverter()
+    mindmap = build_mindmap()
+    with publish(mindmap) as shared_map, attach(shared_map.name) as view:
+        assert isinstance(view, MindMap) and view.title == "Map"
+        assert view.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+        for format_type in FORMATS:
+            assert converter.dumps(view, format_type) == converter.dumps(mindmap, format_type)
+
+        first = view.topic_node.children[0]
+        assert (first.id, first.notes, first.labels) == ("first", "", ("a", "b"))
+        assert view.topic_node.children[1].notes is None
+        assert first.children[1].title == "Lé\x00af 2"
+        assert [node.id for node in view.detached_nodes] == ["loose"]
+        assert [(r.id, r.source_id, r.target_id, r.title) for r in view.relations] == [("r1", "leaf", "loose", "Link")]
+        assert view.get_node_by_id("loose.0").title == "Loose child"
+
+
+def test_deep_map():
+    """Test maps far deeper than the recursion limit are published and read back"""
+    root = TopicNode("Root", node_id="root")
+    node = root
+    for level in range(5000):
+        child = Node(f"Level {level}", node_id=f"deep-{level}")
+        node.children.append(child)
+        node = child
+    root.children.extend(Node(f"Wide {index}") for index in range(1000))
+    mindmap = MindMap("Deep", root)
+    with publish(mindmap) as shared_map, attach(shared_map.name) as view:
+        assert len(view.topic_node.children) == 1001
+        assert view.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+
+
+def test_read_only():
+    """Test shared nodes reject edits"""
+    with publish(build_mindmap()) as shared_map, attach(shared_map.name) as view:
+        node = view.topic_node
+        with pytest.raises(TypeError):
+            node.add_child(Node("New"))
+        with pytest.raises(TypeError):
+            node.add_label("x")
+        with pytest.raises(AttributeError):
+            node.title = "Changed"
+        with pytest.raises(TypeError):
+            node.replace(title="Changed")
+        with pytest.raises(TypeError):
+            pickle.dumps(node)
+
+
+def test_empty_map_and_bad_blocks():
+    """Test maps without nodes and blocks that do not hold a map"""
+    with publish(MindMap("Empty")) as shared_map, attach(shared_map.name) as view:
+        assert view.topic_node is None and view.detached_nodes == [] and view.relations == []
+
+    block = shared_memory.SharedMemory(create=True, size=256)
+    try:
+        with pytest.raises(ValueError):
+            attach(block.name)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_unlink():
+    """Test an unlinked block can no longer be attached"""
+    shared_map = publish(build_mindmap())
+    name = shared_map.name
+    shared_map.unlink()
+    with pytest.raises(FileNotFoundError):
+        attach(name)
+
+
+def test_worker_processes():
+    """Test workers receive an attached view and render every format from one published map"""
+    converter = CoreConverter()
+    mindmap = build_mindmap()
+    with publish(mindmap) as shared_map, ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(render, [shared_map] * len(FORMATS), FORMATS))
+        for format_type, (class_name, output) in zip(FORMATS, results):
+            assert class_name == SharedMindMapView.__name__
+            assert output == converter.dumps(mindmap, format_type)
+
+        # The block outlives the workers until the publisher unlinks it
+        with attach(shared_map.name) as view:
+            assert view.topic_node.title == "Root"
@@ -0,0 +1,89 @@
+"""Test content-based format detection"""
+
+import io
+import os
+import shutil
+import pytest
+from xmind_converter.core import CoreConverter
+from xmind_converter.exceptions import FileFormatError
+from xmind_converter.sniff import XMIND_LEGACY, XMIND_ZEN, sniff, sniff_bytes, sniff_xmind_variant
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("example_v8.xmind", "xmind"),
+        ("example_v6.xmind", "xmind"),
+        ("sports_v8.json", "json"),
+        ("sports_v8.html", "html"),
+        ("sports_v8.md", "md"),
+        ("sports_v8.csv", "csv"),
+    ],
+)
+def test_sniff_sample_files(name, expected):
+    """Test every sample file is recognised from its content"""
+    assert sniff(os.path.join(DATA_DIR, name)) == expected
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        (b"\xef\xbb\xbf  [1, 2]", "json"),
+        (b"<html><body><h1>Root</h1>", "html"),
+        (b"<body>\n<h1>Root</h1>", "html"),
+        (b"<?xml version='1.0'?><xmap-content/>", None),
+        (b"\n\n## Child only\n", "md"),
+        (b"Intro text\n\n# Root\n", "md"),
+        (b"a;b;c\nd;e;f\ng;h;i\n", "csv"),
+        (b"Parent,Child\nRoot,A", "csv"),
+        (b"just some words", None),
+        (b"", None),
+        ("# Résumé".encode("utf-8")[:-1], "md"),
+    ],
+)
+def test_sniff_bytes(head, expected):
+    """Test detection of short heads, including truncated characters"""
+    assert sniff_bytes(head) == expected
+
+
+def test_sniff_stream_keeps_position():
+    """Test streams are rewound to where sniffing started"""
+    stream = io.BytesIO(b"xx{}")
+    stream.seek(2)
+    assert sniff(stream) == "json"
+    assert stream.tell() == 2
+
+
+def test_sniff_xmind_variant():
+    """Test Zen and legacy archives are told apart"""
+    assert sniff_xmind_variant(os.path.join(DATA_DIR, "example_v8.xmind")) == XMIND_ZEN
+    assert sniff_xmind_variant(os.path.join(DATA_DIR, "example_v7.5.xmind")) == XMIND_LEGACY
+    with open(os.path.join(DATA_DIR, "example_v6.xmind"), "rb") as f:
+        assert sniff_xmind_variant(f) == XMIND_LEGACY
+        assert f.tell() == 0
+    assert sniff_xmind_variant(os.path.join(DATA_DIR, "sports_v8.md")) is None
+
+
+def test_load_from_without_usable_extension(tmp_path):
+    """Test files with missing or unknown extensions are loaded by content"""
+    converter = CoreConverter()
+    upload = tmp_path / "upload"
+    shutil.copy(os.path.join(DATA_DIR, "example_v8.xmind"), upload)
+    assert converter.load_from(str(upload)).topic_node.title == "Sports"
+
+    renamed = tmp_path / "map.bin"
+    shutil.copy(os.path.join(DATA_DIR, "sports_v8.json"), renamed)
+    converter.convert(str(renamed), str(tmp_path / "out.md"))
+    assert (tmp_path / "out.md").read_text(encoding="utf-8").startswith("# Sports")
+
+
+def test_detect_format_unrecognised(tmp_path):
+    """Test unrecognised content still raises FileFormatError"""
+    converter = CoreConverter()
+    path = tmp_path / "notes.xyz"
+    path.write_text("plain words", encoding="utf-8")
+    assert converter.detect_format(str(path)) is None
+    with pytest.raises(FileFormatError):
+        converter.load_from(str(path))
@@ -0,0 +1,144 @@
+"""Test the SQLite converter and parser"""
+
+import os
+import sqlite3
+import pytest
+from xmind_converter.converters.sqlite_converter import SQLiteConverter
+from xmind_converter.core import CoreConverter
+from xmind_converter.exceptions import ParserError
+from xmind_converter.models import DetachedNode, MindMap, Node, Relation, TopicNode
+from xmind_converter.parsers.sqlite_parser import SQLiteParser
+from xmind_converter.sniff import sniff
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def build_mindmap():
+    """Build a map with notes, labels, a detached tree and a relation"""
+    root = TopicNode("Root", node_id="root", notes="Top ünicode 😀", labels=["a", "b"])
+    first = Node("First", node_id="first", notes="", labels=["urgent"])
+    first.children = [Node("Leaf", node_id="leaf", labels=["urgent", "c"]), Node("Leaf 2", node_id="leaf2")]
+    root.children = [first, Node("Second", node_id="second")]
+    loose = DetachedNode("Loose", node_id="loose", notes="Detached")
+    loose.children = [Node("Loose child", node_id="loose.0")]
+    relations = [Relation("leaf", "loose", relation_id="r1", title="Link")]
+    return MindMap("Map", root, detached_nodes=[loose], relations=relations)
+
+
+def test_round_trip(tmp_path):
+    """Test every field, both tree kinds and relations survive a database round trip"""
+    mindmap = build_mindmap()
+    path = str(tmp_path / "map.sqlite")
+    SQLiteConverter().convert_to(mindmap, path)
+    restored = SQLiteParser().parse(path)
+
+    assert restored.title == "Map"
+    assert restored.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+    assert type(restored.topic_node) is TopicNode and type(restored.detached_nodes[0]) is DetachedNode
+    first = restored.topic_node.children[0]
+    assert (first.notes, first.labels) == ("", ("urgent",))
+    assert restored.topic_node.children[1].notes is None
+    assert [(r.id, r.source_id, r.target_id, r.title) for r in restored.relations] == [("r1", "leaf", "loose", "Link")]
+
+    # An existing file is replaced
+    SQLiteConverter().convert_to(MindMap("Other", TopicNode("Only")), path)
+    assert SQLiteParser().parse(path).title == "Other"
+
+
+def test_sql_queries(tmp_path):
+    """Test the nested-set intervals, labels and relations answer queries in plain SQL"""
+    path = str(tmp_path / "map.sqlite")
+    SQLiteConverter().convert_to(build_mindmap(), path)
+    connection = sqlite3.connect(path)
+    try:
+        sizes = dict(connection.execute("SELECT id, last_seq - seq + 1 FROM nodes"))
+        assert sizes == {"root": 5, "first": 3, "leaf": 1, "leaf2": 1, "second": 1, "loose": 2, "loose.0": 1}
+        urgent = connection.execute(
+            "SELECT d.id FROM nodes n JOIN nodes d ON d.seq BETWEEN n.seq AND n.last_seq "
+            "JOIN labels l ON l.node = d.seq WHERE n.id = 'root' AND l.label = 'urgent' ORDER BY d.seq"
+        ).fetchall()
+        assert urgent == [("first",), ("leaf",)]
+        ancestors = connection.execute(
+            "SELECT a.id FROM nodes n JOIN nodes a ON n.seq BETWEEN a.seq + 1 AND a.last_seq "
+            "WHERE n.id = 'leaf' ORDER BY a.seq"
+        ).fetchall()
+        assert ancestors == [("root",), ("first",)]
+        linked = connection.execute(
+            "SELECT s.title, t.title FROM relations r JOIN nodes s ON s.id = r.source_id "
+            "JOIN nodes t ON t.id = r.target_id"
+        ).fetchall()
+        assert linked == [("Leaf", "Loose")]
+        indexes = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"nodes_parent", "nodes_title", "labels_label"} <= indexes
+    finally:
+        connection.close()
+
+
+def test_deep_map_and_core_integration(tmp_path):
+    """Test deep maps, in-memory round trips through CoreConverter and sniffing"""
+    root = TopicNode("Root", node_id="root")
+    node = root
+    for level in range(5000):
+        child = Node(f"Level {level}", node_id=f"deep-{level}")
+        node.children.append(child)
+        node = child
+    mindmap = MindMap("Deep", root)
+
+    converter = CoreConverter()
+    data = converter.dumps(mindmap, "sqlite")
+    assert data.startswith(b"SQLite format 3\x00")
+    restored = converter.loads(data, "sqlite")
+    assert restored.content_hash(include_ids=True) == mindmap.content_hash(include_ids=True)
+    assert restored.detached_nodes == []
+
+    # Files without a known extension are recognised from the header
+    path = str(tmp_path / "upload.bin")
+    with open(path, "wb") as f:
+        f.write(data)
+    assert sniff(path) == "sqlite"
+    assert converter.load_from(path).title == "Deep"
+
+    output_path = str(tmp_path / "sports.sqlite")
+    converter.convert(os.path.join(DATA_DIR, "sports_v8.json"), output_path)
+    assert converter.load_from(output_path).topic_node.title == "Sports"
+
+
+def test_edited_database(tmp_path):
+    """Test rows removed with SQL are reflected when loading"""
+    path = str(tmp_path / "map.sqlite")
+    SQLiteConverter().convert_to(build_mindmap(), path)
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(
+            "DELETE FROM nodes WHERE seq BETWEEN (SELECT seq FROM nodes WHERE id = 'first') "
+            "AND (SELECT last_seq FROM nodes WHERE id = 'first')"
+        )
+    connection.close()
+    restored = SQLiteParser().parse(path)
+    assert [child.id for child in restored.topic_node.children] == ["second"]
+    assert restored.detached_nodes[0].children[0].id == "loose.0"
+
+
+def test_invalid_databases(tmp_path):
+    """Test databases of other applications and versions are rejected"""
+    parser = SQLiteParser()
+    path = str(tmp_path / "other.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE things (name TEXT)")
+    connection.close()
+    with pytest.raises(ParserError):
+        parser.parse(path)
+
+    SQLiteConverter().convert_to(build_mindmap(), path)
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute("UPDATE meta SET value = '99' WHERE key = 'schema_version'")
+    connection.close()
+    with pytest.raises(ParserError):
+        parser.parse(path)
+
+    text_path = str(tmp_path / "notes.sqlite")
+    with open(text_path, "w") as f:
+        f.write("not a database")
+    with pytest.raises(ParserError):
+        parser.parse(text_path)
@@ -0,0 +1,112 @@
+"""Test single-pass mind map statistics"""
+
+import json
+import os
+from click.testing import CliRunner
+from xmind_converter.cli import cli
+from xmind_converter.models import MindMap, Node, TopicNode, DetachedNode, Relation
+from xmind_converter.parsers.xmind_parser import XMindParser
+
+
+def build_mindmap():
+    """Build a small map with labels, notes, detached trees and relations"""
+    root = TopicNode("Root", node_id="root", labels=["P1"])
+    a = Node("A", node_id="a", notes="note", labels=["P1", "todo"])
+    b = Node("B", node_id="b")
+    a.add_child(Node("A1", node_id="a1"))
+    a.add_child(Node("A2", node_id="a2", labels=["todo"]))
+    root.add_child(a)
+    root.add_child(b)
+    detached = DetachedNode("Loose", node_id="loose")
+    detached.add_child(Node("Loose child", node_id="loose-child"))
+    relations = [
+        Relation("a1", "loose", relation_id="r1"),
+        Relation("a2", "missing", relation_id="r2"),
+    ]
+    return MindMap(title="Stats", topic_node=root, detached_nodes=[detached], relations=relations)
+
+
+def test_stats_counts():
+    """Test node, depth and fan-out statistics"""
+    stats = build_mindmap().stats()
+
+    assert stats.node_count == 7
+    assert stats.topic_node_count == 5
+    assert stats.depth == 3
+    assert stats.depth_histogram == {1: 1, 2: 2, 3: 2}
+    assert stats.leaf_count == 3
+    assert stats.max_fanout == 2
+    assert stats.mean_fanout == 2.0
+    assert stats.detached_tree_sizes == [2]
+
+
+def test_stats_text_labels_and_relations():
+    """Test text size, label and relation statistics"""
+    stats = build_mindmap().stats()
+
+    assert stats.title_bytes == len("RootABA1A2LooseLoose child")
+    assert stats.notes_bytes == 4
+    assert stats.label_counts == {"P1": 2, "todo": 2}
+    assert stats.relation_count == 2
+    assert stats.dangling_relation_count == 1
+
+
+def test_stats_matches_depth_of_parsed_file():
+    """Test statistics on a parsed XMind file"""
+    xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+    mindmap = XMindParser().parse(xmind_file)
+    stats = mindmap.stats()
+
+    assert stats.depth == mindmap.get_depth()
+    assert stats.node_count == 7
+    assert stats.dangling_relation_count == 0
+
+
+def test_stats_deep_map():
+    """Test statistics do not recurse on very deep maps"""
+    root = TopicNode("0")
+    node = root
+    for i in range(5000):
+        child = Node(str(i + 1))
+        node.add_child(child)
+        node = child
+    stats = MindMap(topic_node=root).stats()
+    assert stats.depth == 5001
+    assert stats.max_fanout == 1
+
+
+def test_stats_empty_map():
+    """Test statistics of an empty map"""
+    stats = MindMap().stats()
+    assert stats.node_count == 0
+    assert stats.depth == 0
+    assert stats.mean_fanout == 0.0
+
+
+def test_cli_stats():
+    """Test stats command output"""
+    xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["stats", xmind_file])
+    assert result.exit_code == 0
+    assert "Nodes: 7" in result.output
+
+    result = runner.invoke(cli, ["stats", xmind_file, "--json"])
+    assert result.exit_code == 0
+    data = json.loads(result.output)
+    assert data["node_count"] == 7
+    assert data["depth_histogram"] == {"1": 1, "2": 3, "3": 3}
+
+
+def test_cli_stats_unexpected_error(monkeypatch):
+    """Test unexpected failures are reported like in convert"""
+    xmind_file = os.path.join(os.path.dirname(__file__), "..", "data", "example_v8.xmind")
+
+    def fail(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(MindMap, "stats", fail)
+    result = CliRunner().invoke(cli, ["stats", xmind_file])
+    assert result.exception is None
+    assert "Unknown error: boom" in result.output
@@ -0,0 +1,116 @@
+"""Test watch mode"""
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from click.testing import CliRunner
+from xmind_converter.cli import cli
+from xmind_converter.watch import STATE_FILE, Watcher
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.fixture
+def dirs():
+    """Create source and destination directories with two XMind files"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "src")
+        dst = os.path.join(tmpdir, "dst")
+        os.makedirs(os.path.join(src, "nested"))
+        shutil.copy(os.path.join(DATA_DIR, "example_v8.xmind"), os.path.join(src, "a.xmind"))
+        shutil.copy(os.path.join(DATA_DIR, "example_v6.xmind"), os.path.join(src, "nested", "b.xmind"))
+        with open(os.path.join(src, "ignored.txt"), "w") as f:
+            f.write("not a mind map")
+        yield src, dst
+
+
+def make_watcher(src, dst, **kwargs):
+    return Watcher(src, dst, ["md", "html"], executor=ThreadPoolExecutor(1), **kwargs)
+
+
+def touch(path, offset):
+    """Move a file's mtime without changing its content"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset))
+
+
+def test_run_once_converts_every_file(dirs):
+    """Test initial run mirrors the source tree into every format"""
+    src, dst = dirs
+    with make_watcher(src, dst) as watcher:
+        results = watcher.run_once()
+
+    assert sorted(result.path for result in results) == ["a.xmind", os.path.join("nested", "b.xmind")]
+    assert all(result.error is None for result in results)
+    for name in ["a.md", "a.html", os.path.join("nested", "b.md"), os.path.join("nested", "b.html")]:
+        assert os.path.exists(os.path.join(dst, name))
+    assert os.path.exists(os.path.join(dst, STATE_FILE))
+
+
+def test_state_survives_restart(dirs):
+    """Test a restarted watcher converts only changed files"""
+    src, dst = dirs
+    with make_watcher(src, dst) as watcher:
+        watcher.run_once()
+
+    with make_watcher(src, dst) as watcher:
+        assert watcher.run_once() == []
+
+    # Same content with a new mtime is hashed but not converted
+    touch(os.path.join(src, "a.xmind"), 10**9)
+    with make_watcher(src, dst) as watcher:
+        assert watcher.run_once() == []
+
+    shutil.copy(os.path.join(DATA_DIR, "example_v7.5.xmind"), os.path.join(src, "a.xmind"))
+    touch(os.path.join(src, "a.xmind"), 2 * 10**9)
+    with make_watcher(src, dst) as watcher:
+        assert [result.path for result in watcher.run_once()] == ["a.xmind"]
+
+
+def test_debounce_waits_for_stable_file(dirs):
+    """Test a file is converted only after it stopped changing"""
+    src, dst = dirs
+    with make_watcher(src, dst, debounce=0.2) as watcher:
+        assert watcher.poll() == []
+        time.sleep(0.25)
+        watcher.poll()
+        watcher.close()
+        assert os.path.exists(os.path.join(dst, "a.md"))
+
+        # A save during the debounce window restarts the delay
+        shutil.copy(os.path.join(DATA_DIR, "example_v7.5.xmind"), os.path.join(src, "a.xmind"))
+        touch(os.path.join(src, "a.xmind"), 10**9)
+        assert watcher.poll() == []
+        touch(os.path.join(src, "a.xmind"), 10**9)
+        time.sleep(0.15)
+        assert watcher.poll() == []
+        assert watcher._files["a.xmind"]["size"] != os.path.getsize(os.path.join(src, "a.xmind"))
+        time.sleep(0.25)
+        watcher.poll()
+        watcher.close()
+        assert watcher._files["a.xmind"]["size"] == os.path.getsize(os.path.join(src, "a.xmind"))
+
+
+def test_broken_file_is_not_retried_until_changed(dirs):
+    """Test conversion errors are reported once"""
+    src, dst = dirs
+    with open(os.path.join(src, "broken.xmind"), "wb") as f:
+        f.write(b"not a zip file")
+    with make_watcher(src, dst) as watcher:
+        results = watcher.run_once()
+        errors = [result for result in results if result.error]
+        assert [result.path for result in errors] == ["broken.xmind"]
+        assert watcher.run_once() == []
+
+
+def test_cli_watch_once(dirs):
+    """Test watch --once command"""
+    src, dst = dirs
+    runner = CliRunner()
+    result = runner.invoke(cli, ["watch", src, dst, "--to", "md,json", "--once", "--workers", "1"])
+    assert result.exit_code == 0
+    assert "Converted a.xmind" in result.output
+    assert os.path.exists(os.path.join(dst, "a.json"))
@@ -4,7 +4,8 @@ __version__ = "1.1.0"
 __author__ = "DoCrazyG"
 
 from .core import CoreConverter
+from .async_core import AsyncCoreConverter
 from .models import MindMap, Node, TopicNode, DetachedNode, Relation
 from .cli import cli
 
-__all__ = ["CoreConverter", "MindMap", "Node", "TopicNode", "DetachedNode", "Relation", "cli"]
+__all__ = ["CoreConverter", "AsyncCoreConverter", "MindMap", "Node", "TopicNode", "DetachedNode", "Relation", "cli"]
@@ -0,0 +1,161 @@
+"""Asyncio front-end for CoreConverter"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Union
+from .core import CoreConverter
+from .models import MindMap
+
+_local = threading.local()
+
+
+def _worker_converter() -> CoreConverter:
+    """Get the CoreConverter owned by the current worker thread or process
+
+    Parsers such as HTMLParser keep state while parsing, so every worker gets
+    its own instance instead of sharing one across threads.
+    """
+    converter = getattr(_local, "converter", None)
+    if converter is None:
+        converter = CoreConverter()
+        _local.converter = converter
+    return converter
+
+
+def _load_from(input_path: str, format_type: Optional[str], kwargs: Dict[str, Any]) -> MindMap:
+    return _worker_converter().load_from(input_path, format_type, **kwargs)
+
+
+def _convert_to(mindmap: MindMap, format_type: str, output_path: str, kwargs: Dict[str, Any]) -> str:
+    return _worker_converter().convert_to(mindmap, format_type, output_path, **kwargs)
+
+
+def _loads(data: Union[bytes, str], format_type: str, kwargs: Dict[str, Any]) -> MindMap:
+    return _worker_converter().loads(data, format_type, **kwargs)
+
+
+def _dumps(mindmap: MindMap, format_type: str, kwargs: Dict[str, Any]) -> bytes:
+    return _worker_converter().dumps(mindmap, format_type, **kwargs)
+
+
+def _convert(
+    input_path: str,
+    output_path: str,
+    input_format: Optional[str],
+    output_format: Optional[str],
+    kwargs: Dict[str, Any],
+) -> str:
+    return _worker_converter().convert(input_path, output_path, input_format, output_format, **kwargs)
+
+
+class AsyncCoreConverter:
+    """XMind converter for asyncio applications
+
+    Parsing, serialization and file I/O run in an executor so the event loop is
+    never blocked. The number of conversions in flight is bounded by
+    ``max_concurrency``; further callers wait until a slot is free.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_concurrency: int = 8) -> None:
+        """Create async converter
+
+        Args:
+            executor: Executor used for blocking work (default: the event loop's default executor).
+                A ProcessPoolExecutor moves CPU-bound parsing off the interpreter running the loop.
+            max_concurrency: Maximum number of conversions running at the same time
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.executor: Optional[Executor] = executor
+        self.max_concurrency: int = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def load_from(self, input_path: str, format_type: Optional[str] = None, **kwargs) -> MindMap:
+        """Load from specified format and convert to MindMap
+
+        Args:
+            input_path: Path to input file
+            format_type: Format type (auto-detected from file extension if not provided)
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            MindMap object
+        """
+        return await self._run(_load_from, input_path, format_type, kwargs)
+
+    async def convert_to(self, mindmap: MindMap, format_type: str, output_path: str, **kwargs) -> str:
+        """Convert to specified format
+
+        Args:
+            mindmap: MindMap object to convert
+            format_type: Target format type
+            output_path: Path to save the output file
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            Success message
+        """
+        return await self._run(_convert_to, mindmap, format_type, output_path, kwargs)
+
+    async def loads(self, data: Union[bytes, str], format_type: str, **kwargs) -> MindMap:
+        """Load from in-memory data in the specified format
+
+        Args:
+            data: Serialized mind map; str is encoded as UTF-8
+            format_type: Format type of the data
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            MindMap object
+        """
+        return await self._run(_loads, data, format_type, kwargs)
+
+    async def dumps(self, mindmap: MindMap, format_type: str, **kwargs) -> bytes:
+        """Convert to specified format in memory
+
+        Args:
+            mindmap: MindMap object to convert
+            format_type: Target format type
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            Serialized mind map, text formats are UTF-8
+        """
+        return await self._run(_dumps, mindmap, format_type, kwargs)
+
+    async def convert(
+        self,
+        input_path: str,
+        output_path: str,
+        input_format: Optional[str] = None,
+        output_format: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        """Convert from one format to another
+
+        The whole load and convert runs as a single executor job, so the
+        intermediate MindMap never has to cross a process boundary.
+
+        Args:
+            input_path: Path to input file
+            output_path: Path to save the output file
+            input_format: Input format type (auto-detected from file extension if not provided)
+            output_format: Output format type (auto-detected from file extension if not provided)
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            Success message
+        """
+        return await self._run(_convert, input_path, output_path, input_format, output_format, kwargs)
@@ -2,8 +2,13 @@
 
 import click
 import os
+import sys
 from .core import CoreConverter
 from .exceptions import XMindConverterError
+from .instrumentation import CollectorSink, Instrumentation
+
+#: Path argument standing for stdin or stdout
+STDIO = "-"
 
 
 @click.group()
@@ -15,18 +20,268 @@ def cli():
 @cli.command("convert")
 @click.argument("input_file")
 @click.argument("output_file")
-@click.option("--input-format", "-i", help="Input format, supported: xmind, csv, md, html, json")
-@click.option("--output-format", "-o", help="Output format, supported: xmind, csv, md, html, json")
-def convert(input_file, output_file, input_format, output_format):
-    """Convert between different formats"""
+@click.option("--input-format", "-i", help="Input format, supported: xmind, csv, md, html, json, sqlite")
+@click.option("--output-format", "-o", help="Output format, supported: xmind, csv, md, html, json, sqlite")
+@click.option("--timings", is_flag=True, help="Print a per-stage timing breakdown")
+@click.option(
+    "--select",
+    "selectors",
+    multiple=True,
+    help="Export only matching branches: id:ID, re:REGEX, label:LABEL or a title path glob like 'Root/A*/**'",
+)
+@click.option("--max-depth", type=click.IntRange(min=1), help="Keep at most this many levels of each branch")
+@click.option("--exclude-label", "exclude_labels", multiple=True, help="Drop nodes with this label and their subtrees")
+def convert(input_file, output_file, input_format, output_format, timings, selectors, max_depth, exclude_labels):
+    """Convert between different formats
+
+    Use - as INPUT_FILE or OUTPUT_FILE to read from stdin or write to stdout;
+    the matching --input-format or --output-format is then required.
+    """
+    query = None
+    if selectors or max_depth or exclude_labels:
+        from .query import Query
+
+        try:
+            query = Query(selectors, max_depth, exclude_labels)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--select")
+
+    if input_file == STDIO or output_file == STDIO:
+        _convert_stdio(input_file, output_file, input_format, output_format, timings, query)
+        return
+
     try:
-        converter = CoreConverter()
-        result = converter.convert(input_file, output_file, input_format, output_format)
+        collector = CollectorSink()
+        converter = CoreConverter(Instrumentation(collector) if timings else None)
+        result = converter.convert(input_file, output_file, input_format, output_format, query=query)
         click.echo(f"Conversion successful: {result}")
+        if timings:
+            _echo_timings(collector)
+    except XMindConverterError as e:
+        click.echo(f"Error: {str(e)}")
+    except Exception as e:
+        click.echo(f"Unknown error: {str(e)}")
+
+
+def _convert_stdio(input_file, output_file, input_format, output_format, timings, query=None) -> None:
+    """Convert with stdin and/or stdout in place of files
+
+    Stdout may carry the converted data, so messages go to stderr and failures
+    exit with status 1 for the benefit of shell pipelines.
+    """
+    if input_file == STDIO and not input_format:
+        raise click.UsageError("--input-format is required when reading from stdin")
+    if output_file == STDIO and not output_format:
+        raise click.UsageError("--output-format is required when writing to stdout")
+
+    try:
+        collector = CollectorSink()
+        converter = CoreConverter(Instrumentation(collector) if timings else None)
+        source = sys.stdin.buffer if input_file == STDIO else input_file
+        if query is not None:
+            mindmap = converter._load_queried(source, input_format, query)
+        elif input_file == STDIO:
+            mindmap = converter.load_stream(source, input_format)
+        else:
+            mindmap = converter.load_from(source, input_format)
+        if output_file == STDIO:
+            converter.convert_stream(mindmap, output_format, sys.stdout.buffer)
+        else:
+            click.echo(f"Conversion successful: {converter.convert_to(mindmap, output_format, output_file)}", err=True)
+        if timings:
+            _echo_timings(collector, err=True)
+    except XMindConverterError as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Unknown error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+def _echo_timings(collector: CollectorSink, err: bool = False) -> None:
+    """Print collected spans as a table"""
+
+    def fmt(value):
+        return "-" if value is None else str(value)
+
+    click.echo(f"{'stage':<18}{'ms':>10}{'bytes in':>12}{'bytes out':>12}{'nodes':>10}", err=err)
+    for span in collector.spans:
+        click.echo(
+            f"{span.name:<18}{span.duration * 1000:>10.2f}{fmt(span.bytes_in):>12}"
+            f"{fmt(span.bytes_out):>12}{fmt(span.nodes):>10}",
+            err=err,
+        )
+    click.echo(f"{'total':<18}{collector.total() * 1000:>10.2f}", err=err)
+
+
+@cli.command("stats")
+@click.argument("input_file")
+@click.option("--input-format", "-i", help="Input format, supported: xmind, csv, md, html, json, sqlite")
+@click.option("--json", "as_json", is_flag=True, help="Print statistics as JSON")
+def stats(input_file, input_format, as_json):
+    """Show size and shape statistics of a mind map"""
+    try:
+        converter = CoreConverter()
+        result = converter.load_from(input_file, input_format).stats()
+    except XMindConverterError as e:
+        click.echo(f"Error: {str(e)}")
+        return
+    except Exception as e:
+        click.echo(f"Unknown error: {str(e)}")
+        return
+
+    if as_json:
+        import json
+
+        click.echo(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+        return
+
+    click.echo(f"Nodes: {result.node_count} (topic tree: {result.topic_node_count})")
+    click.echo(f"Depth: {result.depth}")
+    click.echo("Depth histogram: " + ", ".join(f"{d}: {c}" for d, c in sorted(result.depth_histogram.items())))
+    click.echo(f"Leaves: {result.leaf_count}")
+    click.echo(f"Fan-out: max {result.max_fanout}, mean {result.mean_fanout:.2f}")
+    click.echo(f"Title bytes: {result.title_bytes}")
+    click.echo(f"Notes bytes: {result.notes_bytes}")
+    labels = sorted(result.label_counts.items(), key=lambda item: (-item[1], item[0]))
+    click.echo("Labels: " + (", ".join(f"{label} ({count})" for label, count in labels) or "none"))
+    click.echo(f"Detached trees: {result.detached_tree_sizes or 'none'}")
+    click.echo(f"Relations: {result.relation_count} (dangling: {result.dangling_relation_count})")
+
+
+@cli.command("diff")
+@click.argument("old_file")
+@click.argument("new_file")
+@click.option("--input-format", "-i", help="Input format of both files, supported: xmind, csv, md, html, json, sqlite")
+@click.option("--json", "as_json", is_flag=True, help="Print changes as JSON")
+def diff(old_file, new_file, input_format, as_json):
+    """Show structural changes between two mind maps"""
+    from .diff import diff as diff_mindmaps
+
+    try:
+        converter = CoreConverter()
+        changes = diff_mindmaps(
+            converter.load_from(old_file, input_format), converter.load_from(new_file, input_format)
+        )
     except XMindConverterError as e:
         click.echo(f"Error: {str(e)}")
+        return
     except Exception as e:
         click.echo(f"Unknown error: {str(e)}")
+        return
+
+    if as_json:
+        import json
+
+        click.echo(json.dumps(changes.to_dict(), ensure_ascii=False, indent=2))
+        return
+
+    if not changes:
+        click.echo("No changes")
+        return
+    for change in changes:
+        click.echo(str(change))
+
+
+@cli.command("merge")
+@click.argument("input_files", nargs=-1, required=True)
+@click.option("--output", "output_file", required=True, help="Merged output file")
+@click.option("--input-format", "-i", help="Input format of every file, supported: xmind, csv, md, html, json, sqlite")
+@click.option("--output-format", "-o", help="Output format, supported: xmind, csv, md, html, json, sqlite")
+@click.option(
+    "--strategy",
+    type=click.Choice(["graft", "unify"]),
+    default="graft",
+    show_default=True,
+    help="graft: each map under a new root; unify: overlay maps by title paths",
+)
+@click.option("--title", help="Title of the merged map and its new root topic (default: Merged)")
+@click.option("--no-dedupe", is_flag=True, help="Keep identical subtrees and relations")
+def merge(input_files, output_file, input_format, output_format, strategy, title, no_dedupe):
+    """Merge mind maps into one"""
+    from .merge import merge as merge_mindmaps
+
+    try:
+        converter = CoreConverter()
+        if not output_format:
+            output_format = converter._detect_output_format(output_file)
+        # Maps are loaded one at a time and released once merged
+        mindmaps = (converter.load_from(input_file, input_format) for input_file in input_files)
+        merged = merge_mindmaps(mindmaps, strategy, title=title, dedupe=not no_dedupe)
+        result = converter.convert_to(merged, output_format, output_file)
+        click.echo(f"Merged {len(input_files)} maps: {result}")
+    except XMindConverterError as e:
+        click.echo(f"Error: {str(e)}")
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"Unknown error: {str(e)}")
+        sys.exit(1)
+
+
+@cli.command("watch")
+@click.argument("src_dir")
+@click.argument("dst_dir")
+@click.option("--to", "formats", default="md", show_default=True, help="Comma-separated output formats, e.g. md,html")
+@click.option("--interval", default=1.0, show_default=True, help="Seconds between directory scans")
+@click.option("--debounce", default=0.5, show_default=True, help="Seconds a file must stay unchanged before converting")
+@click.option("--workers", "-w", type=int, help="Number of worker processes (default: CPU count)")
+@click.option("--once", is_flag=True, help="Convert changed files once and exit")
+def watch(src_dir, dst_dir, formats, interval, debounce, workers, once):
+    """Re-convert mind maps in SRC_DIR into DST_DIR whenever they change"""
+    from .watch import Watcher
+
+    def report(result):
+        if result.error:
+            click.echo(f"Error: {result.path}: {result.error}")
+        else:
+            click.echo(f"Converted {result.path} -> {', '.join(result.outputs)}")
+
+    if not os.path.isdir(src_dir):
+        click.echo(f"Error: Directory not found: {src_dir}")
+        return
+
+    watcher = Watcher(
+        src_dir, dst_dir, [f.strip() for f in formats.split(",") if f.strip()], debounce=debounce, workers=workers
+    )
+    try:
+        if once:
+            for result in watcher.run_once():
+                report(result)
+        else:
+            click.echo(f"Watching {src_dir}")
+            watcher.run(interval, report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+@cli.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host to listen on")
+@click.option("--port", default=8765, show_default=True, help="Port to listen on")
+@click.option("--socket", "socket_path", help="Listen on a Unix socket instead of HTTP host/port")
+@click.option("--workers", "-w", type=int, help="Number of warm worker processes (default: CPU count)")
+@click.option("--root", help="Only read and write files under this directory; relative job paths start here")
+def serve(host, port, socket_path, workers, root):
+    """Run a conversion daemon with a warm worker pool
+
+    Without --root, clients can read and write any file this user can access.
+    """
+    from .server import ConversionServer
+
+    server = ConversionServer(host=host, port=port, socket_path=socket_path, workers=workers, root=root)
+    try:
+        server.start()
+        address = server.address
+        where = address if isinstance(address, str) else f"http://{address[0]}:{address[1]}"
+        click.echo(f"Serving on {where} with {server.workers} workers")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        click.echo(f"Error: {str(e)}")
+    finally:
+        server.shutdown()
 
 
 @cli.command("info")
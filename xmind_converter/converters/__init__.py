@@ -5,5 +5,6 @@ from .csv_converter import CSVConverter
 from .md_converter import MarkdownConverter
 from .html_converter import HTMLConverter
 from .json_converter import JSONConverter
+from .sqlite_converter import SQLiteConverter
 
-__all__ = ["BaseConverter", "CSVConverter", "MarkdownConverter", "HTMLConverter", "JSONConverter"]
\ No newline at end of file
+__all__ = ["BaseConverter", "CSVConverter", "MarkdownConverter", "HTMLConverter", "JSONConverter", "SQLiteConverter"]
@@ -1,12 +1,17 @@
 """Base converter abstract class"""
 
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 from ..models import MindMap
+from ..instrumentation import Instrumentation, NULL_INSTRUMENTATION
 
 
 class BaseConverter(ABC):
     """Base converter abstract class"""
 
+    #: Receives stage spans; replaced by CoreConverter when timing is enabled
+    instrumentation: Instrumentation = NULL_INSTRUMENTATION
+
     @abstractmethod
     def convert_to(self, mindmap: MindMap, output_path: str, **kwargs) -> None:
         """Convert MindMap to file
@@ -17,3 +22,15 @@ class BaseConverter(ABC):
             **kwargs: Additional format-specific parameters
         """
         pass
+
+    def convert_stream(self, mindmap: MindMap, stream: BinaryIO, **kwargs) -> None:
+        """Convert MindMap and write it to a binary stream
+
+        The stream is flushed but not closed.
+
+        Args:
+            mindmap: MindMap object to convert
+            stream: Writable binary stream, e.g. sys.stdout.buffer
+            **kwargs: Additional format-specific parameters
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streams")
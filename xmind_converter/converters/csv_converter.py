@@ -1,28 +1,107 @@
 """CSV conversion logic"""
 
 import csv
-from typing import Optional
-from ..models import MindMap
+import io
+from typing import BinaryIO, List, Optional, TextIO, Tuple
+from ..models import MindMap, Node
+from ..instrumentation import count_nodes
 from .base_converter import BaseConverter
+from .parallel import SubtreeRenderer, render_tree
+
+
+class CSVRenderer(SubtreeRenderer):
+    """Renders one (parent, child, relationship) triple per non-root node"""
+
+    def __init__(self, delimiter: str = ",") -> None:
+        self.delimiter = delimiter
+
+    def render_node(self, node: Node, level: int, parent_title: Optional[str]) -> str:
+        if not parent_title:
+            return ""
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=self.delimiter, lineterminator="\n").writerow(
+            [parent_title, node.title, "contains"]
+        )
+        return buffer.getvalue()
+
+    def render_subtree(self, node: Node, level: int = 1, parent_title: Optional[str] = None) -> str:
+        # One writer for the whole subtree instead of one per row
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=self.delimiter, lineterminator="\n")
+        stack: List[Tuple[Node, Optional[str]]] = [(node, parent_title)]
+        while stack:
+            current, current_parent = stack.pop()
+            if current_parent:
+                writer.writerow([current_parent, current.title, "contains"])
+            for child in reversed(current.children):
+                stack.append((child, current.title))
+        return buffer.getvalue()
 
 
 class CSVConverter(BaseConverter):
     """CSV converter"""
 
-    def convert_to(self, mindmap: MindMap, output_path: str, delimiter: str = ",") -> None:
-        """Convert XMind nodes to CSV file (triples)"""
-        with open(output_path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+    def convert_to(
+        self,
+        mindmap: MindMap,
+        output_path: str,
+        delimiter: str = ",",
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+    ) -> None:
+        """Convert XMind nodes to CSV file (triples)
+
+        Args:
+            mindmap: MindMap object to convert
+            output_path: Path to save the output file
+            delimiter: Field delimiter
+            workers: Render subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are rendered in parallel
+        """
+        with open(output_path, "wb") as f:
+            self.convert_stream(mindmap, f, delimiter, workers, split_depth)
+
+    def convert_stream(
+        self,
+        mindmap: MindMap,
+        stream: BinaryIO,
+        delimiter: str = ",",
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+    ) -> None:
+        """Convert XMind nodes to CSV triples and write them to a binary stream
+
+        Args:
+            mindmap: MindMap object to convert
+            stream: Writable binary stream, UTF-8 text is written
+            delimiter: Field delimiter
+            workers: Render subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are rendered in parallel
+        """
+        with self.instrumentation.span("csv.write") as span:
+            buffer = io.StringIO()
+            self._write(mindmap, buffer, delimiter, workers, split_depth)
+            data = buffer.getvalue().encode("utf-8")
+            stream.write(data)
+            stream.flush()
+            span.bytes_out = len(data)
+            if self.instrumentation.enabled:
+                span.nodes = count_nodes(mindmap.topic_node)
 
-            # Write header
-            writer.writerow(["parent", "child", "relationship"])
+    def _write(
+        self,
+        mindmap: MindMap,
+        f: TextIO,
+        delimiter: str,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+    ) -> None:
+        """Write header and triples of the node tree"""
+        writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
 
-            # Traverse node tree, generate triples
-            def generate_triples(current_node, parent_title: Optional[str] = None) -> None:
-                if parent_title:
-                    writer.writerow([parent_title, current_node.title, "contains"])
-                for child in current_node.children:
-                    generate_triples(child, current_node.title)
+        # Write header
+        writer.writerow(["parent", "child", "relationship"])
 
-            if mindmap.topic_node:
-                generate_triples(mindmap.topic_node)
+        # Traverse node tree, generate triples
+        if mindmap.topic_node:
+            f.write(render_tree(CSVRenderer(delimiter), mindmap.topic_node, workers, split_depth))
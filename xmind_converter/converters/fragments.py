@@ -0,0 +1,319 @@
+"""Rendered-fragment cache for incremental re-export
+
+A fragment is the serialized text of one subtree at one nesting level.
+Fragments are keyed by the subtree's content hash (see Node.content_hash),
+the level and a format namespace, so after an edit only the nodes on the
+path to the edit are rendered again; every unchanged branch is copied from
+the cache.
+
+Node hashes are cached on the nodes, so the saving is largest when the same
+map object is exported repeatedly, e.g. by a long-running sync job. A map
+loaded fresh from a file is hashed once in full before the cache can be
+consulted.
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from json.encoder import encode_basestring
+from typing import List, Optional, Set, Tuple
+from ..models import Node, subtree_digest
+from .parallel import SubtreeRenderer
+
+#: Default in-memory capacity
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+#: Fragments smaller than this are not stored; their parents are
+DEFAULT_MIN_FRAGMENT_BYTES = 512
+#: Fragments larger than this are not stored but composed from their children's fragments
+DEFAULT_MAX_FRAGMENT_BYTES = 256 * 1024
+
+_SUFFIX = ".frag"
+
+FragmentKey = Tuple[str, int, bytes]
+
+
+class FragmentCache:
+    """LRU cache of rendered subtree fragments, bounded by total bytes
+
+    Args:
+        max_bytes: Maximum total size of fragments kept in memory
+        directory: Directory where fragments are also stored, so later processes can reuse them
+            (default: memory only). The directory is not size-bounded; call clear() to empty it
+        min_fragment_bytes: Fragments smaller than this are not stored
+        max_fragment_bytes: Fragments larger than this are not stored but composed from their
+            children's fragments on every export. An edit re-renders at most this much output
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: Optional[str] = None,
+        min_fragment_bytes: int = DEFAULT_MIN_FRAGMENT_BYTES,
+        max_fragment_bytes: int = DEFAULT_MAX_FRAGMENT_BYTES,
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.max_bytes: int = max_bytes
+        self.directory: Optional[str] = directory
+        self.min_fragment_bytes: int = min_fragment_bytes
+        self.max_fragment_bytes: int = min(max_fragment_bytes, max_bytes)
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[FragmentKey, bytes]" = OrderedDict()
+        self._nbytes: int = 0
+        self._lock = threading.Lock()
+        # Names of fragment files, listed once so misses never touch the disk
+        self._disk: Optional[Set[str]] = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk = {name for name in os.listdir(directory) if name.endswith(_SUFFIX)}
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the fragments in memory"""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        """Number of fragments in memory"""
+        return len(self._entries)
+
+    def __contains__(self, key: FragmentKey) -> bool:
+        return key in self._entries or (self._disk is not None and self._file_name(key) in self._disk)
+
+    @staticmethod
+    def _file_name(key: FragmentKey) -> str:
+        namespace, level, digest = key
+        return f"{namespace}-{level}-{digest.hex()}{_SUFFIX}"
+
+    def get(self, key: FragmentKey) -> Optional[bytes]:
+        """Get a fragment, loading it from the directory if it is not in memory
+
+        Args:
+            key: (namespace, level, subtree digest)
+
+        Returns:
+            Fragment bytes or None
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+        if self._disk is not None:
+            name = self._file_name(key)
+            if name in self._disk:
+                try:
+                    with open(os.path.join(self.directory, name), "rb") as f:  # type: ignore[arg-type]
+                        data = f.read()
+                except OSError:
+                    self._disk.discard(name)
+                else:
+                    with self._lock:
+                        self.hits += 1
+                        self._store(key, data)
+                    return data
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: FragmentKey, data: bytes) -> bool:
+        """Store a fragment; fragments outside min/max_fragment_bytes are ignored
+
+        Args:
+            key: (namespace, level, subtree digest)
+            data: Rendered fragment
+
+        Returns:
+            Whether the fragment was stored
+        """
+        if not self.min_fragment_bytes <= len(data) <= self.max_fragment_bytes:
+            return False
+        with self._lock:
+            self._store(key, data)
+        if self._disk is not None:
+            name = self._file_name(key)
+            if name not in self._disk:
+                self._write_file(name, data)
+                self._disk.add(name)
+        return True
+
+    def discard(self, key: FragmentKey) -> None:
+        """Drop a fragment from memory; its file in the directory is kept"""
+        with self._lock:
+            data = self._entries.pop(key, None)
+            if data is not None:
+                self._nbytes -= len(data)
+
+    def _store(self, key: FragmentKey, data: bytes) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._nbytes -= len(previous)
+        self._entries[key] = data
+        self._nbytes += len(data)
+        while self._nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= len(evicted)
+
+    def _write_file(self, name: str, data: bytes) -> None:
+        # Write to a temporary file and rename, so readers never see partial fragments
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, os.path.join(self.directory, name))  # type: ignore[arg-type]
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def clear(self) -> None:
+        """Remove every fragment from memory and from the directory"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = self.misses = 0
+        if self._disk is not None:
+            for name in self._disk:
+                try:
+                    os.unlink(os.path.join(self.directory, name))  # type: ignore[arg-type]
+                except OSError:
+                    pass
+            self._disk.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"FragmentCache(fragments={len(self._entries)}, nbytes={self._nbytes}, max_bytes={self.max_bytes}, "
+            f"hits={self.hits}, misses={self.misses}, directory={self.directory!r})"
+        )
+
+
+class FragmentRenderer:
+    """Renders a subtree as the node's opening text, its children's fragments and closing text
+
+    The output of a subtree may depend only on its content and its level;
+    ``namespace`` must change whenever the rendering does.
+    """
+
+    #: Format name, part of every cache key
+    namespace: str = ""
+    #: Whether node ids appear in the output and so must be part of the content hash
+    include_ids: bool = False
+
+    def open(self, node: Node, level: int) -> bytes:
+        """Render the node itself, up to its first child"""
+        raise NotImplementedError
+
+    def separator(self, node: Node, level: int) -> bytes:
+        """Text between two child fragments of a node at this level"""
+        return b""
+
+    def close(self, node: Node, level: int) -> bytes:
+        """Render the node after its last child"""
+        return b""
+
+    def child_level(self, level: int) -> int:
+        """Level of the children of a node at this level"""
+        return level + 1
+
+
+class PreorderFragments(FragmentRenderer):
+    """Adapts a SubtreeRenderer whose node text does not depend on the parent title
+
+    Args:
+        renderer: Pre-order renderer
+        namespace: Format name
+    """
+
+    def __init__(self, renderer: SubtreeRenderer, namespace: str) -> None:
+        self.renderer = renderer
+        self.namespace = namespace
+
+    def open(self, node: Node, level: int) -> bytes:
+        return self.renderer.render_node(node, level, None).encode("utf-8")
+
+
+def render_cached(renderer: FragmentRenderer, root: Node, cache: FragmentCache, level: int = 1) -> List[bytes]:
+    """Render a subtree, reusing cached fragments of unchanged branches
+
+    The largest rendered subtrees within the cache's fragment size limits are
+    stored; fragments nested in a stored one are dropped from memory, so the
+    cache holds each output byte about once. Subtrees too large to store are
+    never joined into one string: their chunks are passed up as they are, so
+    the output is copied only when it is written. Runs without recursion.
+
+    Args:
+        renderer: Fragment renderer of the output format
+        root: Root of the subtree
+        cache: Fragment cache
+        level: Level of the root
+
+    Returns:
+        UTF-8 chunks of the rendering, in order
+    """
+    namespace, include_ids = renderer.namespace, renderer.include_ids
+    min_bytes, max_bytes = cache.min_fragment_bytes, cache.max_fragment_bytes
+    key = (namespace, level, subtree_digest(root, include_ids))
+    data = cache.get(key)
+    if data is not None:
+        return [data]
+
+    # Frames of the nodes being rendered: node, level, key, output chunks, their total size,
+    # index of the next child and keys of the children found in or stored to the cache
+    opening = renderer.open(root, level)
+    frames: List[list] = [[root, level, key, [opening], len(opening), 0, []]]
+    while True:
+        frame = frames[-1]
+        node, node_level, node_key, parts, size, index, cached = frame
+        children = node.children
+        if index < len(children):
+            frame[5] = index + 1
+            if index:
+                separator = renderer.separator(node, node_level)
+                if separator:
+                    parts.append(separator)
+                    size += len(separator)
+            child = children[index]
+            child_level = renderer.child_level(node_level)
+            child_key = (namespace, child_level, subtree_digest(child, include_ids))
+            data = cache.get(child_key)
+            if data is not None:
+                parts.append(data)
+                frame[4] = size + len(data)
+                cached.append(child_key)
+            else:
+                frame[4] = size
+                opening = renderer.open(child, child_level)
+                frames.append([child, child_level, child_key, [opening], len(opening), 0, []])
+            continue
+
+        closing = renderer.close(node, node_level)
+        if closing:
+            parts.append(closing)
+            size += len(closing)
+        frames.pop()
+        stored = False
+        if size > max_bytes:
+            if not frames:
+                return parts
+            frames[-1][3].extend(parts)
+        else:
+            data = b"".join(parts)
+            if size >= min_bytes:
+                stored = cache.put(node_key, data)
+            if stored:
+                # The node's fragment contains its children's, so only the largest fragments that fit are kept
+                for child_key in cached:
+                    cache.discard(child_key)
+            if not frames:
+                return [data]
+            frames[-1][3].append(data)
+        parent = frames[-1]
+        parent[4] += size
+        if stored:
+            parent[6].append(node_key)
+
+
+def json_string(value: str) -> str:
+    """Quote a string exactly like the JSON backends do"""
+    return encode_basestring(value)
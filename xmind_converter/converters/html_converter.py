@@ -1,47 +1,116 @@
 """HTML conversion logic"""
 
-from typing import Optional
-from ..models import MindMap
+import io
+from typing import BinaryIO, Optional, TextIO
+from ..models import MindMap, Node
+from ..instrumentation import count_nodes
 from .base_converter import BaseConverter
+from .fragments import FragmentCache, PreorderFragments, render_cached
+from .parallel import SubtreeRenderer, render_tree
+
+
+class HTMLRenderer(SubtreeRenderer):
+    """Renders one heading tag per node"""
+
+    def render_node(self, node: Node, level: int, parent_title: Optional[str]) -> str:
+        return f"    <h{level}>{node.title}</h{level}>\n"
 
 
 class HTMLConverter(BaseConverter):
     """HTML converter - outputs h1-hn tag hierarchy format"""
 
-    def convert_to(self, mindmap: MindMap, output_path: str) -> None:
-        """Convert XMind nodes to HTML file with h1-hn tag hierarchy"""
-        with open(output_path, "w", encoding="utf-8") as f:
-            # Write HTML header
-            f.write("<!DOCTYPE html>\n")
-            f.write('<html lang="en">\n')
-            f.write("<head>\n")
-            f.write('    <meta charset="UTF-8">\n')
-            f.write('    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n')
-            f.write(f"    <title>{mindmap.title}</title>\n")
-            f.write("    <style>\n")
-            f.write("        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }\n")
-            f.write("        h1 { font-size: 2em; font-weight: bold; }\n")
-            f.write("        h2 { font-size: 1.5em; font-weight: bold; }\n")
-            f.write("        h3 { font-size: 1.2em; font-weight: bold; }\n")
-            f.write("        h4 { font-size: 1.1em; font-weight: bold; }\n")
-            f.write("        h5 { font-size: 1em; font-weight: bold; }\n")
-            f.write("        h6 { font-size: 0.9em; font-weight: bold; }\n")
-            f.write("    </style>\n")
-            f.write("</head>\n")
-            f.write("<body>\n")
-
-            # Write node tree with h1-hn tags
-            def write_node(current_node, level: int = 1) -> None:
-                h_tag = f"h{level}"
-                f.write(f"    <{h_tag}>{current_node.title}</{h_tag}>\n")
-
-                if current_node.children:
-                    for child in current_node.children:
-                        write_node(child, level + 1)
-
-            if mindmap.topic_node:
-                write_node(mindmap.topic_node)
-
-            # Write HTML footer
-            f.write("</body>\n")
-            f.write("</html>\n")
+    renderer = HTMLRenderer()
+    fragments = PreorderFragments(renderer, "html")
+
+    def convert_to(
+        self,
+        mindmap: MindMap,
+        output_path: str,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        """Convert XMind nodes to HTML file with h1-hn tag hierarchy
+
+        Args:
+            mindmap: MindMap object to convert
+            output_path: Path to save the output file
+            workers: Render subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are rendered in parallel
+            cache: Reuse rendered fragments of unchanged subtrees; rendering is then serial
+        """
+        with open(output_path, "wb") as f:
+            self.convert_stream(mindmap, f, workers, split_depth, cache)
+
+    def convert_stream(
+        self,
+        mindmap: MindMap,
+        stream: BinaryIO,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        """Convert XMind nodes to HTML and write it to a binary stream
+
+        Args:
+            mindmap: MindMap object to convert
+            stream: Writable binary stream, UTF-8 text is written
+            workers: Render subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are rendered in parallel
+            cache: Reuse rendered fragments of unchanged subtrees; rendering is then serial
+        """
+        with self.instrumentation.span("html.write") as span:
+            if cache is not None and mindmap.topic_node:
+                # The cached tree is already bytes; only the document around it is rendered as text
+                header, footer = io.StringIO(), io.StringIO()
+                self._write_header(mindmap, header)
+                self._write_footer(footer)
+                chunks = [
+                    header.getvalue().encode("utf-8"),
+                    *render_cached(self.fragments, mindmap.topic_node, cache),
+                    footer.getvalue().encode("utf-8"),
+                ]
+            else:
+                buffer = io.StringIO()
+                self._write(mindmap, buffer, workers, split_depth)
+                chunks = [buffer.getvalue().encode("utf-8")]
+            stream.writelines(chunks)
+            stream.flush()
+            span.bytes_out = sum(len(chunk) for chunk in chunks)
+            if self.instrumentation.enabled:
+                span.nodes = count_nodes(mindmap.topic_node)
+
+    def _write(self, mindmap: MindMap, f: TextIO, workers: Optional[int] = None, split_depth: int = 2) -> None:
+        """Write HTML document around the rendered node tree"""
+        self._write_header(mindmap, f)
+
+        # Write node tree with h1-hn tags
+        if mindmap.topic_node:
+            f.write(render_tree(self.renderer, mindmap.topic_node, workers, split_depth))
+
+        self._write_footer(f)
+
+    def _write_header(self, mindmap: MindMap, f: TextIO) -> None:
+        """Write HTML header"""
+        f.write("<!DOCTYPE html>\n")
+        f.write('<html lang="en">\n')
+        f.write("<head>\n")
+        f.write('    <meta charset="UTF-8">\n')
+        f.write('    <meta name="viewport" content="width=device-width, initial-scale=1.0">\n')
+        f.write(f"    <title>{mindmap.title}</title>\n")
+        f.write("    <style>\n")
+        f.write("        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }\n")
+        f.write("        h1 { font-size: 2em; font-weight: bold; }\n")
+        f.write("        h2 { font-size: 1.5em; font-weight: bold; }\n")
+        f.write("        h3 { font-size: 1.2em; font-weight: bold; }\n")
+        f.write("        h4 { font-size: 1.1em; font-weight: bold; }\n")
+        f.write("        h5 { font-size: 1em; font-weight: bold; }\n")
+        f.write("        h6 { font-size: 0.9em; font-weight: bold; }\n")
+        f.write("    </style>\n")
+        f.write("</head>\n")
+        f.write("<body>\n")
+
+    def _write_footer(self, f: TextIO) -> None:
+        """Write HTML footer"""
+        f.write("</body>\n")
+        f.write("</html>\n")
@@ -1,59 +1,237 @@
 """JSON conversion logic"""
 
 import json
-from typing import Dict, Any
-from ..models import MindMap
+import re
+import uuid
+from typing import Any, BinaryIO, Dict, List, Optional
+from ..models import MindMap, Node
+from ..instrumentation import count_nodes
+from .. import json_backend
 from .base_converter import BaseConverter
+from .fragments import FragmentCache, FragmentRenderer, json_string, render_cached
+from .parallel import map_units
+
+
+def _node_dict(current_node: Node) -> Dict[str, Any]:
+    """Build node dictionary without children"""
+    node_dict: Dict[str, Any] = {
+        "id": current_node.id,
+        "title": current_node.title,
+        "children": [],
+    }
+
+    if current_node.notes:
+        node_dict["notes"] = current_node.notes
+
+    if current_node.labels:
+        node_dict["labels"] = current_node.labels
+
+    return node_dict
+
+
+def _build_node_dict(current_node: Node) -> Dict[str, Any]:
+    """Build node dictionary"""
+    node_dict = _node_dict(current_node)
+    for child in current_node.children:
+        node_dict["children"].append(_build_node_dict(child))
+
+    return node_dict
+
+
+def _encode_subtree(node: Node) -> str:
+    """Encode one subtree as it appears at indentation level 0"""
+    return json_backend.dumps(_build_node_dict(node), indent=2)
+
+
+class JSONFragments(FragmentRenderer):
+    """Renders node objects exactly as ``json_backend.dumps(..., indent=2)`` lays them out
+
+    The level is the indentation of the node's closing brace.
+    """
+
+    namespace = "json"
+    include_ids = True
+
+    def open(self, node: Node, level: int) -> bytes:
+        inner = " " * (level + 2)
+        children = f"[\n{' ' * (level + 4)}" if node.children else "[]"
+        return (
+            f'{{\n{inner}"id": {json_string(node.id)},\n{inner}"title": {json_string(node.title)},\n'
+            f'{inner}"children": {children}'
+        ).encode("utf-8")
+
+    def separator(self, node: Node, level: int) -> bytes:
+        return b",\n" + b" " * (level + 4)
+
+    def close(self, node: Node, level: int) -> bytes:
+        inner = " " * (level + 2)
+        text = f"\n{inner}]" if node.children else ""
+        if node.notes:
+            text += f',\n{inner}"notes": {json_string(node.notes)}'
+        if node.labels:
+            item_indent = " " * (level + 4)
+            labels = f",\n{item_indent}".join(json_string(label) for label in node.labels)
+            text += f',\n{inner}"labels": [\n{item_indent}{labels}\n{inner}]'
+        return (text + f"\n{' ' * level}}}").encode("utf-8")
+
+    def child_level(self, level: int) -> int:
+        # Children sit inside the "children" array of the node object
+        return level + 4
 
 
 class JSONConverter(BaseConverter):
     """JSON converter"""
 
-    def convert_to(self, mindmap: MindMap, output_path: str) -> None:
-        """Convert XMind nodes to JSON file"""
+    fragments = JSONFragments()
+
+    def convert_to(
+        self,
+        mindmap: MindMap,
+        output_path: str,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        """Convert XMind nodes to JSON file
+
+        Args:
+            mindmap: MindMap object to convert
+            output_path: Path to save the output file
+            workers: Encode subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are encoded in parallel
+            cache: Reuse encoded fragments of unchanged subtrees; encoding is then serial
+        """
+        with open(output_path, "wb") as f:
+            self.convert_stream(mindmap, f, workers, split_depth, cache)
 
-        # Build node dictionary
-        def build_node_dict(current_node) -> Dict[str, Any]:
-            node_dict: Dict[str, Any] = {
-                "id": current_node.id,
-                "title": current_node.title,
-                "children": [],
+    def convert_stream(
+        self,
+        mindmap: MindMap,
+        stream: BinaryIO,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        """Convert XMind nodes to JSON and write it to a binary stream
+
+        Args:
+            mindmap: MindMap object to convert
+            stream: Writable binary stream, UTF-8 text is written
+            workers: Encode subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are encoded in parallel
+            cache: Reuse encoded fragments of unchanged subtrees; encoding is then serial
+        """
+        if cache is not None:
+            self._convert_cached(mindmap, stream, cache)
+            return
+
+        parallel = workers is not None and workers > 1 and split_depth >= 2
+        subtrees: List[Node] = []
+        placeholder = f"\x00{uuid.uuid4().hex}:"
+
+        def build_skeleton(root: Node) -> Dict[str, Any]:
+            """Build node dictionaries above split_depth, with placeholders for the subtrees below"""
+            roots: List[Any] = []
+            stack = [(root, 1, roots)]
+            while stack:
+                node, level, siblings = stack.pop()
+                if level >= split_depth:
+                    siblings.append(f"{placeholder}{len(subtrees)}")
+                    subtrees.append(node)
+                    continue
+                node_dict = _node_dict(node)
+                siblings.append(node_dict)
+                for child in reversed(node.children):
+                    stack.append((child, level + 1, node_dict["children"]))
+            return roots[0]
+
+        build_node_dict = build_skeleton if parallel else _build_node_dict
+
+        with self.instrumentation.span("json.build") as span:
+            mindmap_dict: Dict[str, Any] = {
+                "title": mindmap.title,
+                "topic_node": None,
+                "detached_nodes": [],
+                "relations": [],
             }
 
-            if current_node.notes:
-                node_dict["notes"] = current_node.notes
+            if mindmap.topic_node:
+                mindmap_dict["topic_node"] = build_node_dict(mindmap.topic_node)
 
-            if current_node.labels:
-                node_dict["labels"] = current_node.labels
+            for detached_node in mindmap.detached_nodes:
+                mindmap_dict["detached_nodes"].append(build_node_dict(detached_node))
 
-            for child in current_node.children:
-                node_dict["children"].append(build_node_dict(child))
+            for relation in mindmap.relations:
+                mindmap_dict["relations"].append(
+                    {
+                        "id": relation.id,
+                        "source_id": relation.source_id,
+                        "target_id": relation.target_id,
+                        "title": relation.title,
+                    }
+                )
+            if self.instrumentation.enabled:
+                span.nodes = count_nodes(mindmap.topic_node, *mindmap.detached_nodes)
 
-            return node_dict
+        with self.instrumentation.span("json.encode") as span:
+            text = json_backend.dumps(mindmap_dict, indent=2)
+            if subtrees:
+                fragments = map_units(_encode_subtree, subtrees, [count_nodes(node) for node in subtrees], workers)
+                # Indent every fragment like the placeholder string it replaces
+                text = re.sub(
+                    r'(\n *)"' + re.escape(json.dumps(placeholder)[1:-1]) + r'(\d+)"',
+                    lambda match: match.group(1) + fragments[int(match.group(2))].replace("\n", match.group(1)),
+                    text,
+                )
+            data = text.encode("utf-8") + b"\n"
+            span.bytes_out = len(data)
 
-        mindmap_dict: Dict[str, Any] = {
-            "title": mindmap.title,
-            "topic_node": None,
-            "detached_nodes": [],
-            "relations": [],
-        }
+        with self.instrumentation.span("json.write", bytes_in=len(data)) as span:
+            stream.write(data)
+            stream.flush()
+            span.bytes_out = len(data)
 
-        if mindmap.topic_node:
-            mindmap_dict["topic_node"] = build_node_dict(mindmap.topic_node)
+    def _convert_cached(self, mindmap: MindMap, stream: BinaryIO, cache: FragmentCache) -> None:
+        """Encode the map around node trees taken from the fragment cache"""
+        placeholder = f"\x00{uuid.uuid4().hex}:"
+        roots: List[Node] = []
 
-        for detached_node in mindmap.detached_nodes:
-            mindmap_dict["detached_nodes"].append(build_node_dict(detached_node))
+        def slot(node: Node) -> str:
+            roots.append(node)
+            return f"{placeholder}{len(roots) - 1}"
 
-        for relation in mindmap.relations:
-            mindmap_dict["relations"].append(
-                {
-                    "id": relation.id,
-                    "source_id": relation.source_id,
-                    "target_id": relation.target_id,
-                    "title": relation.title,
-                }
-            )
+        with self.instrumentation.span("json.encode") as span:
+            mindmap_dict: Dict[str, Any] = {
+                "title": mindmap.title,
+                "topic_node": slot(mindmap.topic_node) if mindmap.topic_node else None,
+                "detached_nodes": [slot(node) for node in mindmap.detached_nodes],
+                "relations": [
+                    {
+                        "id": relation.id,
+                        "source_id": relation.source_id,
+                        "target_id": relation.target_id,
+                        "title": relation.title,
+                    }
+                    for relation in mindmap.relations
+                ],
+            }
+            skeleton = json_backend.dumps(mindmap_dict, indent=2).encode("utf-8")
+            # Odd items are the indexes of the placeholders between the skeleton pieces
+            pieces = re.split(re.escape(json_string(placeholder)[:-1].encode("utf-8")) + rb'(\d+)"', skeleton)
+            chunks: List[bytes] = []
+            for index, piece in enumerate(pieces):
+                if index % 2 == 0:
+                    chunks.append(piece)
+                    continue
+                node = roots[int(piece)]
+                # The topic node is the value of a top-level key, detached nodes are items of a top-level array
+                level = 2 if node is mindmap.topic_node else 4
+                chunks.extend(render_cached(self.fragments, node, cache, level))
+            chunks.append(b"\n")
+            if self.instrumentation.enabled:
+                span.nodes = count_nodes(mindmap.topic_node, *mindmap.detached_nodes)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(mindmap_dict, f, ensure_ascii=False, indent=2)
-            f.write("\n")
+        with self.instrumentation.span("json.write") as span:
+            stream.writelines(chunks)
+            stream.flush()
+            span.bytes_out = sum(len(chunk) for chunk in chunks)
@@ -1,44 +1,93 @@
 """Markdown conversion logic"""
 
-from typing import Optional
-from ..models import MindMap
+from typing import BinaryIO, List, Optional
+from ..models import MindMap, Node
+from ..instrumentation import count_nodes
 from .base_converter import BaseConverter
+from .fragments import FragmentCache, PreorderFragments, render_cached
+from .parallel import SubtreeRenderer, render_tree
+
+
+class MarkdownRenderer(SubtreeRenderer):
+    """Renders one heading block per node"""
+
+    def render_node(self, node: Node, level: int, parent_title: Optional[str]) -> str:
+        # Heading, optional notes and labels, then an empty line
+        text = f"{'#' * level} {node.title}\n"
+        if node.notes:
+            text += f"- notes: {node.notes}\n"
+        if node.labels:
+            text += f"- labels: [{', '.join(node.labels)}]\n"
+        return text + "\n"
 
 
 class MarkdownConverter(BaseConverter):
     """Markdown converter"""
 
-    def convert_to(self, mindmap: MindMap, output_path: str) -> None:
-        """Convert XMind nodes to Markdown file"""
-        content_lines = []
+    renderer = MarkdownRenderer()
+    fragments = PreorderFragments(renderer, "md")
 
-        def write_node(current_node, level: int = 1) -> None:
-            # Write current node
-            prefix = "#" * level
-            content_lines.append(f"{prefix} {current_node.title}")
+    def convert_to(
+        self,
+        mindmap: MindMap,
+        output_path: str,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        """Convert XMind nodes to Markdown file
 
-            # Write notes if present
-            if current_node.notes:
-                content_lines.append(f"- notes: {current_node.notes}")
+        Args:
+            mindmap: MindMap object to convert
+            output_path: Path to save the output file
+            workers: Render subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are rendered in parallel
+            cache: Reuse rendered fragments of unchanged subtrees; rendering is then serial
+        """
+        with open(output_path, "wb") as f:
+            self.convert_stream(mindmap, f, workers, split_depth, cache)
 
-            # Write labels if present
-            if current_node.labels:
-                labels_str = ", ".join(current_node.labels)
-                content_lines.append(f"- labels: [{labels_str}]")
+    def convert_stream(
+        self,
+        mindmap: MindMap,
+        stream: BinaryIO,
+        workers: Optional[int] = None,
+        split_depth: int = 2,
+        cache: Optional[FragmentCache] = None,
+    ) -> None:
+        """Convert XMind nodes to Markdown and write it to a binary stream
 
-            content_lines.append("")
+        Args:
+            mindmap: MindMap object to convert
+            stream: Writable binary stream, UTF-8 text is written
+            workers: Render subtrees in this many processes (default: serial)
+            split_depth: Depth whose subtrees are rendered in parallel
+            cache: Reuse rendered fragments of unchanged subtrees; rendering is then serial
+        """
+        with self.instrumentation.span("md.render") as span:
+            if cache is not None:
+                chunks = self._render_cached(mindmap, cache)
+            else:
+                chunks = [self._render(mindmap, workers, split_depth).encode("utf-8")]
+            if self.instrumentation.enabled:
+                span.nodes = count_nodes(mindmap.topic_node)
 
-            # Write child nodes
-            if current_node.children:
-                for child in current_node.children:
-                    write_node(child, level + 1)
+        with self.instrumentation.span("md.write") as span:
+            stream.writelines(chunks)
+            stream.flush()
+            span.bytes_out = sum(len(chunk) for chunk in chunks)
 
-        if mindmap.topic_node:
-            write_node(mindmap.topic_node)
-            # Remove trailing empty line
-            if content_lines and content_lines[-1] == "":
-                content_lines.pop()
+    def _render(self, mindmap: MindMap, workers: Optional[int] = None, split_depth: int = 2) -> str:
+        """Render node tree as Markdown text"""
+        if not mindmap.topic_node:
+            return "\n"
+        # Drop the empty line after the last node
+        return render_tree(self.renderer, mindmap.topic_node, workers, split_depth)[:-1]
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(content_lines))
-            f.write("\n")
+    def _render_cached(self, mindmap: MindMap, cache: FragmentCache) -> List[bytes]:
+        """Render node tree as UTF-8 Markdown chunks from cached fragments"""
+        if not mindmap.topic_node:
+            return [b"\n"]
+        chunks = render_cached(self.fragments, mindmap.topic_node, cache)
+        chunks[-1] = chunks[-1][:-1]
+        return chunks
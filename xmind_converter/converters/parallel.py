@@ -0,0 +1,193 @@
+"""Parallel subtree serialization for very large mind maps
+
+The tree is cut at ``split_depth`` (the root is depth 1). Nodes above the cut
+are rendered in the calling process; every subtree rooted at the cut is a work
+unit. Units are grouped into contiguous chunks of similar node counts, rendered
+in a process pool, and the fragments are stitched back together in document
+order, so the output is byte-identical to rendering the tree serially.
+
+Where the ``fork`` start method is available and no other thread is running,
+the workers inherit the tree and receive only chunk bounds, so nothing is
+pickled on the way in. Otherwise the units are pickled to ``forkserver`` or
+``spawn`` workers: a child forked while another thread holds a lock would
+deadlock on it.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+from ..models import Node
+from ..instrumentation import count_nodes
+
+# Units and function shared with forked workers; guarded by _lock
+_lock = threading.Lock()
+_inherited_units: Sequence[Any] = ()
+_inherited_function: Optional[Callable[[Any], Any]] = None
+
+
+class SubtreeRenderer:
+    """Renders nodes of a text format in document (pre-)order
+
+    Subclasses implement ``render_node``; the text of a subtree is the
+    concatenation of its nodes' texts in pre-order.
+    """
+
+    def render_node(self, node: Node, level: int, parent_title: Optional[str]) -> str:
+        """Render one node without its children
+
+        Args:
+            node: Node to render
+            level: Depth of the node, the root is 1
+            parent_title: Title of the parent node, None for the root
+        """
+        raise NotImplementedError
+
+    def render_subtree(self, node: Node, level: int = 1, parent_title: Optional[str] = None) -> str:
+        """Render a node and all its descendants without recursion"""
+        parts: List[str] = []
+        stack: List[Tuple[Node, int, Optional[str]]] = [(node, level, parent_title)]
+        while stack:
+            current, current_level, current_parent = stack.pop()
+            parts.append(self.render_node(current, current_level, current_parent))
+            for child in reversed(current.children):
+                stack.append((child, current_level + 1, current.title))
+        return "".join(parts)
+
+    def render_unit(self, unit: Tuple[Node, int, Optional[str]]) -> str:
+        """Render a work unit produced by ``render_tree``"""
+        return self.render_subtree(*unit)
+
+
+def balanced_chunks(weights: Sequence[int], count: int) -> List[Tuple[int, int]]:
+    """Split a sequence into at most ``count`` contiguous ranges of similar total weight
+
+    Args:
+        weights: Weight of every item, e.g. subtree node counts
+        count: Maximum number of ranges
+
+    Returns:
+        List of (start, end) index ranges covering every item in order
+    """
+    total = sum(weights)
+    if not weights or count <= 1 or total == 0:
+        return [(0, len(weights))] if weights else []
+
+    chunks: List[Tuple[int, int]] = []
+    start = 0
+    accumulated = 0
+    for index, weight in enumerate(weights):
+        accumulated += weight
+        # Close the chunk once it reaches its share of the total weight
+        if accumulated * count >= total * (len(chunks) + 1) and len(chunks) < count - 1:
+            chunks.append((start, index + 1))
+            start = index + 1
+    if start < len(weights):
+        chunks.append((start, len(weights)))
+    return chunks
+
+
+def _run_inherited(start: int, end: int) -> List[Any]:
+    function = _inherited_function
+    return [function(unit) for unit in _inherited_units[start:end]]  # type: ignore[misc]
+
+
+def _run_shipped(function: Callable[[Any], Any], units: Sequence[Any]) -> List[Any]:
+    return [function(unit) for unit in units]
+
+
+def _start_method() -> str:
+    """Get the start method for the workers, fork only while the calling thread is the only one"""
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return "fork"
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+def map_units(
+    function: Callable[[Any], Any], units: Sequence[Any], weights: Sequence[int], workers: Optional[int] = None
+) -> List[Any]:
+    """Apply a function to every unit in a process pool, keeping order
+
+    Args:
+        function: Picklable function applied to every unit
+        units: Work units
+        weights: Relative cost of every unit, used to balance chunks
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        Results in the order of ``units``
+    """
+    global _inherited_units, _inherited_function
+
+    workers = workers or os.cpu_count() or 1
+    # Several chunks per worker so one large subtree does not leave the others idle
+    chunks = balanced_chunks(weights, workers * 4)
+    results: List[Any] = []
+
+    start_method = _start_method()
+    if start_method == "fork":
+        with _lock:
+            _inherited_units, _inherited_function = units, function
+            try:
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as executor:
+                    futures = [executor.submit(_run_inherited, start, end) for start, end in chunks]
+                    for future in futures:
+                        results.extend(future.result())
+            finally:
+                _inherited_units, _inherited_function = (), None
+        return results
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+        futures = [executor.submit(_run_shipped, function, units[start:end]) for start, end in chunks]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def split_tree(
+    root: Node, split_depth: int, render_node: Callable[[Node, int, Optional[str]], str]
+) -> Tuple[List[Union[str, int]], List[Tuple[Node, int, Optional[str]]]]:
+    """Render the nodes above ``split_depth`` and collect the subtrees at it
+
+    Returns:
+        Tuple of (parts, units): parts holds rendered text and, in document
+        order, the index of the unit whose fragment goes there
+    """
+    parts: List[Union[str, int]] = []
+    units: List[Tuple[Node, int, Optional[str]]] = []
+    stack: List[Tuple[Node, int, Optional[str]]] = [(root, 1, None)]
+    while stack:
+        node, level, parent_title = stack.pop()
+        if level >= split_depth:
+            parts.append(len(units))
+            units.append((node, level, parent_title))
+            continue
+        parts.append(render_node(node, level, parent_title))
+        for child in reversed(node.children):
+            stack.append((child, level + 1, node.title))
+    return parts, units
+
+
+def render_tree(renderer: SubtreeRenderer, root: Node, workers: Optional[int] = None, split_depth: int = 2) -> str:
+    """Render a tree, in parallel when ``workers`` is greater than 1
+
+    Args:
+        renderer: Format renderer
+        root: Root node
+        workers: Number of worker processes; None or 1 renders serially
+        split_depth: Depth whose subtrees become work units, at least 2
+
+    Returns:
+        Rendered text, identical to ``renderer.render_subtree(root)``
+    """
+    if workers is None or workers <= 1 or split_depth < 2:
+        return renderer.render_subtree(root)
+
+    parts, units = split_tree(root, split_depth, renderer.render_node)
+    if not units:
+        return "".join(parts)  # type: ignore[arg-type]
+    weights = [count_nodes(unit[0]) for unit in units]
+    fragments = map_units(renderer.render_unit, units, weights, workers)
+    return "".join(part if isinstance(part, str) else fragments[part] for part in parts)
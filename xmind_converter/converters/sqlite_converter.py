@@ -0,0 +1,189 @@
+"""SQLite database converter
+
+Writes a mind map as a SQLite database that can be queried with plain SQL.
+Nodes are numbered in pre-order across the topic tree and the detached
+trees, and every node stores the number of the last node of its subtree, so
+subtree and ancestor queries are range conditions on the primary key:
+
+    -- Size of every subtree
+    SELECT title, last_seq - seq + 1 FROM nodes;
+    -- Descendants of a node
+    SELECT d.* FROM nodes n JOIN nodes d ON d.seq BETWEEN n.seq + 1 AND n.last_seq WHERE n.id = ?;
+    -- Ancestors of a node
+    SELECT a.* FROM nodes n JOIN nodes a ON n.seq BETWEEN a.seq + 1 AND a.last_seq WHERE n.id = ?;
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import BinaryIO, List, Tuple
+from ..models import MindMap, Node
+from .base_converter import BaseConverter
+
+#: Stored in the meta table; readers reject other versions
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+CREATE TABLE nodes (
+    seq INTEGER PRIMARY KEY,
+    last_seq INTEGER NOT NULL,
+    parent INTEGER REFERENCES nodes (seq),
+    depth INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    notes TEXT
+);
+CREATE TABLE labels (
+    node INTEGER NOT NULL REFERENCES nodes (seq),
+    position INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (node, position)
+) WITHOUT ROWID;
+CREATE TABLE relations (
+    id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    title TEXT
+);
+"""
+
+# Created after the bulk load: building an index once is far cheaper than updating it per row
+INDEXES = """
+CREATE INDEX nodes_parent ON nodes (parent);
+CREATE INDEX nodes_id ON nodes (id);
+CREATE INDEX nodes_title ON nodes (title);
+CREATE INDEX labels_label ON labels (label);
+CREATE INDEX relations_source ON relations (source_id);
+CREATE INDEX relations_target ON relations (target_id);
+"""
+
+# Page cache used while writing, in KiB
+_CACHE_KIB = 256 * 1024
+
+NodeRow = List[object]
+LabelRow = Tuple[int, int, str]
+
+
+def node_rows(mindmap: MindMap) -> Tuple[List[NodeRow], List[LabelRow]]:
+    """Flatten the topic tree and detached trees into table rows without recursion
+
+    Args:
+        mindmap: MindMap object to flatten
+
+    Returns:
+        Node rows (seq, last_seq, parent, depth, id, title, notes) in pre-order
+        and label rows (node seq, position, label)
+    """
+    rows: List[NodeRow] = []
+    label_rows: List[LabelRow] = []
+    roots = [*([mindmap.topic_node] if mindmap.topic_node else []), *mindmap.detached_nodes]
+    for root in roots:
+        stack: List[Tuple[Node, object, int]] = [(root, None, 0)]
+        # Rows of the open ancestors, to fill in last_seq when their subtree ends
+        open_rows: List[NodeRow] = []
+        while stack:
+            node, parent, depth = stack.pop()
+            seq = len(rows)
+            while len(open_rows) > depth:
+                open_rows.pop()[1] = seq - 1
+            row = [seq, seq, parent, depth, node.id, node.title, node.notes]
+            rows.append(row)
+            open_rows.append(row)
+            labels = node.labels
+            if labels:
+                label_rows.extend([(seq, position, label) for position, label in enumerate(labels)])
+            # Most nodes are leaves
+            children = node.children
+            if children:
+                depth += 1
+                for child in reversed(children):
+                    stack.append((child, seq, depth))
+        for row in open_rows:
+            row[1] = len(rows) - 1
+    return rows, label_rows
+
+
+class SQLiteConverter(BaseConverter):
+    """SQLite database converter"""
+
+    def convert_to(self, mindmap: MindMap, output_path: str) -> None:
+        """Convert MindMap to a SQLite database file
+
+        The database is built next to the output path and moved into place
+        when complete, so an existing file is replaced, never appended to.
+
+        Args:
+            mindmap: MindMap object to convert
+            output_path: Path to save the database
+        """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix=".tmp")
+        os.close(fd)
+        try:
+            self._write(mindmap, temp_path)
+            os.replace(temp_path, output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def convert_stream(self, mindmap: MindMap, stream: BinaryIO) -> None:
+        """Convert MindMap to a SQLite database and write it to a binary stream
+
+        SQLite writes to files only, so the database is built in a temporary
+        file and then copied to the stream.
+
+        Args:
+            mindmap: MindMap object to convert
+            stream: Writable binary stream
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+        try:
+            self._write(mindmap, temp_path)
+            with open(temp_path, "rb") as f:
+                shutil.copyfileobj(f, stream)
+            stream.flush()
+        finally:
+            os.unlink(temp_path)
+
+    def _write(self, mindmap: MindMap, path: str) -> None:
+        """Create the database at a path, replacing any file there"""
+        if os.path.exists(path):
+            os.unlink(path)
+        with self.instrumentation.span("sqlite.build") as span:
+            rows, label_rows = node_rows(mindmap)
+            span.nodes = len(rows)
+
+        with self.instrumentation.span("sqlite.write") as span:
+            connection = sqlite3.connect(path, isolation_level=None)
+            try:
+                # The file is new and moved into place only when complete, so crash safety is not needed
+                connection.execute("PRAGMA journal_mode = OFF")
+                connection.execute("PRAGMA synchronous = OFF")
+                connection.execute(f"PRAGMA cache_size = -{_CACHE_KIB}")
+                connection.executescript(SCHEMA)
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT INTO meta VALUES (?, ?)",
+                    [
+                        ("schema_version", str(SCHEMA_VERSION)),
+                        ("title", mindmap.title),
+                        ("has_topic", "1" if mindmap.topic_node is not None else "0"),
+                    ],
+                )
+                connection.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                connection.executemany("INSERT INTO labels VALUES (?, ?, ?)", label_rows)
+                connection.executemany(
+                    "INSERT INTO relations VALUES (?, ?, ?, ?)",
+                    [(rel.id, rel.source_id, rel.target_id, rel.title) for rel in mindmap.relations],
+                )
+                connection.execute("COMMIT")
+                connection.executescript(INDEXES)
+            finally:
+                connection.close()
+            span.nodes = len(rows)
+            span.bytes_out = os.path.getsize(path)
@@ -1,80 +1,94 @@
 """XMind file converter"""
 
-import json
+import io
 import zipfile
-import tempfile
-import os
-from typing import Dict, List, Any
+from typing import BinaryIO, Dict, List, Any, Sequence, Union
 from ..models import MindMap, Node
+from ..instrumentation import count_nodes
+from .. import json_backend
 from .base_converter import BaseConverter
 
 
 class XMindConverter(BaseConverter):
     """XMind file converter"""
 
-    def convert_to(self, mindmap: MindMap, output_path: str) -> None:
+    def convert_to(self, mindmap: Union[MindMap, Sequence[MindMap]], output_path: str) -> None:
         """Convert MindMap to XMind file
 
         Args:
-            mindmap: MindMap object to convert
+            mindmap: MindMap object to convert, or a sequence of MindMap objects written as one sheet each
             output_path: Path to save XMind file
         """
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Build content.json structure
-            content_data = self._build_content_json(mindmap)
+        with open(output_path, "wb") as f:
+            self.convert_stream(mindmap, f)
+
+    def convert_stream(self, mindmap: Union[MindMap, Sequence[MindMap]], stream: BinaryIO) -> None:
+        """Convert MindMap to XMind data and write it to a binary stream
+
+        Archives for streams that cannot seek (pipes, sockets) are built in memory
+        and written in one piece, so the output is an ordinary zip file either way.
 
-            # Write content.json
-            content_json_path = os.path.join(tmpdir, "content.json")
-            with open(content_json_path, "w", encoding="utf-8") as f:
-                json.dump(content_data, f, ensure_ascii=False, indent=2)
-
-            # Write metadata.json
-            metadata_data = self._build_metadata_json()
-            metadata_json_path = os.path.join(tmpdir, "metadata.json")
-            with open(metadata_json_path, "w", encoding="utf-8") as f:
-                json.dump(metadata_data, f, ensure_ascii=False, indent=2)
-
-            # Write manifest.json
-            manifest_data = self._build_manifest_json()
-            manifest_json_path = os.path.join(tmpdir, "manifest.json")
-            with open(manifest_json_path, "w", encoding="utf-8") as f:
-                json.dump(manifest_data, f, ensure_ascii=False, indent=2)
-
-            # Create Thumbnails directory and write thumbnail.png
-            thumbnails_dir = os.path.join(tmpdir, "Thumbnails")
-            os.makedirs(thumbnails_dir, exist_ok=True)
-            thumbnail_path = os.path.join(thumbnails_dir, "thumbnail.png")
-            self._create_thumbnail(thumbnail_path)
-
-            # Create XMind file as zip
-            with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                zf.write(content_json_path, "content.json")
-                zf.write(metadata_json_path, "metadata.json")
-                zf.write(manifest_json_path, "manifest.json")
-                zf.write(thumbnail_path, "Thumbnails/thumbnail.png")
-
-    def _build_content_json(self, mindmap: MindMap) -> List[Dict[str, Any]]:
+        Args:
+            mindmap: MindMap object to convert, or a sequence of MindMap objects written as one sheet each
+            stream: Writable binary stream
+        """
+        # Build content.json structure
+        with self.instrumentation.span("xmind.build") as span:
+            content_data = self._build_content_json(mindmap)
+            if self.instrumentation.enabled:
+                mindmaps = [mindmap] if isinstance(mindmap, MindMap) else mindmap
+                span.nodes = sum(count_nodes(m.topic_node, *m.detached_nodes) for m in mindmaps)
+
+        with self.instrumentation.span("xmind.encode") as span:
+            content_json = json_backend.dumps(content_data, indent=2).encode("utf-8")
+            span.bytes_out = len(content_json)
+
+        metadata_json = json_backend.dumps(self._build_metadata_json(), indent=2).encode("utf-8")
+        manifest_json = json_backend.dumps(self._build_manifest_json(), indent=2).encode("utf-8")
+
+        with self.instrumentation.span("xmind.thumbnail"):
+            thumbnail = self._create_thumbnail()
+
+        # Create XMind file as zip
+        with self.instrumentation.span("xmind.zip") as span:
+            target = stream if stream.seekable() else io.BytesIO()
+            start = target.tell()
+            with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("content.json", content_json)
+                zf.writestr("metadata.json", metadata_json)
+                zf.writestr("manifest.json", manifest_json)
+                zf.writestr("Thumbnails/thumbnail.png", thumbnail)
+            span.bytes_out = target.tell() - start
+            if target is not stream:
+                stream.write(target.getvalue())
+            stream.flush()
+
+    def _build_content_json(self, mindmap: Union[MindMap, Sequence[MindMap]]) -> List[Dict[str, Any]]:
         """Build content.json structure from MindMap
 
         Args:
-            mindmap: MindMap object
+            mindmap: MindMap object, or a sequence of MindMap objects (one sheet each)
 
         Returns:
             List of sheets in XMind format
         """
+        mindmaps = [mindmap] if isinstance(mindmap, MindMap) else list(mindmap)
         sheets = []
 
-        if mindmap.topic_node:
+        for sheet_mindmap in mindmaps:
+            if not sheet_mindmap.topic_node:
+                continue
+
             sheet = {
                 "id": self._generate_id(),
-                "title": mindmap.title,
-                "rootTopic": self._build_topic_json(mindmap.topic_node, is_root=True),
+                "title": sheet_mindmap.title,
+                "rootTopic": self._build_topic_json(sheet_mindmap.topic_node, is_root=True),
             }
 
-            if mindmap.detached_nodes:
-                sheet["detachedTopics"] = [self._build_topic_json(node) for node in mindmap.detached_nodes]
+            if sheet_mindmap.detached_nodes:
+                sheet["detachedTopics"] = [self._build_topic_json(node) for node in sheet_mindmap.detached_nodes]
 
-            if mindmap.relations:
+            if sheet_mindmap.relations:
                 sheet["relationships"] = [
                     {
                         "id": rel.id or self._generate_id(),
@@ -82,7 +96,7 @@ class XMindConverter(BaseConverter):
                         "end2Id": rel.target_id,
                         "title": rel.title,
                     }
-                    for rel in mindmap.relations
+                    for rel in sheet_mindmap.relations
                 ]
 
             sheets.append(sheet)
@@ -150,11 +164,11 @@ class XMindConverter(BaseConverter):
         """
         return {"file-entries": {"content.json": {}, "metadata.json": {}, "Thumbnails/thumbnail.png": {}}}
 
-    def _create_thumbnail(self, thumbnail_path: str) -> None:
+    def _create_thumbnail(self) -> bytes:
         """Create a minimal valid PNG thumbnail
 
-        Args:
-            thumbnail_path: Path to save the thumbnail PNG file
+        Returns:
+            PNG file data
         """
         import struct
 
@@ -185,5 +199,4 @@ class XMindConverter(BaseConverter):
 
         buf = bytearray()
         write_png(buf, width, height, pixels)
-        with open(thumbnail_path, "wb") as f:
-            f.write(buf)
+        return bytes(buf)
@@ -1,40 +1,99 @@
 """Core parsing and data models"""
 
-from typing import Dict, Optional
+import io
+import os
+from typing import BinaryIO, Dict, Optional, Union
 from .models import MindMap
 from .parsers.xmind_parser import XMindParser
 from .parsers.csv_parser import CSVParser
 from .parsers.md_parser import MarkdownParser
 from .parsers.html_parser import HTMLParser
 from .parsers.json_parser import JSONParser
+from .parsers.sqlite_parser import SQLiteParser
 from .converters.csv_converter import CSVConverter
 from .converters.md_converter import MarkdownConverter
 from .converters.html_converter import HTMLConverter
 from .converters.json_converter import JSONConverter
 from .converters.xmind_converter import XMindConverter
-from .exceptions import ParserError, ConverterError, FileFormatError
+from .converters.sqlite_converter import SQLiteConverter
+from .exceptions import ParserError, ConverterError, FileFormatError, TopicNotFound
+from .instrumentation import Instrumentation, NULL_INSTRUMENTATION
+from .query import Query
+from .sniff import sniff
 
 
 class CoreConverter:
     """XMind converter main class"""
 
-    def __init__(self) -> None:
+    def __init__(self, instrumentation: Optional[Instrumentation] = None) -> None:
+        """Create converter
+
+        Args:
+            instrumentation: Receives per-stage timing spans from every parser and converter
+                (default: disabled)
+        """
         self.converters: Dict[
-            str, CSVConverter | MarkdownConverter | HTMLConverter | JSONConverter | XMindConverter
+            str, CSVConverter | MarkdownConverter | HTMLConverter | JSONConverter | XMindConverter | SQLiteConverter
         ] = {
             "csv": CSVConverter(),
             "md": MarkdownConverter(),
             "html": HTMLConverter(),
             "json": JSONConverter(),
             "xmind": XMindConverter(),
+            "sqlite": SQLiteConverter(),
         }
-        self.parsers: Dict[str, XMindParser | CSVParser | MarkdownParser | HTMLParser | JSONParser] = {
+        self.parsers: Dict[str, XMindParser | CSVParser | MarkdownParser | HTMLParser | JSONParser | SQLiteParser] = {
             "xmind": XMindParser(),
             "csv": CSVParser(),
             "md": MarkdownParser(),
             "html": HTMLParser(),
             "json": JSONParser(),
+            "sqlite": SQLiteParser(),
         }
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        """Instrumentation shared by every parser and converter"""
+        return self._instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, instrumentation: Instrumentation) -> None:
+        self._instrumentation = instrumentation
+        for component in [*self.parsers.values(), *self.converters.values()]:
+            component.instrumentation = instrumentation
+
+    def detect_format(self, input_path: str) -> Optional[str]:
+        """Detect the format of a file from its content
+
+        Reads at most a few KB (and for XMind the zip central directory), so it
+        is cheap enough to run on every upload before parsing.
+
+        Args:
+            input_path: Path to input file
+
+        Returns:
+            Format type, or None if the content is not recognised
+        """
+        format_type = sniff(input_path)
+        return format_type if format_type in self.parsers else None
+
+    def _detect_input_format(self, input_path: str) -> str:
+        """Get the input format from the file extension, or from the content if the extension is unknown"""
+        ext = os.path.splitext(input_path)[1].lower()[1:]
+        if ext in self.parsers:
+            return ext
+        format_type = self.detect_format(input_path) if os.path.isfile(input_path) else None
+        if format_type is None:
+            raise FileFormatError(f"Cannot auto detect format from file extension or content: {input_path}")
+        return format_type
+
+    def _detect_output_format(self, output_path: str) -> str:
+        """Get the output format from the file extension"""
+        ext = os.path.splitext(output_path)[1].lower()[1:]
+        if ext not in self.converters:
+            raise FileFormatError(f"Cannot auto detect output format from file extension: {ext}")
+        return ext
 
     def load_from(self, input_path: str, format_type: Optional[str] = None, **kwargs) -> MindMap:
         """Load from specified format and convert to MindMap
@@ -48,13 +107,7 @@ class CoreConverter:
             MindMap object
         """
         if not format_type:
-            import os
-
-            ext = os.path.splitext(input_path)[1].lower()[1:]
-            if ext in self.parsers:
-                format_type = ext
-            else:
-                raise FileFormatError(f"Cannot auto detect format from file extension: {ext}")
+            format_type = self._detect_input_format(input_path)
 
         if format_type not in self.parsers:
             raise FileFormatError(f"Unsupported format: {format_type}")
@@ -62,6 +115,8 @@ class CoreConverter:
         parser = self.parsers[format_type]
         try:
             return parser.parse(input_path, **kwargs)
+        except TopicNotFound:
+            raise
         except Exception as e:
             raise ParserError(f"Failed to load file: {str(e)}")
 
@@ -87,12 +142,83 @@ class CoreConverter:
         except Exception as e:
             raise ConverterError(f"Conversion failed: {str(e)}")
 
+    def load_stream(self, stream: BinaryIO, format_type: str, **kwargs) -> MindMap:
+        """Load from a binary stream in the specified format
+
+        Args:
+            stream: Readable binary stream, e.g. sys.stdin.buffer
+            format_type: Format type, streams have no extension to detect it from
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            MindMap object
+        """
+        if format_type not in self.parsers:
+            raise FileFormatError(f"Unsupported format: {format_type}")
+
+        parser = self.parsers[format_type]
+        try:
+            return parser.parse_stream(stream, **kwargs)
+        except TopicNotFound:
+            raise
+        except Exception as e:
+            raise ParserError(f"Failed to load stream: {str(e)}")
+
+    def convert_stream(self, mindmap: MindMap, format_type: str, stream: BinaryIO, **kwargs) -> None:
+        """Convert to specified format and write the result to a binary stream
+
+        Args:
+            mindmap: MindMap object to convert
+            format_type: Target format type
+            stream: Writable binary stream, e.g. sys.stdout.buffer
+            **kwargs: Additional format-specific parameters
+        """
+        if format_type not in self.converters:
+            raise FileFormatError(f"Unsupported format: {format_type}")
+
+        converter = self.converters[format_type]
+        try:
+            converter.convert_stream(mindmap, stream, **kwargs)
+        except Exception as e:
+            raise ConverterError(f"Conversion failed: {str(e)}")
+
+    def loads(self, data: Union[bytes, str], format_type: str, **kwargs) -> MindMap:
+        """Load from in-memory data in the specified format
+
+        Args:
+            data: Serialized mind map; str is encoded as UTF-8
+            format_type: Format type of the data
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            MindMap object
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return self.load_stream(io.BytesIO(data), format_type, **kwargs)
+
+    def dumps(self, mindmap: MindMap, format_type: str, **kwargs) -> bytes:
+        """Convert to specified format in memory
+
+        Args:
+            mindmap: MindMap object to convert
+            format_type: Target format type
+            **kwargs: Additional format-specific parameters
+
+        Returns:
+            Serialized mind map, text formats are UTF-8
+        """
+        buffer = io.BytesIO()
+        self.convert_stream(mindmap, format_type, buffer, **kwargs)
+        return buffer.getvalue()
+
     def convert(
         self,
         input_path: str,
         output_path: str,
         input_format: Optional[str] = None,
         output_format: Optional[str] = None,
+        query: Optional[Query] = None,
         **kwargs,
     ) -> str:
         """Convert from one format to another
@@ -102,28 +228,41 @@ class CoreConverter:
             output_path: Path to save the output file
             input_format: Input format type (auto-detected from file extension if not provided)
             output_format: Output format type (auto-detected from file extension if not provided)
+            query: Selection and pruning applied before serialization (default: the whole map)
             **kwargs: Additional format-specific parameters
 
         Returns:
             Success message
         """
         if not input_format:
-            import os
-
-            ext = os.path.splitext(input_path)[1].lower()[1:]
-            if ext in self.parsers:
-                input_format = ext
-            else:
-                raise FileFormatError(f"Cannot auto detect input format from file extension: {ext}")
+            input_format = self._detect_input_format(input_path)
 
         if not output_format:
-            import os
+            output_format = self._detect_output_format(output_path)
 
-            ext = os.path.splitext(output_path)[1].lower()[1:]
-            if ext in self.converters:
-                output_format = ext
-            else:
-                raise FileFormatError(f"Cannot auto detect output format from file extension: {ext}")
-
-        mindmap = self.load_from(input_path, input_format, **kwargs)
+        if query is not None:
+            mindmap: MindMap = self._load_queried(input_path, input_format, query, **kwargs)
+        else:
+            mindmap = self.load_from(input_path, input_format, **kwargs)
         return self.convert_to(mindmap, output_format, output_path, **kwargs)
+
+    def _load_queried(self, source: Union[str, BinaryIO], input_format: str, query: Query, **kwargs) -> MindMap:
+        """Load a file path or stream with the query's parser options and apply the query"""
+        options = query.parser_options() if input_format == "xmind" else {}
+        if "root_id" in options and not isinstance(source, str) and not source.seekable():
+            # Buffered anyway by the XMind parser; kept so the fallback below can read it again
+            source = io.BytesIO(source.read())
+        try:
+            mindmap = self._load_source(source, input_format, **kwargs, **options)
+        except TopicNotFound:
+            # The selected id is not in the sheet: parse it whole so the view is empty, as for other formats
+            if not isinstance(source, str):
+                source.seek(0)
+            mindmap = self._load_source(source, input_format, **kwargs)
+        return query.apply(mindmap)
+
+    def _load_source(self, source: Union[str, BinaryIO], input_format: str, **kwargs) -> MindMap:
+        """Load from a file path or a binary stream"""
+        if isinstance(source, str):
+            return self.load_from(source, input_format, **kwargs)
+        return self.load_stream(source, input_format, **kwargs)
@@ -0,0 +1,326 @@
+"""Structural diff between two mind maps"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .models import MindMap, Node, Relation
+
+INSERTED = "inserted"
+DELETED = "deleted"
+MOVED = "moved"
+RETITLED = "retitled"
+REANNOTATED = "reannotated"
+RELATION_ADDED = "relation_added"
+RELATION_REMOVED = "relation_removed"
+RELATION_CHANGED = "relation_changed"
+
+
+class Change:
+    """Single change between two mind maps"""
+
+    def __init__(
+        self,
+        kind: str,
+        old: Optional[Any] = None,
+        new: Optional[Any] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.kind: str = kind
+        self.old = old
+        self.new = new
+        self.details: Dict[str, Any] = details or {}
+
+    @property
+    def id(self) -> str:
+        """Id of the changed node or relation (new id when both exist)"""
+        return (self.new if self.new is not None else self.old).id
+
+    @property
+    def title(self) -> str:
+        """Title of the changed node or relation (new title when both exist)"""
+        return (self.new if self.new is not None else self.old).title
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert change to a JSON-serializable dictionary"""
+        return {
+            "kind": self.kind,
+            "old_id": self.old.id if self.old is not None else None,
+            "new_id": self.new.id if self.new is not None else None,
+            "title": self.title,
+            **self.details,
+        }
+
+    def __str__(self) -> str:
+        """String representation of change"""
+        extra = ", ".join(f"{key}={value!r}" for key, value in self.details.items())
+        return f"{self.kind} '{self.title}'" + (f" ({extra})" if extra else "")
+
+    def __repr__(self) -> str:
+        """Detailed representation of change"""
+        return f"Change(kind='{self.kind}', id='{self.id}', title='{self.title}', details={self.details})"
+
+
+class ChangeSet:
+    """Iterable set of changes between two mind maps"""
+
+    def __init__(self, changes: Optional[List[Change]] = None) -> None:
+        self.changes: List[Change] = changes or []
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def by_kind(self, kind: str) -> List[Change]:
+        """Get changes of one kind"""
+        return [change for change in self.changes if change.kind == kind]
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        """Convert change set to a JSON-serializable list"""
+        return [change.to_dict() for change in self.changes]
+
+    def __repr__(self) -> str:
+        """Detailed representation of change set"""
+        counts: Dict[str, int] = defaultdict(int)
+        for change in self.changes:
+            counts[change.kind] += 1
+        return f"ChangeSet({dict(counts)})"
+
+
+class _Entry:
+    """Flattened node with its position in the tree"""
+
+    __slots__ = ("node", "parent", "container", "position", "path")
+
+    def __init__(self, node: Node, parent: int, container: str, position: int, path: int) -> None:
+        self.node = node
+        self.parent = parent
+        self.container = container
+        self.position = position
+        self.path = path
+
+
+def _flatten(mindmap: MindMap, paths: Dict[Tuple[Any, str], int]) -> List[_Entry]:
+    """Flatten every tree breadth-first, assigning shared ids to title paths"""
+    entries: List[_Entry] = []
+    roots: List[Tuple[Node, str, int]] = []
+    if mindmap.topic_node is not None:
+        roots.append((mindmap.topic_node, "topic", 0))
+    roots.extend((node, "detached", index) for index, node in enumerate(mindmap.detached_nodes))
+
+    for root, container, position in roots:
+        key = (container, root.title)
+        entries.append(_Entry(root, -1, container, position, paths.setdefault(key, len(paths))))
+
+    index = 0
+    while index < len(entries):
+        entry = entries[index]
+        for position, child in enumerate(entry.node.children):
+            key = (entry.path, child.title)
+            entries.append(_Entry(child, index, entry.container, position, paths.setdefault(key, len(paths))))
+        index += 1
+    return entries
+
+
+def _node_id(entries: List[_Entry], index: int) -> Optional[str]:
+    return entries[index].node.id if index >= 0 else None
+
+
+def diff(old: MindMap, new: MindMap) -> ChangeSet:
+    """Compute structural changes from one mind map to another
+
+    Nodes are matched by id. When the maps share no ids at all (formats
+    without ids such as Markdown, CSV and HTML get fresh ids on every parse),
+    nodes are matched by their path of titles instead, then by position under
+    an already matched parent, then by a title that is unique among the
+    remaining nodes. Every step uses hash indexes, so the diff runs in linear
+    time.
+
+    Args:
+        old: Original mind map
+        new: Changed mind map
+
+    Returns:
+        ChangeSet with inserted, deleted, moved, retitled and reannotated
+        nodes, followed by relation changes
+    """
+    paths: Dict[Tuple[Any, str], int] = {}
+    old_entries = _flatten(old, paths)
+    new_entries = _flatten(new, paths)
+    old_to_new: List[int] = [-1] * len(old_entries)
+    new_to_old: List[int] = [-1] * len(new_entries)
+
+    def match(old_index: int, new_index: int) -> None:
+        old_to_new[old_index] = new_index
+        new_to_old[new_index] = old_index
+
+    new_by_id = {entry.node.id: index for index, entry in enumerate(new_entries)}
+    for old_index, entry in enumerate(old_entries):
+        new_index = new_by_id.get(entry.node.id, -1)
+        if new_index >= 0 and new_to_old[new_index] < 0:
+            match(old_index, new_index)
+
+    if not any(index >= 0 for index in old_to_new):
+        _match_by_heuristics(old_entries, new_entries, match, old_to_new, new_to_old)
+
+    changes: List[Change] = []
+    for old_index, entry in enumerate(old_entries):
+        new_index = old_to_new[old_index]
+        if new_index < 0:
+            changes.append(Change(DELETED, old=entry.node, details={"parent_id": _node_id(old_entries, entry.parent)}))
+            continue
+
+        new_entry = new_entries[new_index]
+        old_node, new_node = entry.node, new_entry.node
+        if entry.parent >= 0:
+            moved = old_to_new[entry.parent] != new_entry.parent
+        else:
+            moved = new_entry.parent >= 0 or entry.container != new_entry.container
+        if moved:
+            changes.append(
+                Change(
+                    MOVED,
+                    old=old_node,
+                    new=new_node,
+                    details={
+                        "old_parent_id": _node_id(old_entries, entry.parent),
+                        "new_parent_id": _node_id(new_entries, new_entry.parent),
+                    },
+                )
+            )
+        if old_node.title != new_node.title:
+            changes.append(Change(RETITLED, old=old_node, new=new_node, details={"old_title": old_node.title}))
+        annotations: Dict[str, Any] = {}
+        if (old_node.notes or None) != (new_node.notes or None):
+            annotations["old_notes"] = old_node.notes
+            annotations["new_notes"] = new_node.notes
+        if list(old_node.labels) != list(new_node.labels):
+            annotations["old_labels"] = list(old_node.labels)
+            annotations["new_labels"] = list(new_node.labels)
+        if annotations:
+            changes.append(Change(REANNOTATED, old=old_node, new=new_node, details=annotations))
+
+    for new_index, entry in enumerate(new_entries):
+        if new_to_old[new_index] < 0:
+            changes.append(Change(INSERTED, new=entry.node, details={"parent_id": _node_id(new_entries, entry.parent)}))
+
+    changes.extend(_diff_relations(old, new, old_entries, new_entries, old_to_new))
+    return ChangeSet(changes)
+
+
+def _match_by_heuristics(
+    old_entries: List[_Entry],
+    new_entries: List[_Entry],
+    match: Callable[[int, int], None],
+    old_to_new: List[int],
+    new_to_old: List[int],
+) -> None:
+    """Match nodes of maps without shared ids by titles and positions"""
+    # 1. Same path of titles, n-th occurrence matches n-th occurrence
+    new_by_path: Dict[int, List[int]] = defaultdict(list)
+    for new_index, entry in enumerate(new_entries):
+        new_by_path[entry.path].append(new_index)
+    for candidates in new_by_path.values():
+        candidates.reverse()
+    for old_index, entry in enumerate(old_entries):
+        candidates = new_by_path.get(entry.path)
+        if candidates:
+            match(old_index, candidates.pop())
+
+    def match_by_position() -> None:
+        """Match unmatched children sitting at the same position under matched parents"""
+        new_by_slot: Dict[Tuple[Any, str, int], int] = {}
+        for new_index, entry in enumerate(new_entries):
+            if new_to_old[new_index] < 0:
+                new_by_slot[(entry.parent if entry.parent >= 0 else None, entry.container, entry.position)] = new_index
+        # Entries are breadth-first, so parents are settled before their children
+        for old_index, entry in enumerate(old_entries):
+            if old_to_new[old_index] >= 0:
+                continue
+            if entry.parent >= 0:
+                parent = old_to_new[entry.parent]
+                if parent < 0:
+                    continue
+                slot: Tuple[Any, str, int] = (parent, entry.container, entry.position)
+            else:
+                slot = (None, entry.container, entry.position)
+            new_index = new_by_slot.pop(slot, -1)
+            if new_index >= 0:
+                match(old_index, new_index)
+
+    # 2. Same position under matched parents (retitled nodes)
+    match_by_position()
+
+    # 3. Title unique among the remaining nodes on both sides (moved nodes)
+    remaining_old: Dict[str, List[int]] = defaultdict(list)
+    remaining_new: Dict[str, List[int]] = defaultdict(list)
+    for old_index, entry in enumerate(old_entries):
+        if old_to_new[old_index] < 0:
+            remaining_old[entry.node.title].append(old_index)
+    for new_index, entry in enumerate(new_entries):
+        if new_to_old[new_index] < 0:
+            remaining_new[entry.node.title].append(new_index)
+    moved = 0
+    for title, old_indexes in remaining_old.items():
+        new_indexes = remaining_new.get(title)
+        if len(old_indexes) == 1 and new_indexes and len(new_indexes) == 1:
+            match(old_indexes[0], new_indexes[0])
+            moved += 1
+
+    # 4. Children of moved nodes
+    if moved:
+        match_by_position()
+
+
+def _diff_relations(
+    old: MindMap,
+    new: MindMap,
+    old_entries: List[_Entry],
+    new_entries: List[_Entry],
+    old_to_new: List[int],
+) -> List[Change]:
+    """Match relations by id, then by matched endpoints"""
+    id_map = {
+        entry.node.id: new_entries[old_to_new[index]].node.id
+        for index, entry in enumerate(old_entries)
+        if old_to_new[index] >= 0
+    }
+
+    def endpoints(relation: Relation) -> Tuple[str, str]:
+        return id_map.get(relation.source_id, relation.source_id), id_map.get(relation.target_id, relation.target_id)
+
+    new_by_id = {relation.id: relation for relation in new.relations}
+    new_by_endpoints: Dict[Tuple[str, str], List[Relation]] = defaultdict(list)
+    for relation in reversed(new.relations):
+        new_by_endpoints[(relation.source_id, relation.target_id)].append(relation)
+
+    changes: List[Change] = []
+    matched = set()
+    for relation in old.relations:
+        counterpart = new_by_id.get(relation.id)
+        if counterpart is None or id(counterpart) in matched:
+            candidates = new_by_endpoints.get(endpoints(relation), [])
+            while candidates and id(candidates[-1]) in matched:
+                candidates.pop()
+            counterpart = candidates.pop() if candidates else None
+        if counterpart is None:
+            changes.append(Change(RELATION_REMOVED, old=relation))
+            continue
+
+        matched.add(id(counterpart))
+        details: Dict[str, Any] = {}
+        if endpoints(relation) != (counterpart.source_id, counterpart.target_id):
+            details["old_endpoints"] = [relation.source_id, relation.target_id]
+            details["new_endpoints"] = [counterpart.source_id, counterpart.target_id]
+        if relation.title != counterpart.title:
+            details["old_title"] = relation.title
+        if details:
+            changes.append(Change(RELATION_CHANGED, old=relation, new=counterpart, details=details))
+
+    for relation in new.relations:
+        if id(relation) not in matched:
+            changes.append(Change(RELATION_ADDED, new=relation))
+    return changes
@@ -13,6 +13,12 @@ class ParserError(XMindConverterError):
     pass
 
 
+class TopicNotFound(ParserError):
+    """Selected topic id not found exception"""
+
+    pass
+
+
 class ConverterError(XMindConverterError):
     """Conversion exception"""
 
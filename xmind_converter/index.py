@@ -0,0 +1,247 @@
+"""Inverted full-text index over node titles, notes and labels
+
+The index maps lowercase word tokens to the ids of the nodes containing
+them, so a keyword query costs in proportion to the matching postings
+instead of the size of the map. A sorted vocabulary answers prefix queries
+with a binary search.
+"""
+
+import bisect
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+from .models import MindMap, Node
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens
+
+    Args:
+        text: Text to split, None is treated as empty
+
+    Returns:
+        Tokens in order of appearance
+    """
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _node_tokens(node: Node) -> FrozenSet[str]:
+    """Get the distinct tokens of a node's title, notes and labels"""
+    tokens = set(tokenize(node.title))
+    tokens.update(tokenize(node.notes))
+    for label in node.labels:
+        tokens.update(tokenize(label))
+    return frozenset(tokens)
+
+
+class MindMapIndex:
+    """Inverted index from tokens to node ids
+
+    Queries are whitespace-separated terms that must all match (AND). A term
+    ending in "*" matches every token starting with it. Results are node ids
+    in the order the nodes were added, document order for a freshly built index.
+
+    Args:
+        mindmap: Mind map whose topic tree and detached trees are indexed (default: empty index)
+    """
+
+    def __init__(self, mindmap: Optional[MindMap] = None) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+        # Sorted on demand, for prefix queries; new tokens are appended until then
+        self._vocabulary: List[str] = []
+        self._vocabulary_sorted: bool = True
+        self._tokens: Dict[str, FrozenSet[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._nodes: Dict[str, Node] = {}
+        self._next_order: int = 0
+        if mindmap is not None:
+            if mindmap.topic_node:
+                self.add(mindmap.topic_node)
+            for node in mindmap.detached_nodes:
+                self.add(node)
+
+    def __len__(self) -> int:
+        """Number of indexed nodes"""
+        return len(self._tokens)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._tokens
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """Every indexed token in sorted order"""
+        return list(self._sorted_vocabulary())
+
+    def _sorted_vocabulary(self) -> List[str]:
+        if not self._vocabulary_sorted:
+            self._vocabulary.sort()
+            self._vocabulary_sorted = True
+        return self._vocabulary
+
+    def add(self, node: Node, recursive: bool = True) -> None:
+        """Index a node, replacing its previous entry
+
+        Args:
+            node: Node to index
+            recursive: Whether to index the node's descendants too
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._index(current.id, _node_tokens(current))
+            self._nodes[current.id] = current
+            if recursive:
+                stack.extend(reversed(current.children))
+
+    def update(self, node: Node) -> None:
+        """Re-index a node after its title, notes or labels changed"""
+        self.add(node, recursive=False)
+
+    def remove(self, node: Node, recursive: bool = True) -> None:
+        """Remove a node from the index
+
+        Args:
+            node: Node to remove
+            recursive: Whether to remove the node's descendants too
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self.remove_id(current.id)
+            if recursive:
+                stack.extend(current.children)
+
+    def remove_id(self, node_id: str) -> None:
+        """Remove a single node by id; unknown ids are ignored"""
+        tokens = self._tokens.pop(node_id, None)
+        if tokens is None:
+            return
+        del self._order[node_id]
+        self._nodes.pop(node_id, None)
+        for token in tokens:
+            postings = self._postings[token]
+            postings.discard(node_id)
+            if not postings:
+                del self._postings[token]
+                vocabulary = self._sorted_vocabulary()
+                del vocabulary[bisect.bisect_left(vocabulary, token)]
+
+    def _index(self, node_id: str, tokens: FrozenSet[str]) -> None:
+        previous = self._tokens.get(node_id)
+        if previous is not None:
+            order = self._order[node_id]
+            self.remove_id(node_id)
+            self._order[node_id] = order
+        else:
+            self._order[node_id] = self._next_order
+            self._next_order += 1
+        self._tokens[node_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {node_id}
+                self._vocabulary.append(token)
+                self._vocabulary_sorted = False
+            else:
+                postings.add(node_id)
+
+    def prefix(self, prefix: str) -> List[str]:
+        """Get the indexed tokens starting with a prefix, in sorted order"""
+        prefix = prefix.lower()
+        vocabulary = self._sorted_vocabulary()
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        return vocabulary[start:end]
+
+    def _term_ids(self, term: str) -> Set[str]:
+        """Get the ids matching one query term"""
+        if term.endswith("*"):
+            ids: Set[str] = set()
+            for token in self.prefix(term[:-1]):
+                ids |= self._postings[token]
+            return ids
+        return self._postings.get(term.lower(), set())
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Find the ids of nodes matching every term of a query
+
+        Args:
+            query: Whitespace-separated terms; a trailing "*" makes a term a prefix
+            limit: Maximum number of ids returned
+
+        Returns:
+            Matching node ids in insertion order
+        """
+        terms: List[str] = []
+        for word in query.split():
+            star = word.endswith("*")
+            tokens = tokenize(word)
+            if not tokens:
+                continue
+            # "foo-bar*" behaves like "foo bar*"
+            terms.extend(tokens[:-1])
+            terms.append(tokens[-1] + "*" if star else tokens[-1])
+        if not terms:
+            return []
+
+        candidates = sorted((self._term_ids(term) for term in terms), key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            if not result:
+                break
+            result &= ids
+        ordered = sorted(result, key=self._order.__getitem__)
+        return ordered if limit is None else ordered[:limit]
+
+    def search_nodes(self, query: str, limit: Optional[int] = None) -> List[Node]:
+        """Find the nodes matching every term of a query
+
+        Nodes are only available for entries added from Node objects in this
+        process, or attached with ``attach`` after ``from_dict``.
+        """
+        return [self._nodes[node_id] for node_id in self.search(query, limit) if node_id in self._nodes]
+
+    def attach(self, mindmap: MindMap) -> None:
+        """Resolve indexed ids to the nodes of a mind map, e.g. after from_dict"""
+        stack: List[Node] = [*mindmap.detached_nodes, *([mindmap.topic_node] if mindmap.topic_node else [])]
+        while stack:
+            node = stack.pop()
+            if node.id in self._tokens:
+                self._nodes[node.id] = node
+            stack.extend(node.children)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the index to a JSON-serializable dictionary
+
+        Only the tokens of each node are stored; postings are rebuilt on load.
+        """
+        ordered = sorted(self._tokens, key=self._order.__getitem__)
+        return {"version": 1, "nodes": [[node_id, sorted(self._tokens[node_id])] for node_id in ordered]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], mindmap: Optional[MindMap] = None) -> "MindMapIndex":
+        """Create an index from ``to_dict`` output
+
+        Args:
+            data: Serialized index
+            mindmap: Mind map to resolve node ids against for ``search_nodes``
+
+        Returns:
+            MindMapIndex object
+        """
+        if data.get("version") != 1:
+            raise ValueError(f"Unsupported index version: {data.get('version')}")
+        index = cls()
+        for node_id, tokens in data["nodes"]:
+            index._index(node_id, frozenset(tokens))
+        if mindmap is not None:
+            index.attach(mindmap)
+        return index
+
+    def __repr__(self) -> str:
+        return f"MindMapIndex(nodes={len(self._tokens)}, tokens={len(self._vocabulary)})"
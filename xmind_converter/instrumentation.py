@@ -0,0 +1,180 @@
+"""Per-stage timing instrumentation for parsers and converters"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Span:
+    """Timing record of one conversion stage, e.g. ``xmind.unzip`` or ``md.write``"""
+
+    def __init__(
+        self,
+        name: str,
+        duration: float = 0.0,
+        bytes_in: Optional[int] = None,
+        bytes_out: Optional[int] = None,
+        nodes: Optional[int] = None,
+    ) -> None:
+        self.name: str = name
+        self.duration: float = duration
+        self.bytes_in: Optional[int] = bytes_in
+        self.bytes_out: Optional[int] = bytes_out
+        self.nodes: Optional[int] = nodes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert span to a plain dictionary"""
+        return {
+            "name": self.name,
+            "duration": self.duration,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "nodes": self.nodes,
+        }
+
+    def __repr__(self) -> str:
+        """Detailed representation of span"""
+        return (
+            f"Span(name='{self.name}', duration={self.duration:.6f}, bytes_in={self.bytes_in}, "
+            f"bytes_out={self.bytes_out}, nodes={self.nodes})"
+        )
+
+
+class CallbackSink:
+    """Sink calling a function for every span"""
+
+    def __init__(self, callback: Callable[[Span], None]) -> None:
+        self.callback = callback
+
+    def emit(self, span: Span) -> None:
+        self.callback(span)
+
+
+class LoggingSink:
+    """Sink writing every span to a logger"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or logging.getLogger("xmind_converter.timings")
+        self.level = level
+
+    def emit(self, span: Span) -> None:
+        self.logger.log(
+            self.level,
+            "%s %.3fms bytes_in=%s bytes_out=%s nodes=%s",
+            span.name,
+            span.duration * 1000,
+            span.bytes_in,
+            span.bytes_out,
+            span.nodes,
+        )
+
+
+class CollectorSink:
+    """Sink keeping every span in memory"""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def emit(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        """Forget collected spans"""
+        self.spans.clear()
+
+    def total(self) -> float:
+        """Total duration of collected spans in seconds"""
+        return sum(span.duration for span in self.spans)
+
+    def summary(self) -> Dict[str, float]:
+        """Total duration per span name in seconds, in first-seen order"""
+        result: Dict[str, float] = {}
+        for span in self.spans:
+            result[span.name] = result.get(span.name, 0.0) + span.duration
+        return result
+
+
+class _ActiveSpan:
+    """Context manager timing a span and emitting it on exit"""
+
+    __slots__ = ("instrumentation", "span", "started")
+
+    def __init__(self, instrumentation: "Instrumentation", span: Span) -> None:
+        self.instrumentation = instrumentation
+        self.span = span
+        self.started = 0.0
+
+    def __enter__(self) -> Span:
+        self.started = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.span.duration = time.perf_counter() - self.started
+        self.instrumentation.emit(self.span)
+
+
+class Instrumentation:
+    """Dispatches stage spans to pluggable sinks"""
+
+    enabled = True
+
+    def __init__(self, *sinks: Any) -> None:
+        self.sinks: List[Any] = list(sinks)
+
+    def add_sink(self, sink: Any) -> None:
+        """Add a sink, any object with an ``emit(span)`` method"""
+        self.sinks.append(sink)
+
+    def span(self, name: str, bytes_in: Optional[int] = None) -> Any:
+        """Time a stage
+
+        Usage::
+
+            with instrumentation.span("md.write") as span:
+                span.bytes_out = f.write(data)
+        """
+        return _ActiveSpan(self, Span(name, bytes_in=bytes_in))
+
+    def emit(self, span: Span) -> None:
+        """Send a finished span to every sink"""
+        for sink in self.sinks:
+            sink.emit(span)
+
+
+class _NullSpan:
+    """Span stand-in whose attributes are discarded"""
+
+    bytes_in = bytes_out = nodes = None
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class _NullInstrumentation(Instrumentation):
+    """Disabled instrumentation: no timing, no allocation per span"""
+
+    enabled = False
+
+    def span(self, name: str, bytes_in: Optional[int] = None) -> Any:
+        return _NULL_SPAN
+
+    def emit(self, span: Span) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+NULL_INSTRUMENTATION = _NullInstrumentation()
+
+
+def count_nodes(*roots: Any) -> int:
+    """Count nodes of one or more trees without recursion"""
+    count = 0
+    stack = [root for root in roots if root is not None]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
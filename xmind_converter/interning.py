@@ -0,0 +1,44 @@
+"""Per-parse intern table for repeated titles and labels"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class InternTable:
+    """Deduplicates strings and label tuples within one parse
+
+    Parsers create one table per document, so nodes with equal titles or equal
+    label sets share one object instead of holding a copy each. The table is
+    dropped with the parser's local state, unlike ``sys.intern``.
+    """
+
+    __slots__ = ("_strings", "_labels")
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+        self._labels: Dict[Tuple[str, ...], Tuple[str, ...]] = {(): ()}
+
+    def string(self, value: str) -> str:
+        """Get the shared copy of a string"""
+        return self._strings.setdefault(value, value)
+
+    def labels(self, labels: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Get the shared tuple for a label sequence
+
+        Args:
+            labels: Labels in order, or None
+
+        Returns:
+            Tuple of interned labels, the same object for every equal sequence
+        """
+        if not labels:
+            return ()
+        key = tuple(labels)
+        shared = self._labels.get(key)
+        if shared is None:
+            shared = tuple([self.string(label) for label in key])
+            self._labels[shared] = shared
+        return shared
+
+    def __len__(self) -> int:
+        """Number of distinct strings"""
+        return len(self._strings)
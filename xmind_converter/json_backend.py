@@ -0,0 +1,150 @@
+"""Pluggable JSON codec used by the JSON and XMind parsers and converters
+
+The stdlib ``json`` module is always available. When ``orjson`` is installed
+it is picked up automatically; set the environment variable
+``XMIND_CONVERTER_JSON_BACKEND=stdlib`` or call ``set_backend("stdlib")`` to
+opt out.
+
+Every backend follows the stdlib contract: ``dumps(obj, indent)`` returns
+exactly what ``json.dumps(obj, ensure_ascii=False, indent=indent)`` returns for
+the documents this package writes (objects, arrays, strings, integers,
+booleans and null), and ``loads`` accepts ``str`` or UTF-8 ``bytes``.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Union
+
+
+class JSONBackend:
+    """JSON codec interface"""
+
+    name = "base"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a JSON document"""
+        raise NotImplementedError
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        """Encode an object like ``json.dumps(obj, ensure_ascii=False, indent=indent)``"""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibBackend(JSONBackend):
+    """Backend using the standard library ``json`` module"""
+
+    name = "stdlib"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=indent)
+
+
+class OrjsonBackend(JSONBackend):
+    """Backend using ``orjson``
+
+    orjson only pretty-prints with two-space indentation and has no compact
+    mode matching the stdlib separators, so other indents use the stdlib. Input
+    orjson rejects but the stdlib accepts (NaN, integers beyond 64 bits, lone
+    surrogates, a UTF-8 byte order mark) is handed to the stdlib as well, so
+    results and error messages never differ from the stdlib backend.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            return json.loads(data)
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        if indent == 2:
+            try:
+                return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2).decode("utf-8")
+            except (self._orjson.JSONEncodeError, TypeError):
+                pass
+        return json.dumps(obj, ensure_ascii=False, indent=indent)
+
+
+_BACKEND_CLASSES: Dict[str, type] = {"stdlib": StdlibBackend, "orjson": OrjsonBackend}
+_backend: Optional[JSONBackend] = None
+
+
+def available_backends() -> List[str]:
+    """Get names of the backends that can be used in this environment"""
+    names = []
+    for name, backend_class in _BACKEND_CLASSES.items():
+        try:
+            backend_class()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _default_backend() -> JSONBackend:
+    requested = os.environ.get("XMIND_CONVERTER_JSON_BACKEND")
+    if requested:
+        return _create(requested)
+    try:
+        return OrjsonBackend()
+    except ImportError:
+        return StdlibBackend()
+
+
+def _create(name: str) -> JSONBackend:
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown JSON backend: {name}, supported: {', '.join(_BACKEND_CLASSES)}")
+    return _BACKEND_CLASSES[name]()
+
+
+def get_backend() -> JSONBackend:
+    """Get the active backend, choosing the fastest installed one on first use"""
+    global _backend
+    if _backend is None:
+        _backend = _default_backend()
+    return _backend
+
+
+def set_backend(backend: Union[str, JSONBackend, None]) -> JSONBackend:
+    """Select the backend used by every parser and converter
+
+    Args:
+        backend: Backend name ("stdlib", "orjson"), a JSONBackend instance, or None for the default
+
+    Returns:
+        The active backend
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the backend's library is not installed
+    """
+    global _backend
+    if backend is None:
+        _backend = _default_backend()
+    elif isinstance(backend, str):
+        _backend = _create(backend)
+    else:
+        _backend = backend
+    return _backend
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document with the active backend"""
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    """Encode an object with the active backend"""
+    return get_backend().dumps(obj, indent)
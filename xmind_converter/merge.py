@@ -0,0 +1,218 @@
+"""Merge many mind maps into one
+
+Two strategies are supported:
+
+    graft   Every map's topic tree becomes a child of a new root topic
+    unify   Trees are overlaid by their paths of titles: nodes with the same
+            title under the same parent become one node
+
+Identical subtrees are recognised by their cached content hashes (see
+Node.content_hash). Grafted duplicates and unified subtrees that already
+exist are skipped without walking them twice, and relation endpoints are
+remapped through one id table per map. Everything runs in time linear in
+the total number of nodes and relations.
+"""
+
+import itertools
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+from .models import DetachedNode, MindMap, Node, Relation, TopicNode, subtree_digest
+
+GRAFT = "graft"
+UNIFY = "unify"
+STRATEGIES = (GRAFT, UNIFY)
+
+
+class _Merger:
+    """State shared while merging a sequence of maps"""
+
+    def __init__(self, dedupe: bool) -> None:
+        self.dedupe = dedupe
+        self.node_ids: Set[str] = set()
+        # Fresh ids for colliding nodes: one random prefix per merge and a counter, far cheaper than uuid4 per node
+        self._id_prefix = uuid.uuid4().hex[:12]
+        self._id_counter = itertools.count(1)
+        self.relation_ids: Set[str] = set()
+        self.relation_keys: Set[Tuple[str, str, str]] = set()
+        self.relations: List[Relation] = []
+        # Children of merged nodes by title, built on first unify into the node
+        self.children_by_title: Dict[int, Dict[str, Node]] = {}
+
+    def new_id(self, node_id: str) -> str:
+        """Reserve a node id, replacing it with a fresh one if taken"""
+        while node_id in self.node_ids:
+            node_id = f"{self._id_prefix}-{next(self._id_counter)}"
+        self.node_ids.add(node_id)
+        return node_id
+
+    def copy(self, root: Node, node_type: Type[Node], id_map: Dict[str, str]) -> Node:
+        """Copy a subtree, keeping ids unless they are already taken"""
+        copy = node_type(root.title, self.new_id(root.id), None, root.notes, root.labels)
+        id_map[root.id] = copy.id
+        node_ids = self.node_ids
+        stack: List[Tuple[Node, Node]] = [(root, copy)]
+        while stack:
+            source, target = stack.pop()
+            for child in source.children:
+                child_id = child.id
+                if child_id in node_ids:
+                    child_id = self.new_id(child_id)
+                else:
+                    node_ids.add(child_id)
+                child_copy = Node(child.title, child_id, None, child.notes, child.labels)
+                id_map[child.id] = child_id
+                target.children.append(child_copy)
+                if child.children:
+                    stack.append((child, child_copy))
+        return copy
+
+    @staticmethod
+    def alias(source: Node, target: Node, id_map: Dict[str, str]) -> None:
+        """Map the ids of a subtree to an identical merged subtree"""
+        stack: List[Tuple[Node, Node]] = [(source, target)]
+        while stack:
+            source, target = stack.pop()
+            id_map[source.id] = target.id
+            stack.extend(zip(source.children, target.children))
+
+    def add_trees(
+        self,
+        targets: List[Node],
+        sources: Iterable[Node],
+        node_type: Type[Node],
+        id_map: Dict[str, str],
+        seen: Dict[bytes, Node],
+    ) -> None:
+        """Graft source trees onto a list, skipping trees already grafted"""
+        for source in sources:
+            if not self.dedupe:
+                targets.append(self.copy(source, node_type, id_map))
+                continue
+            digest = subtree_digest(source)
+            existing = seen.get(digest)
+            if existing is not None:
+                self.alias(source, existing, id_map)
+                continue
+            copy = self.copy(source, node_type, id_map)
+            seen[digest] = copy
+            targets.append(copy)
+
+    def _titles(self, node: Node) -> Dict[str, Node]:
+        by_title = self.children_by_title.get(id(node))
+        if by_title is None:
+            by_title = {}
+            for child in node.children:
+                by_title.setdefault(child.title, child)
+            self.children_by_title[id(node)] = by_title
+        return by_title
+
+    def unify(self, target: Node, source: Node, id_map: Dict[str, str]) -> None:
+        """Overlay a source subtree onto a merged node with the same title"""
+        stack: List[Tuple[Node, Node]] = [(target, source)]
+        while stack:
+            target, source = stack.pop()
+            # Only subtrees edited by earlier merges are rehashed
+            if self.dedupe and subtree_digest(target) == subtree_digest(source):
+                self.alias(source, target, id_map)
+                continue
+            id_map[source.id] = target.id
+            if not target.notes and source.notes:
+                target.notes = source.notes
+            for label in source.labels:
+                target.add_label(label)
+
+            by_title = self._titles(target)
+            for child in source.children:
+                match = by_title.get(child.title)
+                if match is None:
+                    copy = self.copy(child, Node, id_map)
+                    target.add_child(copy)
+                    by_title[child.title] = copy
+                else:
+                    stack.append((match, child))
+
+    def add_relations(self, relations: Iterable[Relation], id_map: Dict[str, str]) -> None:
+        """Remap relation endpoints to merged ids, dropping duplicates"""
+        for relation in relations:
+            source_id = id_map.get(relation.source_id, relation.source_id)
+            target_id = id_map.get(relation.target_id, relation.target_id)
+            key = (source_id, target_id, relation.title)
+            if self.dedupe and key in self.relation_keys:
+                continue
+            self.relation_keys.add(key)
+            relation_id = relation.id
+            if relation_id in self.relation_ids:
+                relation_id = str(uuid.uuid4())
+            self.relation_ids.add(relation_id)
+            self.relations.append(Relation(source_id, target_id, relation_id, relation.title))
+
+
+def merge(
+    maps: Iterable[MindMap],
+    strategy: str = GRAFT,
+    title: Optional[str] = None,
+    root_title: Optional[str] = None,
+    dedupe: bool = True,
+) -> MindMap:
+    """Merge mind maps into a new mind map
+
+    Input maps are not modified and may be produced lazily, e.g. by a generator
+    loading one file at a time. Node and relation ids are kept unless they
+    collide with an id already in the result, in which case a new id is
+    assigned and relations are remapped.
+
+    Args:
+        maps: Mind maps to merge, in order
+        strategy: GRAFT to place each topic tree under a new root, UNIFY to overlay trees by title paths
+        title: Title of the merged map (default: "Merged")
+        root_title: Title of the new root topic (default: the merged map title). With UNIFY a new
+            root is only created when the maps' root titles differ
+        dedupe: Whether to skip grafted subtrees and relations identical to ones already merged
+
+    Returns:
+        Merged MindMap
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown merge strategy: {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+    return _merge(maps, strategy, title or "Merged", root_title, dedupe)
+
+
+def _merge(maps: Iterable[MindMap], strategy: str, title: str, root_title: Optional[str], dedupe: bool) -> MindMap:
+    merger = _Merger(dedupe)
+    topics: List[Node] = []
+    detached: List[Node] = []
+    grafted: Dict[bytes, Node] = {}
+    grafted_detached: Dict[bytes, Node] = {}
+    topics_by_title: Dict[str, Node] = {}
+    detached_by_title: Dict[str, Node] = {}
+
+    for mindmap in maps:
+        id_map: Dict[str, str] = {}
+        if strategy == GRAFT:
+            if mindmap.topic_node is not None:
+                merger.add_trees(topics, [mindmap.topic_node], Node, id_map, grafted)
+            merger.add_trees(detached, mindmap.detached_nodes, DetachedNode, id_map, grafted_detached)
+        else:
+            pairs = [(mindmap.topic_node, topics, topics_by_title, Node)] if mindmap.topic_node else []
+            pairs.extend((node, detached, detached_by_title, DetachedNode) for node in mindmap.detached_nodes)
+            for source, targets, by_title, node_type in pairs:
+                match = by_title.get(source.title)
+                if match is None:
+                    copy = merger.copy(source, node_type, id_map)
+                    targets.append(copy)
+                    by_title[source.title] = copy
+                else:
+                    merger.unify(match, source, id_map)
+
+        merger.add_relations(mindmap.relations, id_map)
+
+    if strategy == UNIFY and len(topics) == 1:
+        only = topics[0]
+        topic_node = TopicNode(only.title, only.id, only.children, only.notes, only.labels)
+    else:
+        root_id = merger.new_id(str(uuid.uuid4()))
+        topic_node = TopicNode(root_title or title, root_id, topics)
+    return MindMap(title, topic_node, detached, merger.relations)  # type: ignore[arg-type]
@@ -1,11 +1,37 @@
 """Data models"""
 
+import hashlib
 import uuid
-from typing import List, Optional, Callable, Dict, Any
+import weakref
+from array import array
+from typing import List, Optional, Callable, Dict, Any, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .relations import DanglingEndpoint, RelationIndex
+    from .stats import MindMapStats
+
+# Marks arguments of replace() and evolve() that were not given, since None is a valid value
+_UNSET: Any = object()
 
 
 class Node:
-    """Base node class for mind map"""
+    """Base node class for mind map
+
+    Content hashes are cached per node and cleared along the ancestor path
+    when the id, title, notes, labels or children change through this class.
+    Parent links are only recorded while hashing, so parsed trees that are
+    never hashed hold no back references; after editing a children list
+    directly, call invalidate_hash() on its owner. A node shared
+    by several trees (see replace) links to every parent, so an edit clears
+    the hashes of all of them.
+    """
+
+    # Class-level defaults, so nodes that are never hashed carry no extra attributes
+    _parent: Optional["Node"] = None
+    # Further parents of a node shared between trees; weak, so old versions of a tree can be freed
+    _shared_parents: Optional["weakref.WeakSet[Node]"] = None
+    _digest: Optional[bytes] = None
+    _id_digest: Optional[bytes] = None
 
     def __init__(
         self,
@@ -13,32 +39,227 @@ class Node:
         node_id: Optional[str] = None,
         children: Optional[List["Node"]] = None,
         notes: Optional[str] = None,
-        labels: Optional[List[str]] = None,
+        labels: Optional[Sequence[str]] = None,
     ) -> None:
-        self.id: str = node_id or str(uuid.uuid4())
-        self.title: str = title
+        self._id: str = node_id or str(uuid.uuid4())
+        self._title: str = title
         self.children: List["Node"] = children or []
-        self.notes: Optional[str] = notes
-        self.labels: List[str] = labels or []
+        self._notes: Optional[str] = notes
+        # Immutable, so parsers can share one interned tuple between nodes
+        self._labels: Tuple[str, ...] = tuple(labels) if labels else ()
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = value
+        self.invalidate_hash()
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._title = value
+        self.invalidate_hash()
+
+    @property
+    def notes(self) -> Optional[str]:
+        return self._notes
+
+    @notes.setter
+    def notes(self, value: Optional[str]) -> None:
+        self._notes = value
+        self.invalidate_hash()
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        return self._labels
+
+    @labels.setter
+    def labels(self, value: Sequence[str]) -> None:
+        self._labels = tuple(value)
+        self.invalidate_hash()
 
     def add_child(self, child: "Node") -> None:
         """Add child node"""
         self.children.append(child)
+        # Hashing links the child when this node is hashed again
+        if self._digest is not None or self._id_digest is not None:
+            self.invalidate_hash()
 
     def remove_child(self, child: "Node") -> None:
         """Remove child node"""
         if child in self.children:
             self.children.remove(child)
+            if child._parent is self:
+                child._parent = None
+            elif child._shared_parents is not None:
+                child._shared_parents.discard(self)
+            self.invalidate_hash()
 
     def add_label(self, label: str) -> None:
         """Add label"""
         if label not in self.labels:
-            self.labels.append(label)
+            self.labels = self.labels + (label,)
 
     def remove_label(self, label: str) -> None:
         """Remove label"""
         if label in self.labels:
-            self.labels.remove(label)
+            index = self.labels.index(label)
+            self.labels = self.labels[:index] + self.labels[index + 1 :]
+
+    def replace(
+        self,
+        *,
+        node_id: str = _UNSET,
+        title: str = _UNSET,
+        children: List["Node"] = _UNSET,
+        notes: Optional[str] = _UNSET,
+        labels: Sequence[str] = _UNSET,
+    ) -> "Node":
+        """Get a copy of this node with some fields replaced
+
+        Only this node is copied: the copy's children list holds the same child
+        objects unless ``children`` is given, so the copy shares every subtree
+        with the original. Shared subtrees must be treated as immutable and
+        changed with replace as well (copy-on-write); editing a shared node in
+        place changes every tree that holds it, and clears the cached hashes
+        of all of them. Attributes added by subclasses are copied as they are;
+        cached hashes carry over when they are still valid.
+
+        Returns:
+            Node of the same class
+        """
+        node = self._copy_fields()
+        if node_id is not _UNSET:
+            node._id = node_id
+        if title is not _UNSET:
+            node._title = title
+        node.children = list(self.children if children is _UNSET else children)
+        if notes is not _UNSET:
+            node._notes = notes
+        if labels is not _UNSET:
+            node._labels = tuple(labels) if labels else ()
+        if title is _UNSET and notes is _UNSET and labels is _UNSET and children is _UNSET:
+            node._digest = self._digest
+            if node_id is _UNSET:
+                node._id_digest = self._id_digest
+            if node._digest is not None or node._id_digest is not None:
+                # The copy now caches hashes of the shared children, so their edits must reach it
+                for child in node.children:
+                    _link_parent(child, node)
+        return node
+
+    def transform(self, function: Callable[["Node"], Optional["Node"]]) -> Optional["Node"]:
+        """Rebuild the subtree bottom-up, sharing every unchanged subtree
+
+        ``function`` is called once per node, children first, with the node
+        whose children have already been transformed. It returns the node
+        unchanged, a replacement (usually ``node.replace(...)``) or None to drop
+        the node with its subtree. A node is copied only when the function
+        replaces it or one of its children changed, so a transformation that
+        touches few nodes allocates little, however large the tree. Runs
+        without recursion.
+
+        Args:
+            function: Called with each node, returns the node to keep in its place or None
+
+        Returns:
+            Root of the transformed subtree, None if the root was dropped
+        """
+        # Frames of the nodes being rebuilt: node, index of the next child, transformed children
+        frames: List[list] = [[self, 0, []]]
+        while True:
+            frame = frames[-1]
+            node, index, done = frame
+            children = node.children
+            if index < len(children):
+                frame[1] = index + 1
+                child = children[index]
+                if child.children:
+                    frames.append([child, 0, []])
+                else:
+                    result = function(child)
+                    if result is not None:
+                        done.append(result)
+                continue
+
+            frames.pop()
+            if len(done) != len(children) or any(new is not old for new, old in zip(done, children)):
+                node = node.replace(children=done)
+            result = function(node)
+            if not frames:
+                return result
+            if result is not None:
+                frames[-1][2].append(result)
+
+    def content_hash(self, include_ids: bool = False) -> str:
+        """Get a hash of the subtree's titles, notes, labels and structure
+
+        Two subtrees have the same hash exactly when their content is equal
+        (up to hash collisions of a 128-bit BLAKE2b digest). Hashes are stable
+        across processes, so they can be stored to detect changes later.
+
+        Args:
+            include_ids: Whether node ids are part of the content
+
+        Returns:
+            Hex digest
+        """
+        return subtree_digest(self, include_ids).hex()
+
+    def content_equals(self, other: "Node", include_ids: bool = False) -> bool:
+        """Check whether two subtrees have the same content, see content_hash"""
+        return subtree_digest(self, include_ids) == subtree_digest(other, include_ids)
+
+    def invalidate_hash(self) -> None:
+        """Clear the cached content hashes of this node and its ancestors in every tree holding it"""
+        stack: List[Node] = [self]
+        while stack:
+            node = stack.pop()
+            if node._digest is None and node._id_digest is None:
+                continue
+            node._digest = None
+            node._id_digest = None
+            if node._parent is not None:
+                stack.append(node._parent)
+            if node._shared_parents:
+                stack.extend(node._shared_parents)
+
+    def _copy_fields(self) -> "Node":
+        """Create a node of the same class with this node's attributes, without parent links and cached hashes"""
+        node = type(self).__new__(type(self))
+        state = self.__getstate__()
+        if isinstance(state, tuple):
+            state, slots = state
+            for name, value in slots.items():
+                setattr(node, name, value)
+        node.__dict__.update(state)
+        return node
+
+    def __copy__(self) -> "Node":
+        # Shallow: a new node holding the same children in a list of its own
+        node = self._copy_fields()
+        if "children" in node.__dict__:
+            node.children = list(node.children)
+        return node
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The subtree is pickled, and deep-copied, as flat arrays; see _pack_trees
+        return _rebuild_node, (_pack_trees([self]),)
+
+    def __getstate__(self) -> Any:
+        # Used by subclasses that opt out of __reduce__, e.g. query views, and by copy.copy.
+        # Parent links would drag the whole tree into a pickled subtree, and caches are only valid with them
+        state = self.__dict__.copy()
+        for key in ("_parent", "_shared_parents", "_digest", "_id_digest"):
+            state.pop(key, None)
+        slots = {name: getattr(self, name) for name in getattr(type(self), "__slots__", ()) if hasattr(self, name)}
+        return (state, slots) if slots else state
 
     def __str__(self) -> str:
         """String representation of node"""
@@ -46,7 +267,241 @@ class Node:
 
     def __repr__(self) -> str:
         """Detailed representation of node"""
-        return f"Node(id='{self.id}', title='{self.title}', children={len(self.children)}, notes={self.notes is not None}, labels={self.labels})"
+        return f"Node(id='{self.id}', title='{self.title}', children={len(self.children)}, notes={self.notes is not None}, labels={list(self.labels)})"
+
+
+def _link_parent(child: Node, parent: Node) -> None:
+    """Record a parent of a node for hash invalidation"""
+    current = child._parent
+    if current is None:
+        child._parent = parent
+    elif current is not parent:
+        if child._shared_parents is None:
+            child._shared_parents = weakref.WeakSet()
+        child._shared_parents.add(parent)
+
+
+def subtree_digest(root: Node, include_ids: bool = False) -> bytes:
+    """Get the raw content digest behind Node.content_hash
+
+    Missing digests are computed in one post-order pass that reuses the
+    cached digests of unchanged subtrees and records parent links for
+    invalidation.
+
+    Args:
+        root: Root of the subtree
+        include_ids: Whether node ids are part of the content
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    digest = root._id_digest if include_ids else root._digest
+    if digest is not None:
+        return digest
+    return _hash_subtree(root, include_ids)
+
+
+def _hash_subtree(root: Node, include_ids: bool) -> bytes:
+    # Breadth-first order reversed visits children before their parent
+    order: List[Node] = [root]
+    for node in order:
+        for child in node.children:
+            if child._parent is not node:
+                _link_parent(child, node)
+            if (child._id_digest if include_ids else child._digest) is None:
+                order.append(child)
+
+    blake2b = hashlib.blake2b
+    for node in reversed(order):
+        # repr() keeps field boundaries unambiguous; None and empty notes are the same content
+        children = node.children
+        if include_ids:
+            fields = repr((node.id, node.title, node.notes or None, node.labels)).encode("utf-8", "surrogatepass")
+            if children:
+                fields += b"".join([child._id_digest for child in children])  # type: ignore[misc]
+            node._id_digest = blake2b(fields, digest_size=16).digest()
+        else:
+            fields = repr((node.title, node.notes or None, node.labels)).encode("utf-8", "surrogatepass")
+            if children:
+                fields += b"".join([child._digest for child in children])  # type: ignore[misc]
+            node._digest = blake2b(fields, digest_size=16).digest()
+    return root._id_digest if include_ids else root._digest  # type: ignore[return-value]
+
+
+def _find_path(root: Node, node_id: str) -> Optional[List[Node]]:
+    """Get the nodes from root to the node with an id, None if it is not in the subtree"""
+    path: List[Node] = []
+    stack: List[Tuple[Node, int]] = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        del path[depth:]
+        path.append(node)
+        if node.id == node_id:
+            return path
+        stack.extend((child, depth + 1) for child in reversed(node.children))
+    return None
+
+
+# Attributes every node has, and per-node caches that are never pickled
+_NODE_FIELDS = frozenset(
+    ("_id", "_title", "children", "_notes", "_labels", "_parent", "_shared_parents", "_digest", "_id_digest")
+)
+
+# Trees packed for pickling, per node in pre-order: ids, titles, depths (0 for roots), class
+# indexes and label indexes (0 for no labels, else 1 + the index in the table of distinct label
+# tuples), then the notes and the attributes added by subclasses of the nodes having any, and
+# the positions holding a node already packed, with the index of its first occurrence.
+# Label tuples are indexed rather than stored per node: unpickling many tuples would trigger
+# garbage collections.
+_PackedTrees = Tuple[
+    Any,
+    Any,
+    array,
+    bytes,
+    Tuple[type, ...],
+    array,
+    Tuple[Tuple[str, ...], ...],
+    Dict[int, str],
+    Dict[int, Dict[str, Any]],
+    Dict[int, int],
+]
+
+_SEPARATOR = "\x00"
+
+
+def _join_strings(strings: List[str]) -> Any:
+    """Join strings with NUL if none contains it, which pickles far smaller than a list"""
+    text = _SEPARATOR.join(strings)
+    return text if strings and text.count(_SEPARATOR) == len(strings) - 1 else strings
+
+
+def _split_strings(packed: Any) -> List[str]:
+    """Undo _join_strings"""
+    return packed.split(_SEPARATOR) if isinstance(packed, str) else packed
+
+
+def _int_array(values: List[int]) -> array:
+    """Store non-negative integers in the smallest array type that holds them"""
+    high = max(values, default=0)
+    for typecode in ("B", "H", "I"):
+        if high < 1 << (8 * array(typecode).itemsize):
+            return array(typecode, values)
+    return array("Q", values)
+
+
+def _pack_trees(roots: Sequence[Node]) -> _PackedTrees:
+    """Flatten trees into arrays and joined strings, without recursion
+
+    Subtrees shared between the trees, see Node.replace, are stored once; later
+    occurrences refer back to the first, so they unpickle as the same objects.
+    """
+    ids: List[str] = []
+    titles: List[str] = []
+    depths: List[int] = []
+    classes: Dict[type, int] = {}
+    class_ids = bytearray()
+    label_ids: List[int] = []
+    label_tuples: Dict[Tuple[str, ...], int] = {}
+    notes: Dict[int, str] = {}
+    extras: Dict[int, Dict[str, Any]] = {}
+    shared: Dict[int, int] = {}
+    packed_at: Dict[int, int] = {}
+
+    stack: List[Tuple[Node, int]] = [(root, 0) for root in reversed(roots)]
+    while stack:
+        node, depth = stack.pop()
+        index = len(ids)
+        first = packed_at.setdefault(id(node), index)
+        if first != index:
+            # Placeholders keep the arrays aligned; the subtree was stored at its first occurrence
+            shared[index] = first
+            ids.append("")
+            titles.append("")
+            depths.append(depth)
+            class_ids.append(0)
+            label_ids.append(0)
+            continue
+        ids.append(node.id)
+        titles.append(node.title)
+        depths.append(depth)
+        node_class = type(node)
+        class_index = classes.get(node_class)
+        if class_index is None:
+            class_index = classes[node_class] = len(classes)
+        class_ids.append(class_index)
+        labels = node.labels
+        if labels:
+            label_index = label_tuples.get(labels)
+            if label_index is None:
+                label_index = label_tuples[labels] = len(label_tuples) + 1
+            label_ids.append(label_index)
+        else:
+            label_ids.append(0)
+        if node.notes is not None:
+            notes[index] = node.notes
+        state = node.__dict__
+        if len(state) > 5 and not state.keys() <= _NODE_FIELDS:
+            extras[index] = {key: value for key, value in state.items() if key not in _NODE_FIELDS}
+        children = node.children
+        if children:
+            stack += [(child, depth + 1) for child in reversed(children)]
+
+    return (
+        _join_strings(ids),
+        _join_strings(titles),
+        _int_array(depths),
+        bytes(class_ids),
+        tuple(classes),
+        _int_array(label_ids),
+        tuple(label_tuples),
+        notes,
+        extras,
+        shared,
+    )
+
+
+def _unpack_trees(packed: _PackedTrees) -> List[Node]:
+    """Rebuild the trees flattened by _pack_trees and return their roots"""
+    packed_ids, packed_titles, depths, class_ids, classes, label_ids, label_tuples, notes, extras, shared = packed
+    labels_by_id = ((), *label_tuples)
+    ids = _split_strings(packed_ids)
+    titles = _split_strings(packed_titles)
+    nodes: List[Node] = []
+    roots: List[Node] = []
+    # Last node seen at each depth: the parent of the next node one level deeper
+    path: List[Node] = []
+    for index, depth in enumerate(depths):
+        if shared and index in shared:
+            node = nodes[shared[index]]
+        else:
+            node_class = classes[class_ids[index]]
+            node = node_class.__new__(node_class)
+            node.__dict__ = {
+                "_id": ids[index],
+                "_title": titles[index],
+                "children": [],
+                "_notes": None,
+                "_labels": labels_by_id[label_ids[index]],
+            }
+        nodes.append(node)
+        if depth:
+            path[depth - 1].children.append(node)
+        else:
+            roots.append(node)
+        if depth < len(path):
+            path[depth] = node
+        else:
+            path.append(node)
+    for index, text in notes.items():
+        nodes[index]._notes = text
+    for index, state in extras.items():
+        nodes[index].__dict__.update(state)
+    return roots
+
+
+def _rebuild_node(packed: _PackedTrees) -> Node:
+    """Unpickle a node pickled by Node.__reduce__"""
+    return _unpack_trees(packed)[0]
 
 
 class TopicNode(Node):
@@ -58,7 +513,7 @@ class TopicNode(Node):
         node_id: Optional[str] = None,
         children: Optional[List[Node]] = None,
         notes: Optional[str] = None,
-        labels: Optional[List[str]] = None,
+        labels: Optional[Sequence[str]] = None,
     ) -> None:
         super().__init__(title, node_id, children, notes, labels)
 
@@ -89,7 +544,7 @@ class TopicNode(Node):
 
     def __repr__(self) -> str:
         """Detailed representation of topic node"""
-        return f"TopicNode(id='{self.id}', title='{self.title}', children={len(self.children)}, depth={self.get_depth()}, notes={self.notes is not None}, labels={self.labels})"
+        return f"TopicNode(id='{self.id}', title='{self.title}', children={len(self.children)}, depth={self.get_depth()}, notes={self.notes is not None}, labels={list(self.labels)})"
 
     def print_tree(self, indent: int = 0, prefix: str = "") -> None:
         """Print node tree structure"""
@@ -97,7 +552,7 @@ class TopicNode(Node):
         if self.notes:
             print(f"{'  ' * indent}  notes: {self.notes}")
         if self.labels:
-            print(f"{'  ' * indent}  labels: {self.labels}")
+            print(f"{'  ' * indent}  labels: {list(self.labels)}")
         for i, child in enumerate(self.children):
             is_last = i == len(self.children) - 1
             child_prefix = "└── " if is_last else "├── "
@@ -108,7 +563,7 @@ class TopicNode(Node):
                 if child.notes:
                     print(f"{'  ' * (indent + 1)}    notes: {child.notes}")
                 if child.labels:
-                    print(f"{'  ' * (indent + 1)}    labels: {child.labels}")
+                    print(f"{'  ' * (indent + 1)}    labels: {list(child.labels)}")
 
 
 class DetachedNode(Node):
@@ -120,7 +575,7 @@ class DetachedNode(Node):
         node_id: Optional[str] = None,
         children: Optional[List[Node]] = None,
         notes: Optional[str] = None,
-        labels: Optional[List[str]] = None,
+        labels: Optional[Sequence[str]] = None,
     ) -> None:
         super().__init__(title, node_id, children, notes, labels)
 
@@ -130,7 +585,7 @@ class DetachedNode(Node):
 
     def __repr__(self) -> str:
         """Detailed representation of detached node"""
-        return f"DetachedNode(id='{self.id}', title='{self.title}', children={len(self.children)}, notes={self.notes is not None}, labels={self.labels})"
+        return f"DetachedNode(id='{self.id}', title='{self.title}', children={len(self.children)}, notes={self.notes is not None}, labels={list(self.labels)})"
 
 
 class Relation:
@@ -158,7 +613,12 @@ class Relation:
 
 
 class MindMap:
-    """Mind map with topic node, detached nodes and relations"""
+    """Mind map with topic node, detached nodes and relations
+
+    The relation index is kept in sync by add_relation and remove_relation and
+    rebuilt when relations is replaced by another list; after editing the
+    relations list in place, call invalidate_relation_index().
+    """
 
     def __init__(
         self,
@@ -171,6 +631,10 @@ class MindMap:
         self.topic_node: Optional[TopicNode] = topic_node
         self.detached_nodes: List[DetachedNode] = detached_nodes or []
         self.relations: List[Relation] = relations or []
+        # Built on first use; add_relation/remove_relation keep it in sync
+        self._relation_index: Optional["RelationIndex"] = None
+        # The relations list the index was built from
+        self._relation_index_state: Optional[List[Relation]] = None
 
     def get_depth(self) -> int:
         """Get mind map depth"""
@@ -188,6 +652,12 @@ class MindMap:
         if self.topic_node:
             self.topic_node.traverse(callback)
 
+    def stats(self) -> "MindMapStats":
+        """Get node count, depth histogram, fan-out, text sizes, label counts and relation health"""
+        from .stats import collect_stats
+
+        return collect_stats(self)
+
     def add_detached_node(self, node: DetachedNode) -> None:
         """Add detached node"""
         self.detached_nodes.append(node)
@@ -199,12 +669,198 @@ class MindMap:
 
     def add_relation(self, relation: Relation) -> None:
         """Add relation"""
+        index = self._current_relation_index()
         self.relations.append(relation)
+        if index is not None:
+            index.add(relation)
 
     def remove_relation(self, relation: Relation) -> None:
         """Remove relation"""
         if relation in self.relations:
+            index = self._current_relation_index()
             self.relations.remove(relation)
+            if index is not None:
+                index.remove(relation)
+
+    def invalidate_relation_index(self) -> None:
+        """Drop the relation index after the relations list was edited in place"""
+        self._relation_index = None
+        self._relation_index_state = None
+
+    def _current_relation_index(self) -> Optional["RelationIndex"]:
+        """Get the relation index if it was built from the current relations list"""
+        if self._relation_index_state is not self.relations:
+            return None
+        return self._relation_index
+
+    @property
+    def relation_index(self) -> "RelationIndex":
+        """Get the outgoing/incoming relation index, rebuilt if relations was replaced or invalidated"""
+        index = self._current_relation_index()
+        if index is None:
+            from .relations import RelationIndex
+
+            index = RelationIndex(self.relations)
+            self._relation_index = index
+            self._relation_index_state = self.relations
+        return index
+
+    def relations_of(self, node_id: str) -> List[Relation]:
+        """Get the relations starting or ending at a node"""
+        return self.relation_index.relations_of(node_id)
+
+    def outgoing_relations(self, node_id: str) -> List[Relation]:
+        """Get the relations starting at a node"""
+        return self.relation_index.outgoing(node_id)
+
+    def incoming_relations(self, node_id: str) -> List[Relation]:
+        """Get the relations ending at a node"""
+        return self.relation_index.incoming(node_id)
+
+    def validate_relations(self) -> List["DanglingEndpoint"]:
+        """Find relation ends referencing missing nodes in O(nodes + relations)"""
+        from .relations import validate_relations
+
+        return validate_relations(self)
+
+    def evolve(
+        self,
+        *,
+        title: str = _UNSET,
+        topic_node: Optional[TopicNode] = _UNSET,
+        detached_nodes: List[DetachedNode] = _UNSET,
+        relations: List[Relation] = _UNSET,
+    ) -> "MindMap":
+        """Get a new mind map with some fields replaced, sharing everything else
+
+        Node trees and relations are shared, not copied; see Node.replace for
+        the copy-on-write rules.
+
+        Returns:
+            MindMap object
+        """
+        return MindMap(
+            self.title if title is _UNSET else title,
+            self.topic_node if topic_node is _UNSET else topic_node,
+            list(self.detached_nodes if detached_nodes is _UNSET else detached_nodes),
+            list(self.relations if relations is _UNSET else relations),
+        )
+
+    def replace_node(self, node_id: str, **changes: Any) -> "MindMap":
+        """Get a new mind map with one node's fields replaced
+
+        Only the node and its ancestors are copied; every other subtree is
+        shared with this map.
+
+        Args:
+            node_id: Id of the node to change
+            **changes: Fields to replace, as accepted by Node.replace
+
+        Returns:
+            MindMap object
+
+        Raises:
+            ValueError: If no node has the id
+        """
+        roots: List[Node] = [*([self.topic_node] if self.topic_node else []), *self.detached_nodes]
+        for root_index, root in enumerate(roots):
+            path = _find_path(root, node_id)
+            if path is None:
+                continue
+            node = path[-1].replace(**changes)
+            for depth in range(len(path) - 2, -1, -1):
+                parent = path[depth]
+                children = list(parent.children)
+                # Nodes compare by identity
+                children[children.index(path[depth + 1])] = node
+                node = parent.replace(children=children)
+            if root is self.topic_node:
+                return self.evolve(topic_node=node)  # type: ignore[arg-type]
+            detached = list(self.detached_nodes)
+            detached[root_index - (1 if self.topic_node else 0)] = node  # type: ignore[assignment]
+            return self.evolve(detached_nodes=detached)
+        raise ValueError(f"Node not found: {node_id}")
+
+    def transform(self, function: Callable[[Node], Optional[Node]]) -> "MindMap":
+        """Apply Node.transform to the topic tree and every detached tree
+
+        Relations are kept as they are; after dropping nodes, validate_relations
+        finds the relations left dangling.
+
+        Args:
+            function: Called with each node, returns the node to keep in its place or None
+
+        Returns:
+            MindMap object sharing every unchanged subtree with this one
+        """
+        topic_node = self.topic_node.transform(function) if self.topic_node else None
+        detached_nodes = [node.transform(function) for node in self.detached_nodes]
+        return self.evolve(
+            topic_node=topic_node,  # type: ignore[arg-type]
+            detached_nodes=[node for node in detached_nodes if node is not None],  # type: ignore[misc]
+        )
+
+    def content_hash(self, include_ids: bool = False) -> str:
+        """Get a hash of the title, trees and relations of the mind map
+
+        Node hashes are cached, so rehashing after an edit only rehashes the
+        edited path. Without ids, relation ends are identified by the content
+        hash of the node they point to.
+
+        Args:
+            include_ids: Whether node and relation ids are part of the content
+
+        Returns:
+            Hex digest
+        """
+        roots: List[Node] = [*([self.topic_node] if self.topic_node else []), *self.detached_nodes]
+        header = (self.title, self.topic_node is not None, len(self.detached_nodes), len(self.relations))
+        hasher = hashlib.blake2b(repr(header).encode("utf-8", "surrogatepass"), digest_size=16)
+        for root in roots:
+            hasher.update(subtree_digest(root, include_ids))
+
+        if self.relations:
+            if include_ids:
+                for relation in self.relations:
+                    fields = (relation.id, relation.source_id, relation.target_id, relation.title)
+                    hasher.update(repr(fields).encode("utf-8", "surrogatepass"))
+            else:
+                nodes: Dict[str, Node] = {}
+                stack = list(roots)
+                while stack:
+                    node = stack.pop()
+                    nodes.setdefault(node.id, node)
+                    stack.extend(node.children)
+
+                def end(node_id: str) -> Any:
+                    node = nodes.get(node_id)
+                    return subtree_digest(node) if node is not None else node_id
+
+                for relation in self.relations:
+                    fields = (end(relation.source_id), end(relation.target_id), relation.title)
+                    hasher.update(repr(fields).encode("utf-8", "surrogatepass"))
+        return hasher.hexdigest()
+
+    def content_equals(self, other: "MindMap", include_ids: bool = False) -> bool:
+        """Check whether two mind maps have the same content, see content_hash"""
+        return self.content_hash(include_ids) == other.content_hash(include_ids)
+
+    def __copy__(self) -> "MindMap":
+        # Shallow: the copy holds the same trees and relations list
+        mindmap = type(self).__new__(type(self))
+        mindmap.__dict__.update(self.__dict__)
+        return mindmap
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Trees and relations are pickled, and deep-copied, as flat arrays; the relation index is rebuilt on demand.
+        # The trees are packed as a unit, so nodes pickled in the same call outside of the map arrive as copies
+        roots: List[Node] = [*([self.topic_node] if self.topic_node else []), *self.detached_nodes]
+        relations: Any = self.relations
+        if all(type(relation) is Relation and len(relation.__dict__) == 4 for relation in relations):
+            relations = tuple((r.id, r.source_id, r.target_id, r.title) for r in relations)
+        state = {key: value for key, value in self.__dict__.items() if key not in _MINDMAP_FIELDS}
+        packed = _pack_trees(roots)
+        return _rebuild_mindmap, (type(self), self.title, self.topic_node is not None, packed, relations, state)
 
     def get_node_by_id(self, node_id: str) -> Optional[Node]:
         """Get node by id"""
@@ -260,3 +916,27 @@ class MindMap:
             print("\nRelations:")
             for relation in self.relations:
                 print(f"  - {relation}")
+
+
+_MINDMAP_FIELDS = frozenset(
+    ("title", "topic_node", "detached_nodes", "relations", "_relation_index", "_relation_index_state")
+)
+
+
+def _rebuild_mindmap(
+    mindmap_class: type, title: str, has_topic: bool, trees: _PackedTrees, relations: Any, state: Dict[str, Any]
+) -> MindMap:
+    """Unpickle a mind map pickled by MindMap.__reduce__"""
+    roots = _unpack_trees(trees)
+    if isinstance(relations, tuple):
+        relations = [Relation(source, target, relation_id, name) for relation_id, source, target, name in relations]
+    mindmap = mindmap_class.__new__(mindmap_class)
+    MindMap.__init__(
+        mindmap,
+        title,
+        roots[0] if has_topic else None,  # type: ignore[arg-type]
+        roots[1:] if has_topic else roots,  # type: ignore[arg-type]
+        relations,
+    )
+    mindmap.__dict__.update(state)
+    return mindmap
@@ -1,10 +1,21 @@
 """Parser modules"""
 
 from .base_parser import BaseParser
-from .xmind_parser import XMindParser
+from .xmind_parser import XMindParser, XMindWorkbook, SheetInfo
 from .html_parser import HTMLParser
 from .csv_parser import CSVParser
 from .json_parser import JSONParser
 from .md_parser import MarkdownParser
+from .sqlite_parser import SQLiteParser
 
-__all__ = ["BaseParser", "XMindParser", "HTMLParser", "CSVParser", "JSONParser", "MarkdownParser"]
+__all__ = [
+    "BaseParser",
+    "XMindParser",
+    "XMindWorkbook",
+    "SheetInfo",
+    "HTMLParser",
+    "CSVParser",
+    "JSONParser",
+    "MarkdownParser",
+    "SQLiteParser",
+]
@@ -1,12 +1,36 @@
 """Base parser abstract class"""
 
+import io
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 from ..models import MindMap
+from ..instrumentation import Instrumentation, NULL_INSTRUMENTATION
+
+
+def read_text(stream: BinaryIO) -> str:
+    """Read a UTF-8 binary stream to the end with universal newlines
+
+    The stream is left open, so callers may keep using stdin or a socket.
+
+    Args:
+        stream: Binary stream to read
+
+    Returns:
+        Decoded text with every line ending translated to "\\n"
+    """
+    wrapper = io.TextIOWrapper(stream, encoding="utf-8")
+    try:
+        return wrapper.read()
+    finally:
+        wrapper.detach()
 
 
 class BaseParser(ABC):
     """Base parser abstract class for parsing files into MindMap"""
 
+    #: Receives stage spans; replaced by CoreConverter when timing is enabled
+    instrumentation: Instrumentation = NULL_INSTRUMENTATION
+
     @abstractmethod
     def parse(self, file_path: str) -> MindMap:
         """Parse file and return MindMap object
@@ -18,3 +42,14 @@ class BaseParser(ABC):
             MindMap object created from the file
         """
         pass
+
+    def parse_stream(self, stream: BinaryIO) -> MindMap:
+        """Parse a binary stream and return MindMap object
+
+        Args:
+            stream: Readable binary stream, e.g. sys.stdin.buffer
+
+        Returns:
+            MindMap object created from the stream data
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streams")
@@ -1,10 +1,12 @@
 """CSV file parser"""
 
 import csv
+import io
 import os
-from typing import List, Tuple, Dict, Optional
+from typing import BinaryIO, List, Tuple, Dict, Optional
 from ..models import MindMap, TopicNode
 from ..exceptions import ParserError, FileNotFound
+from ..interning import InternTable
 from .base_parser import BaseParser
 
 
@@ -24,35 +26,60 @@ class CSVParser(BaseParser):
         if not os.path.exists(file_path):
             raise FileNotFound(f"File not found: {file_path}")
 
+        with open(file_path, "rb") as f:
+            return self.parse_stream(f, delimiter)
+
+    def parse_stream(self, stream: BinaryIO, delimiter: str = ",") -> MindMap:
+        """Parse CSV from a binary stream and return MindMap object
+
+        Rows are decoded as they are read, so the stream is never held in memory as a whole.
+
+        Args:
+            stream: Readable binary stream with UTF-8 CSV data
+            delimiter: CSV delimiter character (default: ",")
+
+        Returns:
+            MindMap object created from the CSV data
+        """
         try:
             triples: List[Tuple[str, str]] = []
-            with open(file_path, "r", encoding="utf-8") as f:
-                reader = csv.reader(f, delimiter=delimiter)
-                next(reader)  # Skip header
-                for row in reader:
-                    if len(row) >= 2:
-                        triples.append((row[0], row[1]))
+            # Parent titles repeat once per child row
+            interner = InternTable()
+            with self.instrumentation.span("csv.read") as span:
+                text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+                try:
+                    reader = csv.reader(text, delimiter=delimiter)
+                    next(reader)  # Skip header
+                    for row in reader:
+                        if len(row) >= 2:
+                            triples.append((interner.string(row[0]), interner.string(row[1])))
+                finally:
+                    text.detach()
+                if self.instrumentation.enabled and stream.seekable():
+                    span.bytes_in = stream.tell()
 
             # Build node tree
-            node_map: Dict[str, TopicNode] = {}
-            root_node: Optional[TopicNode] = None
-
-            # First create all nodes
-            for parent_title, child_title in triples:
-                if parent_title not in node_map:
-                    node_map[parent_title] = TopicNode(parent_title)
-                if child_title not in node_map:
-                    node_map[child_title] = TopicNode(child_title)
-
-            # Then establish parent-child relationships
-            for parent_title, child_title in triples:
-                parent_node = node_map[parent_title]
-                child_node = node_map[child_title]
-                if child_node not in parent_node.children:
-                    parent_node.add_child(child_node)
-                # Assume parent node of first triple is the root node
-                if root_node is None:
-                    root_node = parent_node
+            with self.instrumentation.span("csv.build") as span:
+                node_map: Dict[str, TopicNode] = {}
+                root_node: Optional[TopicNode] = None
+
+                # First create all nodes
+                for parent_title, child_title in triples:
+                    if parent_title not in node_map:
+                        node_map[parent_title] = TopicNode(parent_title)
+                    if child_title not in node_map:
+                        node_map[child_title] = TopicNode(child_title)
+
+                # Then establish parent-child relationships
+                for parent_title, child_title in triples:
+                    parent_node = node_map[parent_title]
+                    child_node = node_map[child_title]
+                    if child_node not in parent_node.children:
+                        parent_node.add_child(child_node)
+                    # Assume parent node of first triple is the root node
+                    if root_node is None:
+                        root_node = parent_node
+                span.nodes = len(node_map)
 
             # Create and return MindMap object
             mindmap = MindMap(title="From CSV", topic_node=root_node)
@@ -1,11 +1,13 @@
 """HTML file parser"""
 
 import os
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 from html.parser import HTMLParser as StdHTMLParser
 from ..models import MindMap, TopicNode
 from ..exceptions import ParserError, FileNotFound
-from .base_parser import BaseParser
+from ..instrumentation import count_nodes
+from ..interning import InternTable
+from .base_parser import BaseParser, read_text
 
 
 class HTMLParser(BaseParser, StdHTMLParser):
@@ -21,6 +23,7 @@ class HTMLParser(BaseParser, StdHTMLParser):
         self.current_text: str = ""
         self.current_level: int = 0
         self.in_title_tag: bool = False
+        self.interner: InternTable = InternTable()
 
     def parse(self, file_path: str) -> MindMap:
         """Parse HTML file and return MindMap object
@@ -34,12 +37,38 @@ class HTMLParser(BaseParser, StdHTMLParser):
         if not os.path.exists(file_path):
             raise FileNotFound(f"File not found: {file_path}")
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
+        with open(file_path, "rb") as f:
+            return self.parse_stream(f)
+
+    def parse_stream(self, stream: BinaryIO) -> MindMap:
+        """Parse HTML from a binary stream and return MindMap object
+
+        Args:
+            stream: Readable binary stream with UTF-8 HTML text
 
-            self.reset()
-            self.feed(html_content)
+        Returns:
+            MindMap object created from the HTML text
+        """
+        try:
+            with self.instrumentation.span("html.read") as span:
+                html_content = read_text(stream)
+                if self.instrumentation.enabled:
+                    span.bytes_out = len(html_content.encode("utf-8"))
+
+            with self.instrumentation.span("html.build", bytes_in=span.bytes_out) as span:
+                self.reset()
+                # One parser instance serves many documents
+                self.mindmap_name = None
+                self.html_title = None
+                self.node_stack = []
+                self.root_node = None
+                self.current_text = ""
+                self.current_level = 0
+                self.in_title_tag = False
+                self.interner = InternTable()
+                self.feed(html_content)
+                if self.instrumentation.enabled:
+                    span.nodes = count_nodes(self.root_node)
 
             mindmap_name = self.html_title or self.mindmap_name or "From HTML"
             return MindMap(title=mindmap_name, topic_node=self.root_node)
@@ -80,7 +109,7 @@ class HTMLParser(BaseParser, StdHTMLParser):
         """Finish processing current node and add to tree based on h tag level"""
         node_title = self.current_text.strip()
         if node_title:
-            new_node = TopicNode(node_title)
+            new_node = TopicNode(self.interner.string(node_title))
 
             if self.node_stack:
                 while len(self.node_stack) >= self.current_level:
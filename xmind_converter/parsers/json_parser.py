@@ -1,10 +1,12 @@
 """JSON file parser"""
 
-import json
 import os
-from typing import Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Optional, List
 from ..models import MindMap, TopicNode, DetachedNode, Relation, Node
 from ..exceptions import ParserError, FileNotFound
+from ..instrumentation import count_nodes
+from ..interning import InternTable
+from .. import json_backend
 from .base_parser import BaseParser
 
 
@@ -23,17 +25,36 @@ class JSONParser(BaseParser):
         if not os.path.exists(file_path):
             raise FileNotFound(f"File not found: {file_path}")
 
+        with open(file_path, "rb") as f:
+            return self.parse_stream(f)
+
+    def parse_stream(self, stream: BinaryIO) -> MindMap:
+        """Parse JSON from a binary stream and return MindMap object
+
+        Args:
+            stream: Readable binary stream with UTF-8 JSON data
+
+        Returns:
+            MindMap object created from the JSON data
+        """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data: Dict[str, Any] = json.load(f)
+            with self.instrumentation.span("json.read") as span:
+                # Decoders take UTF-8 bytes directly, skipping a str copy
+                raw = stream.read()
+                span.bytes_out = len(raw)
+
+            with self.instrumentation.span("json.decode", bytes_in=len(raw)):
+                data: Dict[str, Any] = json_backend.loads(raw)
 
             # Build node tree
+            interner = InternTable()
+
             def build_node_from_dict(node_dict: Dict[str, Any], node_class: type = Node) -> Node:
                 node = node_class(
-                    title=node_dict.get("title", ""),
+                    title=interner.string(node_dict.get("title", "")),
                     node_id=node_dict.get("id"),
                     notes=node_dict.get("notes"),
-                    labels=node_dict.get("labels", []),
+                    labels=interner.labels(node_dict.get("labels")),
                 )
 
                 for child_dict in node_dict.get("children", []):
@@ -47,17 +68,20 @@ class JSONParser(BaseParser):
             detached_nodes: List[DetachedNode] = []
             relations: List[Relation] = []
 
-            if "topic_node" in data:
-                topic_node = build_node_from_dict(data["topic_node"], TopicNode)
-            elif "root_node" in data:
-                topic_node = build_node_from_dict(data["root_node"], TopicNode)
-            elif "title" in data:
-                topic_node = build_node_from_dict(data, TopicNode)
-
-            if "detached_nodes" in data:
-                for detached_dict in data["detached_nodes"]:
-                    detached_node = build_node_from_dict(detached_dict, DetachedNode)
-                    detached_nodes.append(detached_node)
+            with self.instrumentation.span("json.build") as span:
+                if "topic_node" in data:
+                    topic_node = build_node_from_dict(data["topic_node"], TopicNode)
+                elif "root_node" in data:
+                    topic_node = build_node_from_dict(data["root_node"], TopicNode)
+                elif "title" in data:
+                    topic_node = build_node_from_dict(data, TopicNode)
+
+                if "detached_nodes" in data:
+                    for detached_dict in data["detached_nodes"]:
+                        detached_node = build_node_from_dict(detached_dict, DetachedNode)
+                        detached_nodes.append(detached_node)
+                if self.instrumentation.enabled:
+                    span.nodes = count_nodes(topic_node, *detached_nodes)
 
             if "relations" in data:
                 for rel_dict in data["relations"]:
@@ -1,10 +1,12 @@
 """Markdown file parser"""
 
 import os
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 from ..models import MindMap, TopicNode
 from ..exceptions import ParserError, FileNotFound
-from .base_parser import BaseParser
+from ..instrumentation import count_nodes
+from ..interning import InternTable
+from .base_parser import BaseParser, read_text
 
 
 class MarkdownParser(BaseParser):
@@ -22,71 +24,90 @@ class MarkdownParser(BaseParser):
         if not os.path.exists(file_path):
             raise FileNotFound(f"File not found: {file_path}")
 
+        with open(file_path, "rb") as f:
+            return self.parse_stream(f)
+
+    def parse_stream(self, stream: BinaryIO) -> MindMap:
+        """Parse Markdown from a binary stream and return MindMap object
+
+        Args:
+            stream: Readable binary stream with UTF-8 Markdown text
+
+        Returns:
+            MindMap object created from the Markdown text
+        """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            with self.instrumentation.span("md.read") as span:
+                text = read_text(stream)
+                lines = text.split("\n")
+                if self.instrumentation.enabled:
+                    span.bytes_out = len(text.encode("utf-8"))
 
             # Build node tree
-            node_stack: List[TopicNode] = []
-            root_node: Optional[TopicNode] = None
-            i = 0
-
-            while i < len(lines):
-                line = lines[i].strip()
-                if not line:
-                    i += 1
-                    continue
-
-                # Check if it's a header line
-                if line.startswith("#"):
-                    # Calculate header level
-                    level = 0
-                    while line.startswith("#"):
-                        level += 1
-                        line = line[1:].strip()
-
-                    # Create new node
-                    new_node = TopicNode(line)
-
-                    # Check for notes and labels in following lines
-                    j = i + 1
-                    while j < len(lines):
-                        next_line = lines[j].strip()
-                        if next_line.startswith("- notes:"):
-                            notes = next_line[len("- notes:") :].strip()
-                            new_node.notes = notes
-                            j += 1
-                        elif next_line.startswith("- labels:"):
-                            labels_str = next_line[len("- labels:") :].strip()
-                            # Parse labels from format [label1, label2]
-                            if labels_str.startswith("[") and labels_str.endswith("]"):
-                                labels_str = labels_str[1:-1]
-                                labels = [label.strip() for label in labels_str.split(",") if label.strip()]
-                                new_node.labels = labels
-                            j += 1
-                        elif next_line.startswith("#") or not next_line:
-                            break
+            with self.instrumentation.span("md.build") as span:
+                node_stack: List[TopicNode] = []
+                root_node: Optional[TopicNode] = None
+                interner = InternTable()
+                i = 0
+
+                while i < len(lines):
+                    line = lines[i].strip()
+                    if not line:
+                        i += 1
+                        continue
+
+                    # Check if it's a header line
+                    if line.startswith("#"):
+                        # Calculate header level
+                        level = 0
+                        while line.startswith("#"):
+                            level += 1
+                            line = line[1:].strip()
+
+                        # Create new node
+                        new_node = TopicNode(interner.string(line))
+
+                        # Check for notes and labels in following lines
+                        j = i + 1
+                        while j < len(lines):
+                            next_line = lines[j].strip()
+                            if next_line.startswith("- notes:"):
+                                notes = next_line[len("- notes:") :].strip()
+                                new_node.notes = notes
+                                j += 1
+                            elif next_line.startswith("- labels:"):
+                                labels_str = next_line[len("- labels:") :].strip()
+                                # Parse labels from format [label1, label2]
+                                if labels_str.startswith("[") and labels_str.endswith("]"):
+                                    labels_str = labels_str[1:-1]
+                                    labels = [label.strip() for label in labels_str.split(",") if label.strip()]
+                                    new_node.labels = interner.labels(labels)
+                                j += 1
+                            elif next_line.startswith("#") or not next_line:
+                                break
+                            else:
+                                j += 1
+
+                        # Handle node relationships
+                        while node_stack and len(node_stack) >= level:
+                            node_stack.pop()
+
+                        if node_stack:
+                            # Add as child of parent node
+                            parent_node = node_stack[-1]
+                            parent_node.add_child(new_node)
                         else:
-                            j += 1
+                            # Root node
+                            root_node = new_node
 
-                    # Handle node relationships
-                    while node_stack and len(node_stack) >= level:
-                        node_stack.pop()
+                        # Add new node to stack
+                        node_stack.append(new_node)
 
-                    if node_stack:
-                        # Add as child of parent node
-                        parent_node = node_stack[-1]
-                        parent_node.add_child(new_node)
+                        i = j
                     else:
-                        # Root node
-                        root_node = new_node
-
-                    # Add new node to stack
-                    node_stack.append(new_node)
-
-                    i = j
-                else:
-                    i += 1
+                        i += 1
+                if self.instrumentation.enabled:
+                    span.nodes = count_nodes(root_node)
 
             # Create and return MindMap object
             mindmap = MindMap(title="From Markdown", topic_node=root_node)
@@ -0,0 +1,115 @@
+"""SQLite database parser"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from ..models import MindMap, TopicNode, DetachedNode, Relation, Node
+from ..exceptions import ParserError, FileNotFound
+from ..interning import InternTable
+from ..converters.sqlite_converter import SCHEMA_VERSION
+from .base_parser import BaseParser
+
+# Rows fetched per round trip while streaming nodes
+_FETCH_SIZE = 10000
+
+
+class SQLiteParser(BaseParser):
+    """SQLite database parser, reading databases written by SQLiteConverter"""
+
+    def parse(self, file_path: str) -> MindMap:
+        """Parse a SQLite database and return MindMap object
+
+        Args:
+            file_path: Path to the database
+
+        Returns:
+            MindMap object created from the database
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFound(f"File not found: {file_path}")
+
+        try:
+            connection = sqlite3.connect(file_path)
+        except sqlite3.Error as e:
+            raise ParserError(f"Failed to parse SQLite file: {str(e)}")
+        try:
+            return self._read(connection)
+        finally:
+            connection.close()
+
+    def parse_stream(self, stream: BinaryIO) -> MindMap:
+        """Parse a SQLite database from a binary stream and return MindMap object
+
+        SQLite reads files only, so the stream is copied to a temporary file first.
+
+        Args:
+            stream: Readable binary stream with the database
+
+        Returns:
+            MindMap object created from the database
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".sqlite")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(stream, f)
+            return self.parse(temp_path)
+        finally:
+            os.unlink(temp_path)
+
+    def _read(self, connection: sqlite3.Connection) -> MindMap:
+        """Build the mind map from the tables, streaming nodes in pre-order"""
+        try:
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+            if meta.get("schema_version") != str(SCHEMA_VERSION):
+                raise ValueError(f"Unsupported schema version: {meta.get('schema_version')}")
+
+            interner = InternTable()
+            with self.instrumentation.span("sqlite.read") as span:
+                labels: Dict[int, Tuple[str, ...]] = {
+                    node: interner.labels([label for _, label in rows])
+                    for node, rows in groupby(
+                        connection.execute("SELECT node, label FROM labels ORDER BY node, position"), itemgetter(0)
+                    )
+                }
+
+                topic_node: Optional[TopicNode] = None
+                detached_nodes: List[DetachedNode] = []
+                has_topic = meta.get("has_topic") == "1"
+                nodes: Dict[int, Node] = {}
+                cursor = connection.execute("SELECT seq, parent, id, title, notes FROM nodes ORDER BY seq")
+                while True:
+                    batch = cursor.fetchmany(_FETCH_SIZE)
+                    if not batch:
+                        break
+                    for seq, parent, node_id, title, notes in batch:
+                        node_labels = labels.get(seq)
+                        if parent is not None:
+                            node = Node(title, node_id, None, notes, node_labels)
+                            # Parents come first in pre-order
+                            nodes[parent].children.append(node)
+                        elif has_topic and topic_node is None:
+                            node = topic_node = TopicNode(title, node_id, None, notes, node_labels)
+                        else:
+                            node = DetachedNode(title, node_id, None, notes, node_labels)
+                            detached_nodes.append(node)  # type: ignore[arg-type]
+                        nodes[seq] = node
+                span.nodes = len(nodes)
+
+            relations = [
+                Relation(source_id, target_id, relation_id, title)
+                for relation_id, source_id, target_id, title in connection.execute(
+                    "SELECT id, source_id, target_id, title FROM relations ORDER BY rowid"
+                )
+            ]
+            return MindMap(
+                title=meta.get("title") or "From SQLite",
+                topic_node=topic_node,
+                detached_nodes=detached_nodes,
+                relations=relations,
+            )
+        except Exception as e:
+            raise ParserError(f"Failed to parse SQLite file: {str(e)}")
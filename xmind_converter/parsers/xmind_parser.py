@@ -1,72 +1,331 @@
 """XMind file parser"""
 
+import io
 import zipfile
 import xml.etree.ElementTree as ET
-import tempfile
 import os
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Any, Tuple, Union
 from ..models import MindMap, TopicNode, DetachedNode, Relation, Node
-from ..exceptions import ParserError, FileNotFound, FileFormatError
+from ..exceptions import ParserError, FileNotFound, FileFormatError, TopicNotFound
+from ..instrumentation import count_nodes
+from ..interning import InternTable
+from .. import json_backend
 from .base_parser import BaseParser
 
+XMAP_NS = {"xmap": "urn:xmind:xmap:xmlns:content:2.0"}
+
+
+def _parse_xml_string(data: bytes) -> ET.Element:
+    """Parse XML bytes, preferring defusedxml when it is installed"""
+    try:
+        from defusedxml import ElementTree as SafeET
+
+        return SafeET.fromstring(data)
+    except ImportError:
+        import warnings
+
+        warnings.warn(
+            "defusedxml not installed, using standard xml.etree.ElementTree. "
+            "For better security, install defusedxml: pip install defusedxml",
+            UserWarning,
+        )
+        return ET.fromstring(data)
+
+
+def _parse_sheet_payload(kind: str, payload: Any) -> MindMap:
+    """Parse a single pickled sheet payload in a worker process"""
+    parser = XMindParser()
+    if kind == "json":
+        return parser._parse_sheet_json(payload)
+    return parser._parse_sheet_xml(_parse_xml_string(payload), XMAP_NS)
+
+
+def _relations_between(relations: List[Relation], *roots: Optional[Node]) -> List[Relation]:
+    """Keep relations whose ends are both in the given trees"""
+    if not relations:
+        return relations
+    ids = set()
+    stack = [root for root in roots if root is not None]
+    while stack:
+        node = stack.pop()
+        ids.add(node.id)
+        stack.extend(node.children)
+    return [rel for rel in relations if rel.source_id in ids and rel.target_id in ids]
+
+
+class SheetInfo:
+    """Lightweight sheet metadata, available without building any nodes"""
+
+    def __init__(self, index: int, sheet_id: Optional[str], title: str) -> None:
+        self.index: int = index
+        self.id: Optional[str] = sheet_id
+        self.title: str = title
+
+    def __repr__(self) -> str:
+        """Detailed representation of sheet info"""
+        return f"SheetInfo(index={self.index}, id='{self.id}', title='{self.title}')"
+
+
+class XMindWorkbook:
+    """All sheets of an XMind file, parsed into MindMap objects on demand"""
+
+    def __init__(self, parser: "XMindParser", kind: str, sheets: List[Any], infos: List[SheetInfo]) -> None:
+        self._parser = parser
+        self._kind = kind
+        self._sheets = sheets
+        self._infos = infos
+        self._cache: Dict[Tuple[int, Optional[int], Optional[str]], MindMap] = {}
+        # Shared by every sheet parsed in this process
+        self._interner = InternTable()
+
+    @property
+    def sheets(self) -> List[SheetInfo]:
+        """Metadata of every sheet in the workbook"""
+        return list(self._infos)
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    def _resolve_index(self, sheet: Union[int, str]) -> int:
+        """Resolve a sheet index or title to an index"""
+        if isinstance(sheet, int):
+            if not -len(self._infos) <= sheet < len(self._infos):
+                raise ParserError(f"Sheet index out of range: {sheet}")
+            return sheet % len(self._infos)
+        for info in self._infos:
+            if info.title == sheet:
+                return info.index
+        raise ParserError(f"Sheet not found: {sheet}")
+
+    def parse_sheet(
+        self, sheet: Union[int, str] = 0, max_depth: Optional[int] = None, root_id: Optional[str] = None
+    ) -> MindMap:
+        """Parse a single sheet, or only part of it
+
+        Args:
+            sheet: Sheet index or sheet title (default: first sheet)
+            max_depth: Build at most this many topic levels, the root being level 1
+            root_id: Build only the subtree of the topic with this id, which becomes the topic node
+
+        Returns:
+            MindMap object created from the sheet
+        """
+        index = self._resolve_index(sheet)
+        key = (index, max_depth, root_id)
+        if key not in self._cache:
+            instrumentation = self._parser.instrumentation
+            with instrumentation.span("xmind.build") as span:
+                if self._kind == "json":
+                    mindmap = self._parser._parse_sheet_json(
+                        self._sheets[index], self._interner, max_depth=max_depth, root_id=root_id
+                    )
+                else:
+                    mindmap = self._parser._parse_sheet_xml(
+                        self._sheets[index], XMAP_NS, self._interner, max_depth=max_depth, root_id=root_id
+                    )
+                if instrumentation.enabled:
+                    span.nodes = count_nodes(mindmap.topic_node, *mindmap.detached_nodes)
+            self._cache[key] = mindmap
+        return self._cache[key]
+
+    def parse_all(self, workers: int = 1) -> List[MindMap]:
+        """Parse every sheet
+
+        Args:
+            workers: Number of worker processes, sheets are parsed serially when 1
+
+        Returns:
+            List of MindMap objects in sheet order
+        """
+        pending = [index for index in range(len(self._infos)) if (index, None, None) not in self._cache]
+        if workers > 1 and len(pending) > 1:
+            if self._kind == "json":
+                payloads = [self._sheets[index] for index in pending]
+            else:
+                payloads = [ET.tostring(self._sheets[index]) for index in pending]
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                results = executor.map(_parse_sheet_payload, [self._kind] * len(pending), payloads)
+                for index, mindmap in zip(pending, results):
+                    self._cache[(index, None, None)] = mindmap
+        return [self.parse_sheet(index) for index in range(len(self._infos))]
+
 
 class XMindParser(BaseParser):
     """XMind file parser"""
 
-    def parse(self, file_path: str) -> MindMap:
-        """Parse XMind file"""
+    def parse(
+        self,
+        file_path: str,
+        sheet: Union[int, str] = 0,
+        max_depth: Optional[int] = None,
+        root_id: Optional[str] = None,
+    ) -> MindMap:
+        """Parse XMind file
+
+        Topics outside the region selected by max_depth and root_id are not
+        built, and relations are kept only between built topics.
+
+        Args:
+            file_path: Path to XMind file to parse
+            sheet: Sheet index or sheet title (default: first sheet)
+            max_depth: Build at most this many topic levels, the root being level 1
+            root_id: Build only the subtree of the topic with this id, which becomes the topic node
+
+        Returns:
+            MindMap object created from the selected sheet
+        """
+        workbook = self.open_workbook(file_path)
+        try:
+            return workbook.parse_sheet(sheet, max_depth, root_id)
+        except TopicNotFound:
+            raise
+        except Exception as e:
+            raise ParserError(f"Failed to parse XMind file: {str(e)}")
+
+    def parse_all(self, file_path: str, workers: int = 1) -> List[MindMap]:
+        """Parse every sheet of an XMind file
+
+        Args:
+            file_path: Path to XMind file to parse
+            workers: Number of worker processes, sheets are parsed serially when 1
+
+        Returns:
+            List of MindMap objects in sheet order
+        """
+        workbook = self.open_workbook(file_path)
+        try:
+            return workbook.parse_all(workers=workers)
+        except Exception as e:
+            raise ParserError(f"Failed to parse XMind file: {str(e)}")
+
+    def open_workbook(self, file_path: str) -> XMindWorkbook:
+        """Open XMind file and read sheet metadata without building nodes
+
+        Args:
+            file_path: Path to XMind file to open
+
+        Returns:
+            XMindWorkbook whose sheets are parsed on demand
+        """
         if not os.path.exists(file_path):
             raise FileNotFound(f"File not found: {file_path}")
 
         if not zipfile.is_zipfile(file_path):
             raise FileFormatError(f"Not a valid XMind file: {file_path}")
 
+        return self._open_archive(file_path)
+
+    def parse_stream(
+        self,
+        stream: BinaryIO,
+        sheet: Union[int, str] = 0,
+        max_depth: Optional[int] = None,
+        root_id: Optional[str] = None,
+    ) -> MindMap:
+        """Parse XMind data from a binary stream
+
+        Args:
+            stream: Readable binary stream with XMind (zip) data
+            sheet: Sheet index or sheet title (default: first sheet)
+            max_depth: Build at most this many topic levels, the root being level 1
+            root_id: Build only the subtree of the topic with this id, which becomes the topic node
+
+        Returns:
+            MindMap object created from the selected sheet
+        """
+        workbook = self.open_workbook_stream(stream)
         try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                with zipfile.ZipFile(file_path, "r") as zf:
-                    zf.extractall(tmpdir)
+            return workbook.parse_sheet(sheet, max_depth, root_id)
+        except TopicNotFound:
+            raise
+        except Exception as e:
+            raise ParserError(f"Failed to parse XMind file: {str(e)}")
+
+    def open_workbook_stream(self, stream: BinaryIO) -> XMindWorkbook:
+        """Open XMind data from a binary stream and read sheet metadata without building nodes
+
+        Zip archives keep their directory at the end, so streams that cannot seek
+        (pipes, sockets) are buffered in memory first.
+
+        Args:
+            stream: Readable binary stream with XMind (zip) data
+
+        Returns:
+            XMindWorkbook whose sheets are parsed on demand
+        """
+        if not stream.seekable():
+            stream = io.BytesIO(stream.read())
 
-                content_json_path = os.path.join(tmpdir, "content.json")
-                if os.path.exists(content_json_path):
-                    return self._parse_content_json(content_json_path)
+        if not zipfile.is_zipfile(stream):
+            raise FileFormatError("Not a valid XMind file: stream is not a zip archive")
 
-                content_xml_path = os.path.join(tmpdir, "content.xml")
-                if os.path.exists(content_xml_path):
-                    return self._parse_content_xml(content_xml_path)
+        return self._open_archive(stream)
 
-                raise ParserError("XMind file missing content.json or content.xml")
+    def _open_archive(self, source: Union[str, BinaryIO]) -> XMindWorkbook:
+        """Read content data from a zip archive path or seekable stream"""
+        try:
+            with self.instrumentation.span("xmind.unzip") as span:
+                with zipfile.ZipFile(source, "r") as zf:
+                    names = set(zf.namelist())
+                    content_name = next((n for n in ("content.json", "content.xml") if n in names), None)
+                    if content_name is None:
+                        raise ParserError("XMind file missing content.json or content.xml")
+                    span.bytes_in = zf.getinfo(content_name).compress_size
+                    data = zf.read(content_name)
+                    span.bytes_out = len(data)
+
+            with self.instrumentation.span("xmind.decode", bytes_in=len(data)):
+                if content_name == "content.json":
+                    return self._open_content_json(data)
+                return self._open_content_xml(data)
         except Exception as e:
             raise ParserError(f"Failed to parse XMind file: {str(e)}")
 
-    def _parse_content_json(self, json_path: str) -> MindMap:
-        """Parse content.json file"""
-        import json
-
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    def _open_content_json(self, data: bytes) -> XMindWorkbook:
+        """Read sheets from content.json data"""
+        content = json_backend.loads(data)
 
-        if isinstance(data, list):
-            sheets: List[Dict[str, Any]] = data
+        if isinstance(content, list):
+            sheets: List[Dict[str, Any]] = content
         else:
-            sheets = data.get("sheets", [])
+            sheets = content.get("sheets", [])
 
         if not sheets:
             raise ParserError("No mind map found in XMind file")
 
-        sheet = sheets[0]
-        sheet_name = sheet.get("title", "Untitled")
+        infos = [SheetInfo(index, sheet.get("id"), self._sheet_title_json(sheet)) for index, sheet in enumerate(sheets)]
+        return XMindWorkbook(self, "json", sheets, infos)
+
+    def _sheet_title_json(self, sheet: Dict[str, Any]) -> str:
+        """Read sheet title from a content.json sheet"""
+        return sheet.get("title") or "Untitled"
+
+    def _parse_sheet_json(
+        self,
+        sheet: Dict[str, Any],
+        interner: Optional[InternTable] = None,
+        max_depth: Optional[int] = None,
+        root_id: Optional[str] = None,
+    ) -> MindMap:
+        """Parse a single sheet of content.json"""
+        interner = interner or InternTable()
+        sheet_name = self._sheet_title_json(sheet)
 
         root_topic = sheet.get("rootTopic")
         if root_topic is None:
             raise ParserError("No root node found in XMind file")
 
-        topic_node = self._parse_topic_json(root_topic, TopicNode)
-
         detached_nodes: List[DetachedNode] = []
-        detached_topics = sheet.get("detachedTopics", [])
-        for detached_topic in detached_topics:
-            detached_node = self._parse_topic_json(detached_topic, DetachedNode)
-            detached_nodes.append(detached_node)
+        if root_id is not None:
+            root_topic = self._find_topic_json(sheet, root_id)
+            topic_node = self._parse_topic_json(root_topic, TopicNode, interner, max_depth)
+        else:
+            topic_node = self._parse_topic_json(root_topic, TopicNode, interner, max_depth)
+            detached_topics = sheet.get("detachedTopics", [])
+            for detached_topic in detached_topics:
+                detached_node = self._parse_topic_json(detached_topic, DetachedNode, interner, max_depth)
+                detached_nodes.append(detached_node)
 
         relations: List[Relation] = []
         relationships = sheet.get("relationships", [])
@@ -79,6 +338,9 @@ class XMindParser(BaseParser):
             )
             relations.append(relation)
 
+        if max_depth is not None or root_id is not None:
+            relations = _relations_between(relations, topic_node, *detached_nodes)
+
         mindmap = MindMap(
             title=sheet_name,
             topic_node=topic_node,
@@ -87,12 +349,30 @@ class XMindParser(BaseParser):
         )
         return mindmap
 
-    def _parse_topic_json(self, topic_data: Dict[str, Any], node_class: type = Node) -> Node:
-        """Parse single topic node (JSON format)"""
+    def _find_topic_json(self, sheet: Dict[str, Any], topic_id: str) -> Dict[str, Any]:
+        """Find a topic by id in the raw sheet data without building nodes"""
+        stack = [sheet["rootTopic"], *sheet.get("detachedTopics", [])]
+        while stack:
+            topic_data = stack.pop()
+            if topic_data.get("id") == topic_id:
+                return topic_data
+            stack.extend(topic_data.get("children", {}).get("attached", []))
+        raise TopicNotFound(f"Topic not found: {topic_id}")
+
+    def _parse_topic_json(
+        self,
+        topic_data: Dict[str, Any],
+        node_class: type = Node,
+        interner: Optional[InternTable] = None,
+        max_depth: Optional[int] = None,
+        level: int = 1,
+    ) -> Node:
+        """Parse single topic node (JSON format), skipping children below max_depth"""
+        interner = interner or InternTable()
         node_id = topic_data.get("id")
 
         title = topic_data.get("title", "")
-        title = title.replace("\u200b", "").strip()
+        title = interner.string(title.replace("\u200b", "").strip())
 
         notes = None
         notes_data = topic_data.get("notes")
@@ -103,7 +383,7 @@ class XMindParser(BaseParser):
             elif isinstance(plain, str):
                 notes = plain
 
-        labels = topic_data.get("labels", [])
+        labels = interner.labels(topic_data.get("labels"))
 
         node = node_class(
             title=title,
@@ -112,65 +392,97 @@ class XMindParser(BaseParser):
             labels=labels,
         )
 
+        if max_depth is not None and level >= max_depth:
+            return node
+
         children_data = topic_data.get("children", {})
         child_topics = children_data.get("attached", [])
 
         for child_topic in child_topics:
-            child_node = self._parse_topic_json(child_topic, Node)
+            child_node = self._parse_topic_json(child_topic, Node, interner, max_depth, level + 1)
             node.add_child(child_node)
 
         return node
 
-    def _parse_content_xml(self, xml_path: str) -> MindMap:
-        """Parse content.xml file"""
-        try:
-            from defusedxml import ElementTree as SafeET
-
-            tree = SafeET.parse(xml_path)
-        except ImportError:
-            import warnings
+    def _open_content_xml(self, data: bytes) -> XMindWorkbook:
+        """Read sheets from content.xml data"""
+        root = _parse_xml_string(data)
+        ns = XMAP_NS
 
-            warnings.warn(
-                "defusedxml not installed, using standard xml.etree.ElementTree. "
-                "For better security, install defusedxml: pip install defusedxml",
-                UserWarning,
-            )
-            tree = ET.parse(xml_path)
-        root = tree.getroot()
-
-        ns = {"xmap": "urn:xmind:xmap:xmlns:content:2.0"}
-
-        sheet_elem = root.find(".//sheet") or root.find(".//xmap:sheet", ns)
-        if sheet_elem is None:
+        if root.tag in ("sheet", "{%s}sheet" % ns["xmap"]):
+            sheet_elems = [root]
+        else:
+            sheet_elems = root.findall("sheet") or root.findall("xmap:sheet", ns)
+            if not sheet_elems:
+                sheet_elems = root.findall(".//sheet") or root.findall(".//xmap:sheet", ns)
+        if not sheet_elems:
             raise ParserError("No mind map found in XMind file")
 
-        sheet_name = sheet_elem.get("title", "Untitled")
+        infos = [
+            SheetInfo(index, sheet_elem.get("id"), self._sheet_title_xml(sheet_elem, ns))
+            for index, sheet_elem in enumerate(sheet_elems)
+        ]
+        return XMindWorkbook(self, "xml", sheet_elems, infos)
+
+    def _sheet_title_xml(self, sheet_elem: ET.Element, ns: Dict[str, str]) -> str:
+        """Read sheet title from attribute or direct title child"""
+        title = sheet_elem.get("title")
+        if title:
+            return title
+        title_elem = sheet_elem.find("title")
+        if title_elem is None:
+            title_elem = sheet_elem.find("xmap:title", ns)
+        if title_elem is not None and title_elem.text:
+            return title_elem.text
+        return "Untitled"
+
+    def _parse_sheet_xml(
+        self,
+        sheet_elem: ET.Element,
+        ns: Dict[str, str],
+        interner: Optional[InternTable] = None,
+        max_depth: Optional[int] = None,
+        root_id: Optional[str] = None,
+    ) -> MindMap:
+        """Parse a single sheet element of content.xml"""
+        interner = interner or InternTable()
+        sheet_name = self._sheet_title_xml(sheet_elem, ns)
 
         root_topic_elem = sheet_elem.find(".//topic") or sheet_elem.find(".//xmap:topic", ns)
         if root_topic_elem is None:
             raise ParserError("No root node found in XMind file")
 
-        topic_node = self._parse_topic_xml(root_topic_elem, ns, TopicNode)
-
         detached_nodes: List[DetachedNode] = []
-        detached_topic_elems = sheet_elem.findall(".//detached") or sheet_elem.findall(".//xmap:detached", ns)
-        for detached_elem in detached_topic_elems:
-            topic_elem = detached_elem.find("topic") or detached_elem.find("xmap:topic", ns)
-            if topic_elem is not None:
-                detached_node = self._parse_topic_xml(topic_elem, ns, DetachedNode)
-                detached_nodes.append(detached_node)
+        if root_id is not None:
+            root_topic_elem = self._find_topic_xml(sheet_elem, root_id, ns)
+            topic_node = self._parse_topic_xml(root_topic_elem, ns, TopicNode, interner, max_depth)
+        else:
+            topic_node = self._parse_topic_xml(root_topic_elem, ns, TopicNode, interner, max_depth)
+            detached_topic_elems = sheet_elem.findall(".//detached") or sheet_elem.findall(".//xmap:detached", ns)
+            for detached_elem in detached_topic_elems:
+                topic_elem = detached_elem.find("topic") or detached_elem.find("xmap:topic", ns)
+                if topic_elem is not None:
+                    detached_node = self._parse_topic_xml(topic_elem, ns, DetachedNode, interner, max_depth)
+                    detached_nodes.append(detached_node)
 
         relations: List[Relation] = []
         relation_elems = sheet_elem.findall(".//relationship") or sheet_elem.findall(".//xmap:relationship", ns)
         for rel_elem in relation_elems:
+            # XMind 8 writes end1/end2 and a title element; end1Id/end2Id and a title attribute are also accepted
             relation = Relation(
-                source_id=rel_elem.get("end1Id", ""),
-                target_id=rel_elem.get("end2Id", ""),
+                source_id=rel_elem.get("end1") or rel_elem.get("end1Id", ""),
+                target_id=rel_elem.get("end2") or rel_elem.get("end2Id", ""),
                 relation_id=rel_elem.get("id"),
-                title=rel_elem.get("title", "Relation"),
+                title=rel_elem.get("title")
+                or rel_elem.findtext("title")
+                or rel_elem.findtext("xmap:title", namespaces=ns)
+                or "Relation",
             )
             relations.append(relation)
 
+        if max_depth is not None or root_id is not None:
+            relations = _relations_between(relations, topic_node, *detached_nodes)
+
         mindmap = MindMap(
             title=sheet_name,
             topic_node=topic_node,
@@ -179,15 +491,30 @@ class XMindParser(BaseParser):
         )
         return mindmap
 
+    def _find_topic_xml(self, sheet_elem: ET.Element, topic_id: str, ns: Dict[str, str]) -> ET.Element:
+        """Find a topic element by id without building nodes"""
+        tags = ("topic", "{%s}topic" % ns["xmap"])
+        for elem in sheet_elem.iter():
+            if elem.get("id") == topic_id and elem.tag in tags:
+                return elem
+        raise TopicNotFound(f"Topic not found: {topic_id}")
+
     def _parse_topic_xml(
-        self, topic_elem: ET.Element, ns: Optional[Dict[str, str]] = None, node_class: type = Node
+        self,
+        topic_elem: ET.Element,
+        ns: Optional[Dict[str, str]] = None,
+        node_class: type = Node,
+        interner: Optional[InternTable] = None,
+        max_depth: Optional[int] = None,
+        level: int = 1,
     ) -> Node:
-        """Parse single topic node"""
+        """Parse single topic node, skipping children below max_depth"""
+        interner = interner or InternTable()
         node_id = topic_elem.get("id")
 
         title_elem = topic_elem.find("title") or (topic_elem.find("xmap:title", ns) if ns else None)
         title = title_elem.text if title_elem is not None and title_elem.text else ""
-        title = title.replace("\u200b", "").strip()
+        title = interner.string(title.replace("\u200b", "").strip())
 
         notes = None
         notes_elem = topic_elem.find("notes") or (topic_elem.find("xmap:notes", ns) if ns else None)
@@ -207,9 +534,12 @@ class XMindParser(BaseParser):
             title=title,
             node_id=node_id,
             notes=notes,
-            labels=labels,
+            labels=interner.labels(labels),
         )
 
+        if max_depth is not None and level >= max_depth:
+            return node
+
         children_elem = topic_elem.find("children") or (topic_elem.find("xmap:children", ns) if ns else None)
         if children_elem is not None:
             topics_elem = children_elem.find("topics") or (children_elem.find("xmap:topics", ns) if ns else None)
@@ -217,7 +547,7 @@ class XMindParser(BaseParser):
                 for child_topic_elem in topics_elem.findall("topic") or (
                     topics_elem.findall("xmap:topic", ns) if ns else []
                 ):
-                    child_node = self._parse_topic_xml(child_topic_elem, ns, Node)
+                    child_node = self._parse_topic_xml(child_topic_elem, ns, Node, interner, max_depth, level + 1)
                     node.add_child(child_node)
 
         return node
@@ -0,0 +1,333 @@
+"""Subtree selection and pruning applied before serialization
+
+A query selects branches of a mind map and returns a lazily filtered view
+that every converter consumes like an ordinary MindMap. No node is copied:
+view nodes wrap the original nodes and build their filtered children on
+first access, so exporting a small slice of a huge map only touches the
+slice.
+
+Selectors:
+    id:<id>            The node with this id
+    re:<pattern>       Nodes whose title matches the regular expression
+    label:<label>      Nodes carrying the label
+    <glob path>        Nodes whose title path matches, e.g. "Root/Sport*/**/Run?"
+                       ("*", "?" and "[...]" match within a title, "**" any number of levels)
+"""
+
+import fnmatch
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+from .models import MindMap, Node, Relation, TopicNode
+
+
+class NodeView(TopicNode):
+    """Read-only view of a node with excluded and too deep children hidden"""
+
+    __slots__ = ("_node", "_query", "_level", "_children")
+
+    # Views are pickled and copied attribute by attribute, not flattened like nodes
+    __reduce__ = object.__reduce__
+
+    def __init__(self, node: Node, query: "Query", level: int = 1) -> None:
+        # Node.__init__ is not called: attributes are read from the wrapped node
+        self._node = node
+        self._query = query
+        self._level = level
+        self._children: Optional[List["NodeView"]] = None
+
+    @property
+    def node(self) -> Node:
+        """The wrapped node"""
+        return self._node
+
+    @property
+    def id(self) -> str:  # type: ignore[override]
+        return self._node.id
+
+    @property
+    def title(self) -> str:  # type: ignore[override]
+        return self._node.title
+
+    @property
+    def notes(self) -> Optional[str]:  # type: ignore[override]
+        return self._node.notes
+
+    @property
+    def labels(self) -> Tuple[str, ...]:  # type: ignore[override]
+        return self._node.labels
+
+    @property
+    def children(self) -> List["NodeView"]:  # type: ignore[override]
+        if self._children is None:
+            query = self._query
+            if query.max_depth is not None and self._level >= query.max_depth:
+                self._children = []
+            else:
+                level = self._level + 1
+                self._children = [
+                    NodeView(child, query, level) for child in self._node.children if not query.is_excluded(child)
+                ]
+        return self._children
+
+    def add_child(self, child: Node) -> None:
+        raise TypeError("NodeView is read-only")
+
+    def remove_child(self, child: Node) -> None:
+        raise TypeError("NodeView is read-only")
+
+    def add_label(self, label: str) -> None:
+        raise TypeError("NodeView is read-only")
+
+    def remove_label(self, label: str) -> None:
+        raise TypeError("NodeView is read-only")
+
+    def replace(self, **changes: Any) -> Node:  # type: ignore[override]
+        raise TypeError("NodeView is read-only")
+
+
+class MindMapView(MindMap):
+    """Mind map made of selected node views
+
+    Relations are kept when both ends are visible; they are filtered on first access.
+    """
+
+    __reduce__ = object.__reduce__
+
+    def __init__(self, source: MindMap, topic_node: Optional[NodeView], detached_nodes: List[NodeView]) -> None:
+        # MindMap.__init__ is not called: relations are computed on first access
+        self.title: str = source.title
+        self.topic_node: Optional[TopicNode] = topic_node
+        self.detached_nodes: List[NodeView] = detached_nodes  # type: ignore[assignment]
+        self.source: MindMap = source
+        self._relations: Optional[List[Relation]] = None
+        self._relation_index = None
+        self._relation_index_state = None
+
+    @property
+    def relations(self) -> List[Relation]:  # type: ignore[override]
+        if self._relations is None:
+            self._relations = self._visible_relations()
+        return self._relations
+
+    def _visible_relations(self) -> List[Relation]:
+        if not self.source.relations:
+            return []
+        visible: Set[str] = set()
+        stack: List[Node] = [*self.detached_nodes, *([self.topic_node] if self.topic_node else [])]
+        while stack:
+            node = stack.pop()
+            visible.add(node.id)
+            stack.extend(node.children)
+        return [rel for rel in self.source.relations if rel.source_id in visible and rel.target_id in visible]
+
+
+def _compile_path(pattern: str) -> Callable[[Sequence[Node]], List[Node]]:
+    """Compile a title path glob into a finder walking only matching branches"""
+    segments = [segment for segment in pattern.strip("/").split("/") if segment]
+    if not segments:
+        raise ValueError(f"Empty path selector: {pattern!r}")
+    last = len(segments) - 1
+    # Expand "**" to also match zero levels
+    closures: List[Tuple[int, ...]] = []
+    for index in range(len(segments)):
+        closure = [index]
+        while segments[closure[-1]] == "**" and closure[-1] < last:
+            closure.append(closure[-1] + 1)
+        closures.append(tuple(closure))
+
+    def find(roots: Sequence[Node]) -> List[Node]:
+        found: List[Node] = []
+        stack: List[Tuple[Node, Tuple[int, ...]]] = [(root, closures[0]) for root in reversed(roots)]
+        while stack:
+            node, states = stack.pop()
+            matched = False
+            next_states: Set[int] = set()
+            for index in states:
+                segment = segments[index]
+                if segment == "**":
+                    matched = matched or index == last
+                    next_states.update(closures[index])
+                elif fnmatch.fnmatchcase(node.title, segment):
+                    if index == last:
+                        matched = True
+                    else:
+                        next_states.update(closures[index + 1])
+            if matched:
+                # Matches below a match are already part of its subtree
+                found.append(node)
+            elif next_states:
+                child_states = tuple(sorted(next_states))
+                stack.extend((child, child_states) for child in reversed(node.children))
+        return found
+
+    return find
+
+
+def _compile_predicate(
+    predicate: Callable[[Node], bool], first_only: bool = False
+) -> Callable[[Sequence[Node]], List[Node]]:
+    """Compile a node predicate into a finder scanning the whole map"""
+
+    def find(roots: Sequence[Node]) -> List[Node]:
+        found: List[Node] = []
+        stack: List[Node] = list(reversed(roots))
+        while stack:
+            node = stack.pop()
+            if predicate(node):
+                found.append(node)
+                if first_only:
+                    break
+                continue
+            stack.extend(reversed(node.children))
+        return found
+
+    return find
+
+
+def compile_selector(selector: str) -> Callable[[Sequence[Node]], List[Node]]:
+    """Compile a selector string into a function returning matching nodes
+
+    Args:
+        selector: Selector, see the module documentation
+
+    Returns:
+        Function taking root nodes and returning the topmost matching nodes in document order
+
+    Raises:
+        ValueError: If the selector is empty or the regular expression is invalid
+    """
+    if selector.startswith("id:"):
+        node_id = selector[len("id:") :]
+        return _compile_predicate(lambda node: node.id == node_id, first_only=True)
+    if selector.startswith("re:"):
+        try:
+            pattern = re.compile(selector[len("re:") :])
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression in selector {selector!r}: {e}")
+        return _compile_predicate(lambda node: pattern.search(node.title) is not None)
+    if selector.startswith("label:"):
+        label = selector[len("label:") :]
+        return _compile_predicate(lambda node: label in node.labels)
+    return _compile_path(selector[len("path:") :] if selector.startswith("path:") else selector)
+
+
+class Query:
+    """Branch selection with depth limit and label exclusion
+
+    Args:
+        select: Selector or selectors; matches of all selectors are combined (default: the whole map)
+        max_depth: Maximum number of levels kept below and including each selected node
+        exclude_labels: Nodes carrying any of these labels are dropped with their subtrees
+    """
+
+    def __init__(
+        self,
+        select: Union[str, Iterable[str], None] = None,
+        max_depth: Optional[int] = None,
+        exclude_labels: Optional[Iterable[str]] = None,
+    ) -> None:
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        self.selectors: List[str] = [select] if isinstance(select, str) else list(select or [])
+        self.max_depth: Optional[int] = max_depth
+        self.exclude_labels: frozenset = frozenset(exclude_labels or ())
+        self._finders = [compile_selector(selector) for selector in self.selectors]
+
+    def __getstate__(self) -> dict:
+        # Compiled selectors hold closures; views shipped to worker processes only need the pruning options
+        state = self.__dict__.copy()
+        del state["_finders"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._finders = [compile_selector(selector) for selector in self.selectors]
+
+    def parser_options(self) -> Dict[str, Any]:
+        """Get XMindParser options that skip building topics this query would hide
+
+        Only a depth limit on the whole map, or on a single id: selection, can be
+        applied while parsing; the view is still applied afterwards.
+        """
+        if not self.selectors:
+            return {} if self.max_depth is None else {"max_depth": self.max_depth}
+        if len(self.selectors) == 1 and self.selectors[0].startswith("id:"):
+            return {"root_id": self.selectors[0][len("id:") :], "max_depth": self.max_depth}
+        return {}
+
+    def is_excluded(self, node: Node) -> bool:
+        """Check whether a node is dropped by the label exclusion"""
+        return bool(self.exclude_labels) and not self.exclude_labels.isdisjoint(node.labels)
+
+    def select(self, mindmap: MindMap) -> List[Node]:
+        """Find the selected nodes, topic tree first, then detached trees
+
+        Nodes inside another selected subtree are left out.
+        """
+        roots: List[Node] = [*([mindmap.topic_node] if mindmap.topic_node else []), *mindmap.detached_nodes]
+        if not self._finders:
+            return roots
+        if len(self._finders) == 1:
+            return self._finders[0](roots)
+
+        matched: Set[int] = set()
+        for finder in self._finders:
+            matched.update(id(node) for node in finder(roots))
+        # Keep document order and drop nested matches
+        selected: List[Node] = []
+        stack = list(reversed(roots))
+        while stack:
+            node = stack.pop()
+            if id(node) in matched:
+                selected.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return selected
+
+    def apply(self, mindmap: MindMap) -> MindMapView:
+        """Build a filtered view of a mind map
+
+        Without selectors the topic node and detached nodes stay in place. With
+        selectors the first selected node becomes the topic node and the others
+        become detached nodes.
+
+        Args:
+            mindmap: Mind map to filter
+
+        Returns:
+            MindMapView sharing every node with the source map
+        """
+        if not self.selectors:
+            topic = mindmap.topic_node
+            topic_view = NodeView(topic, self) if topic is not None and not self.is_excluded(topic) else None
+            detached = [NodeView(node, self) for node in mindmap.detached_nodes if not self.is_excluded(node)]
+            return MindMapView(mindmap, topic_view, detached)
+
+        views = [NodeView(node, self) for node in self.select(mindmap) if not self.is_excluded(node)]
+        return MindMapView(mindmap, views[0] if views else None, views[1:])
+
+    def __repr__(self) -> str:
+        return (
+            f"Query(select={self.selectors}, max_depth={self.max_depth}, "
+            f"exclude_labels={sorted(self.exclude_labels)})"
+        )
+
+
+def query(
+    mindmap: MindMap,
+    select: Union[str, Iterable[str], None] = None,
+    max_depth: Optional[int] = None,
+    exclude_labels: Optional[Iterable[str]] = None,
+) -> MindMapView:
+    """Select branches of a mind map as a lazily filtered view
+
+    Args:
+        mindmap: Mind map to filter
+        select: Selector or selectors (default: the whole map)
+        max_depth: Maximum number of levels kept below and including each selected node
+        exclude_labels: Nodes carrying any of these labels are dropped with their subtrees
+
+    Returns:
+        MindMapView that every converter accepts
+    """
+    return Query(select, max_depth, exclude_labels).apply(mindmap)
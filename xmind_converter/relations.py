@@ -0,0 +1,128 @@
+"""Relation adjacency index and relation validation"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set
+
+from .models import Node, Relation
+
+if TYPE_CHECKING:
+    from .models import MindMap
+
+SOURCE = "source"
+TARGET = "target"
+
+
+class RelationIndex:
+    """Outgoing and incoming relations per node id
+
+    Args:
+        relations: Relations to index, in order
+    """
+
+    def __init__(self, relations: Iterable[Relation] = ()) -> None:
+        self._outgoing: Dict[str, List[Relation]] = {}
+        self._incoming: Dict[str, List[Relation]] = {}
+        self._count: int = 0
+        for relation in relations:
+            self.add(relation)
+
+    def __len__(self) -> int:
+        """Number of indexed relations"""
+        return self._count
+
+    def add(self, relation: Relation) -> None:
+        """Index a relation"""
+        self._outgoing.setdefault(relation.source_id, []).append(relation)
+        self._incoming.setdefault(relation.target_id, []).append(relation)
+        self._count += 1
+
+    def remove(self, relation: Relation) -> None:
+        """Remove an indexed relation; unknown relations are ignored"""
+        outgoing = self._outgoing.get(relation.source_id)
+        if not outgoing or relation not in outgoing:
+            return
+        outgoing.remove(relation)
+        if not outgoing:
+            del self._outgoing[relation.source_id]
+        incoming = self._incoming[relation.target_id]
+        incoming.remove(relation)
+        if not incoming:
+            del self._incoming[relation.target_id]
+        self._count -= 1
+
+    def outgoing(self, node_id: str) -> List[Relation]:
+        """Get the relations starting at a node"""
+        return list(self._outgoing.get(node_id, ()))
+
+    def incoming(self, node_id: str) -> List[Relation]:
+        """Get the relations ending at a node"""
+        return list(self._incoming.get(node_id, ()))
+
+    def relations_of(self, node_id: str) -> List[Relation]:
+        """Get the relations touching a node, outgoing first; self-relations appear once"""
+        outgoing = self._outgoing.get(node_id, [])
+        return outgoing + [relation for relation in self._incoming.get(node_id, ()) if relation.source_id != node_id]
+
+    def endpoint_ids(self) -> Set[str]:
+        """Get the ids of every node referenced by an indexed relation"""
+        return self._outgoing.keys() | self._incoming.keys()
+
+    def __repr__(self) -> str:
+        return f"RelationIndex(relations={self._count}, nodes={len(self.endpoint_ids())})"
+
+
+class DanglingEndpoint:
+    """Relation end that references a node missing from the mind map"""
+
+    def __init__(self, relation: Relation, end: str) -> None:
+        self.relation: Relation = relation
+        self.end: str = end
+
+    @property
+    def node_id(self) -> str:
+        """Id of the missing node"""
+        return self.relation.source_id if self.end == SOURCE else self.relation.target_id
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convert the issue to a JSON-serializable dictionary"""
+        return {"relation_id": self.relation.id, "end": self.end, "node_id": self.node_id}
+
+    def __str__(self) -> str:
+        return f"Relation '{self.relation.title}' ({self.relation.id}) has missing {self.end} node {self.node_id}"
+
+    def __repr__(self) -> str:
+        return f"DanglingEndpoint(relation_id='{self.relation.id}', end='{self.end}', node_id='{self.node_id}')"
+
+
+def collect_node_ids(mindmap: "MindMap") -> Set[str]:
+    """Get the ids of every node in the topic tree and detached trees"""
+    node_ids: Set[str] = set()
+    stack: List[Node] = [*([mindmap.topic_node] if mindmap.topic_node else []), *mindmap.detached_nodes]
+    while stack:
+        node = stack.pop()
+        node_ids.add(node.id)
+        stack.extend(node.children)
+    return node_ids
+
+
+def validate_relations(mindmap: "MindMap") -> List[DanglingEndpoint]:
+    """Find relation ends referencing nodes that are not in the mind map
+
+    Runs in O(nodes + relations): node ids are collected in one walk and each
+    relation end is a set lookup.
+
+    Args:
+        mindmap: Mind map to check
+
+    Returns:
+        Dangling endpoints in relation order, source before target
+    """
+    if not mindmap.relations:
+        return []
+    node_ids = collect_node_ids(mindmap)
+    issues: List[DanglingEndpoint] = []
+    for relation in mindmap.relations:
+        if relation.source_id not in node_ids:
+            issues.append(DanglingEndpoint(relation, SOURCE))
+        if relation.target_id not in node_ids:
+            issues.append(DanglingEndpoint(relation, TARGET))
+    return issues
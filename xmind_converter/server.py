@@ -0,0 +1,314 @@
+"""Long-running conversion daemon backed by a warm worker pool"""
+
+import base64
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+from .core import CoreConverter
+from .exceptions import XMindConverterError
+
+logger = logging.getLogger(__name__)
+
+_worker: Optional[CoreConverter] = None
+
+
+def _warm_worker() -> None:
+    """Initialize a worker process so jobs never pay for imports or setup"""
+    global _worker
+    _worker = CoreConverter()
+
+
+def _get_worker() -> CoreConverter:
+    if _worker is None:
+        _warm_worker()
+    return _worker  # type: ignore[return-value]
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _convert_paths(input_path: str, output_path: str, input_format: Optional[str], output_format: Optional[str]) -> str:
+    return _get_worker().convert(input_path, output_path, input_format, output_format)
+
+
+def _convert_bytes(data: bytes, input_format: str, output_format: str) -> bytes:
+    converter = _get_worker()
+    return converter.dumps(converter.loads(data, input_format), output_format)
+
+
+class _Metrics:
+    """Thread-safe queue depth and latency counters"""
+
+    def __init__(self, workers: int, window: int = 1024) -> None:
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def start(self) -> None:
+        with self.lock:
+            self.in_flight += 1
+
+    def finish(self, elapsed: float, ok: bool) -> None:
+        with self.lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.latencies.append(elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            latencies = sorted(self.latencies)
+            in_flight = self.in_flight
+            completed = self.completed
+            failed = self.failed
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "workers": self.workers,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "completed": completed,
+            "failed": failed,
+            "latency_ms": {
+                "count": len(latencies),
+                "mean": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else 0.0,
+            },
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP front-end of the conversion daemon"""
+
+    server_version = "xmind-converter"
+
+    def address_string(self) -> str:
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        app: ConversionServer = self.server.app  # type: ignore[attr-defined]
+        if self.path == "/metrics":
+            self._send_json(200, app.metrics())
+        elif self.path == "/health":
+            self._send_json(200, {"ok": True})
+        else:
+            self._send_json(404, {"ok": False, "error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        app: ConversionServer = self.server.app  # type: ignore[attr-defined]
+        if self.path != "/convert":
+            self._send_json(404, {"ok": False, "error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length).decode("utf-8"))
+            if not isinstance(job, dict):
+                raise ValueError("Job must be a JSON object")
+        except ValueError as e:
+            self._send_json(400, {"ok": False, "error": f"Invalid job: {str(e)}"})
+            return
+        status, payload = app.submit(job)
+        self._send_json(status, payload)
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ConversionServer:
+    """Conversion daemon serving jobs over localhost HTTP or a Unix socket
+
+    Jobs are JSON objects posted to ``/convert``:
+
+    - ``{"input_path", "output_path", "input_format"?, "output_format"?}`` converts files on disk
+    - ``{"data", "input_format", "output_format"}`` converts a base64 payload and returns
+      the base64 result in ``data``
+
+    ``GET /metrics`` reports queue depth, throughput and latency percentiles.
+
+    Path jobs read and write any file the daemon's user can access, so only
+    trusted clients should reach the socket. With ``root``, relative paths are
+    resolved against that directory and paths outside it are rejected.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        socket_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        root: Optional[str] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.root: Optional[str] = os.path.realpath(root) if root else None
+        self.workers: int = workers or os.cpu_count() or 1
+        self._metrics = _Metrics(self.workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[Union[_TCPServer, _UnixServer]] = None
+        # socketserver's shutdown() waits for serve_forever() to return, so it must only be called while serving
+        self._lock = threading.Lock()
+        self._serving = False
+        self._closed = False
+
+    @property
+    def address(self) -> Union[str, Tuple[str, int]]:
+        """Bound address: socket path, or (host, port) for HTTP"""
+        if self._server is None:
+            raise XMindConverterError("Server is not started")
+        if self.socket_path:
+            return self.socket_path
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> None:
+        """Start the worker pool, wait for every worker to be warm, and bind the socket"""
+        self._closed = False
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        # Submit enough concurrent jobs to force every worker process to fork now
+        pings = [self._executor.submit(_ping) for _ in range(self.workers * 2)]
+        for ping in pings:
+            ping.result()
+
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        else:
+            self._server = _TCPServer((self.host, self.port), _RequestHandler)
+        self._server.app = self  # type: ignore[union-attr]
+
+    def serve_forever(self) -> None:
+        """Serve requests until shutdown() is called"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._server is None:
+                self.start()
+            server = self._server
+            self._serving = True
+        try:
+            server.serve_forever()  # type: ignore[union-attr]
+        finally:
+            self._serving = False
+
+    def shutdown(self) -> None:
+        """Stop serving, release the socket and stop the worker pool"""
+        with self._lock:
+            self._closed = True
+            server, self._server = self._server, None
+            serving = self._serving
+        if server is not None:
+            if serving:
+                server.shutdown()
+            server.server_close()
+            if self.socket_path and os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _resolve_path(self, path: Any) -> str:
+        """Resolve a job path against root, rejecting paths that leave it"""
+        if not isinstance(path, str):
+            raise ValueError(f"Invalid path: {path!r}")
+        if self.root is None:
+            return path
+        resolved = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, resolved]) != self.root:
+            raise ValueError(f"Path outside of root: {path}")
+        return resolved
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current queue depth and latency metrics"""
+        return self._metrics.snapshot()
+
+    def submit(self, job: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Run a job on the worker pool
+
+        Args:
+            job: Job description (see class docstring)
+
+        Returns:
+            HTTP status code and JSON response payload
+        """
+        if self._executor is None:
+            raise XMindConverterError("Server is not started")
+
+        if "data" in job:
+            if not job.get("input_format") or not job.get("output_format"):
+                return 400, {"ok": False, "error": "input_format and output_format are required with data"}
+            try:
+                data = base64.b64decode(job["data"])
+            except ValueError as e:
+                return 400, {"ok": False, "error": f"Invalid data: {str(e)}"}
+            args: Tuple[Any, ...] = (data, job["input_format"], job["output_format"])
+            func: Any = _convert_bytes
+        elif "input_path" in job and "output_path" in job:
+            try:
+                paths = [self._resolve_path(job["input_path"]), self._resolve_path(job["output_path"])]
+            except ValueError as e:
+                return 403, {"ok": False, "error": str(e)}
+            args = (*paths, job.get("input_format"), job.get("output_format"))
+            func = _convert_paths
+        else:
+            return 400, {"ok": False, "error": "Job needs input_path and output_path, or data"}
+
+        self._metrics.start()
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = self._executor.submit(func, *args).result()
+            ok = True
+        except XMindConverterError as e:
+            return 422, {"ok": False, "error": str(e)}
+        except Exception as e:
+            return 500, {"ok": False, "error": f"Unknown error: {str(e)}"}
+        finally:
+            elapsed = time.perf_counter() - started
+            self._metrics.finish(elapsed, ok)
+
+        payload: Dict[str, Any] = {"ok": True, "elapsed_ms": elapsed * 1000}
+        if func is _convert_bytes:
+            payload["data"] = base64.b64encode(result).decode("ascii")
+        else:
+            payload["result"] = result
+        return 200, payload
@@ -0,0 +1,441 @@
+"""Hand parsed mind maps to worker processes through shared memory
+
+One process publishes a map into a ``multiprocessing.shared_memory`` block
+in a flat, read-only layout; workers attach to the block by name and get a
+read-only ``MindMap`` view whose nodes read their fields from the shared
+buffer on access. Nothing is pickled per worker and the node structure is
+never copied, so rendering N formats from one large input costs one parse.
+Each worker decodes and splits the text section once when attaching, so
+reading a string field is a list lookup afterwards.
+
+Layout, in native byte order since the block never leaves the machine, every
+section 8-byte aligned:
+
+    header          magic, version, counts and the map title's string index
+    string offsets  uint64 per string plus one: code point ranges in the decoded text
+    nodes           5 x uint32 per node in pre-order: id, title and notes string
+                    indexes (NO_NOTES if None), label set index, subtree size
+    label sets      uint32 offsets per set plus one, then uint32 string indexes
+    relations       4 x uint32 string indexes per relation: id, source, target, title
+    roots           uint32 node index per root, the topic node first if present
+    text            UTF-8 strings, each distinct string stored once
+"""
+
+import inspect
+import itertools
+import struct
+import threading
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import MindMap, Node, Relation, TopicNode
+
+MAGIC = b"XMINDSHM"
+VERSION = 1
+NO_NOTES = 0xFFFFFFFF
+
+# magic, version, has topic, title, nodes, roots, relations, strings, label sets, label items, text bytes
+_HEADER = struct.Struct("=8s9IQ")
+_NODE_FIELDS = 5
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _Sections:
+    """Byte offsets of the layout sections, computed from the header counts"""
+
+    def __init__(self, nodes: int, roots: int, relations: int, strings: int, label_sets: int, label_items: int) -> None:
+        offset = _aligned(_HEADER.size)
+        self.string_offsets = offset
+        offset = _aligned(offset + 8 * (strings + 1))
+        self.nodes = offset
+        offset = _aligned(offset + 4 * _NODE_FIELDS * nodes)
+        self.label_offsets = offset
+        offset += 4 * (label_sets + 1)
+        self.label_items = offset
+        offset = _aligned(offset + 4 * label_items)
+        self.relations = offset
+        offset = _aligned(offset + 16 * relations)
+        self.roots = offset
+        offset = _aligned(offset + 4 * roots)
+        self.text = offset
+
+
+class _StringTable:
+    """Distinct strings in order of first use"""
+
+    def __init__(self) -> None:
+        self.indexes: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.indexes)
+        return index
+
+
+class SharedMindMap:
+    """A mind map published to a shared memory block
+
+    The publishing process owns the block: keep this object alive while
+    workers use the map, then call ``unlink()`` (or use it as a context
+    manager) to free it.
+
+    Args:
+        mindmap: Mind map to publish
+        name: Name of the shared memory block (default: a random name)
+    """
+
+    def __init__(self, mindmap: MindMap, name: Optional[str] = None) -> None:
+        strings = _StringTable()
+        label_sets: Dict[Tuple[str, ...], int] = {(): 0}
+        label_items: List[int] = []
+        label_offsets: List[int] = [0]
+        records: List[int] = []
+        roots: List[int] = []
+
+        trees: List[Node] = [*([mindmap.topic_node] if mindmap.topic_node else []), *mindmap.detached_nodes]
+        for tree in trees:
+            roots.append(len(records) // _NODE_FIELDS)
+            # Pre-order with the record index of every open ancestor, to fill in subtree sizes
+            stack: List[Tuple[Node, int]] = [(tree, 0)]
+            open_nodes: List[int] = []
+            while stack:
+                node, depth = stack.pop()
+                index = len(records) // _NODE_FIELDS
+                while len(open_nodes) > depth:
+                    closed = open_nodes.pop()
+                    records[closed * _NODE_FIELDS + 4] = index - closed
+                open_nodes.append(index)
+                labels = node.labels
+                label_set = label_sets.get(labels)
+                if label_set is None:
+                    label_set = label_sets[labels] = len(label_sets)
+                    label_items.extend(strings.add(label) for label in labels)
+                    label_offsets.append(len(label_items))
+                notes = node.notes
+                records += (
+                    strings.add(node.id),
+                    strings.add(node.title),
+                    NO_NOTES if notes is None else strings.add(notes),
+                    label_set,
+                    0,
+                )
+                stack.extend((child, depth + 1) for child in reversed(node.children))
+            end = len(records) // _NODE_FIELDS
+            for closed in open_nodes:
+                records[closed * _NODE_FIELDS + 4] = end - closed
+
+        relation_records: List[int] = []
+        for relation in mindmap.relations:
+            relation_records += (
+                strings.add(relation.id),
+                strings.add(relation.source_id),
+                strings.add(relation.target_id),
+                strings.add(relation.title),
+            )
+        title = strings.add(mindmap.title)
+
+        string_offsets = [0, *itertools.accumulate(map(len, strings.indexes))]
+        text = "".join(strings.indexes).encode("utf-8", "surrogatepass")
+
+        node_count = len(records) // _NODE_FIELDS
+        relation_count = len(mindmap.relations)
+        counts = (node_count, len(roots), relation_count, len(strings.indexes), len(label_sets) - 1, len(label_items))
+        sections = _Sections(*counts)
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=max(sections.text + len(text), 1))
+        buf = self._shm.buf
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, mindmap.topic_node is not None, title, *counts, len(text))
+        for offset, typecode, values in (
+            (sections.string_offsets, "Q", string_offsets),
+            (sections.nodes, "I", records),
+            (sections.label_offsets, "I", label_offsets),
+            (sections.label_items, "I", label_items),
+            (sections.relations, "I", relation_records),
+            (sections.roots, "I", roots),
+            (sections.text, "B", text),
+        ):
+            data = memoryview(array(typecode, values)).cast("B")
+            buf[offset : offset + len(data)] = data
+
+    @property
+    def name(self) -> str:
+        """Name that workers pass to attach()"""
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        """Size of the shared memory block in bytes"""
+        return self._shm.size
+
+    def close(self) -> None:
+        """Close this process's mapping; the block stays available to workers"""
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Close and free the block; views still attached keep their mapping until closed"""
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedMindMap":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.unlink()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Sent to a worker, a published map arrives as a view attached by name
+        return attach, (self.name,)
+
+    def __repr__(self) -> str:
+        return f"SharedMindMap(name='{self.name}', size={self.size})"
+
+
+class _Layout:
+    """Typed views of an attached block"""
+
+    def __init__(self, shm: shared_memory.SharedMemory) -> None:
+        self.shm = shm
+        self.closed = True
+        buf = shm.buf
+        magic, version, has_topic, title, nodes, roots, relations, strings, label_sets, label_items, text_size = (
+            _HEADER.unpack_from(buf, 0)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Shared memory block {shm.name} does not hold a published mind map")
+        sections = _Sections(nodes, roots, relations, strings, label_sets, label_items)
+        self.has_topic: bool = bool(has_topic)
+        self.title_index: int = title
+        self.string_offsets = buf[sections.string_offsets : sections.string_offsets + 8 * (strings + 1)].cast("Q")
+        self.nodes = buf[sections.nodes : sections.nodes + 4 * _NODE_FIELDS * nodes].cast("I")
+        self.label_offsets = buf[sections.label_offsets : sections.label_offsets + 4 * (label_sets + 1)].cast("I")
+        self.label_items = buf[sections.label_items : sections.label_items + 4 * label_items].cast("I")
+        self.relations = buf[sections.relations : sections.relations + 16 * relations].cast("I")
+        self.roots = buf[sections.roots : sections.roots + 4 * roots].cast("I")
+        # Decoded and split once: renderers read every field, so per-access decoding would cost more
+        with buf[sections.text : sections.text + text_size] as text:
+            decoded = str(text, "utf-8", "surrogatepass")
+        offsets = self.string_offsets
+        self.strings: List[str] = [decoded[offsets[i] : offsets[i + 1]] for i in range(strings)]
+        self._labels: Dict[int, Tuple[str, ...]] = {0: ()}
+        self.closed = False
+
+    def string(self, index: int) -> str:
+        return self.strings[index]
+
+    def labels(self, label_set: int) -> Tuple[str, ...]:
+        # Few distinct label sets exist, so decoded tuples are kept
+        labels = self._labels.get(label_set)
+        if labels is None:
+            items = self.label_items[self.label_offsets[label_set - 1] : self.label_offsets[label_set]]
+            labels = self._labels[label_set] = tuple(self.string(item) for item in items)
+        return labels
+
+    def release(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for view in (
+            self.string_offsets,
+            self.nodes,
+            self.label_offsets,
+            self.label_items,
+            self.relations,
+            self.roots,
+        ):
+            view.release()
+        self.shm.close()
+
+    def __del__(self) -> None:
+        # The block can only be unmapped once the typed views are released
+        self.release()
+
+
+class SharedNode(TopicNode):
+    """Read-only node decoded from a shared memory block on access"""
+
+    __slots__ = ("_layout", "_record", "_children")
+
+    def __init__(self, layout: _Layout, index: int) -> None:
+        # Node.__init__ is not called: fields are read from the shared block
+        self._layout = layout
+        self._record = index * _NODE_FIELDS
+        self._children: Optional[List["SharedNode"]] = None
+
+    # Fields are read inline rather than through _Layout.string: renderers read them for every node
+
+    @property
+    def id(self) -> str:  # type: ignore[override]
+        layout = self._layout
+        return layout.strings[layout.nodes[self._record]]
+
+    @property
+    def title(self) -> str:  # type: ignore[override]
+        layout = self._layout
+        return layout.strings[layout.nodes[self._record + 1]]
+
+    @property
+    def notes(self) -> Optional[str]:  # type: ignore[override]
+        layout = self._layout
+        index = layout.nodes[self._record + 2]
+        return None if index == NO_NOTES else layout.strings[index]
+
+    @property
+    def labels(self) -> Tuple[str, ...]:  # type: ignore[override]
+        label_set = self._layout.nodes[self._record + 3]
+        return self._layout.labels(label_set) if label_set else ()
+
+    @property
+    def children(self) -> List["SharedNode"]:  # type: ignore[override]
+        if self._children is None:
+            self._expand()
+        return self._children  # type: ignore[return-value]
+
+    def _expand(self) -> None:
+        """Create the child lists of the whole subtree in one pass
+
+        Renderers walk entire subtrees, so one flat loop over the records is
+        far cheaper than building each list on first access.
+        """
+        layout, nodes = self._layout, self._layout.nodes
+        start = self._record // _NODE_FIELDS
+        # Open nodes with their child lists and the record index where each subtree ends
+        parents: List["SharedNode"] = [self]
+        lists: List[List["SharedNode"]] = [[]]
+        ends: List[int] = [start + nodes[self._record + 4]]
+        for index in range(start + 1, ends[0]):
+            while index >= ends[-1]:
+                parents.pop()._children = lists.pop()
+                ends.pop()
+            node = SharedNode(layout, index)
+            lists[-1].append(node)
+            size = nodes[index * _NODE_FIELDS + 4]
+            if size > 1:
+                parents.append(node)
+                lists.append([])
+                ends.append(index + size)
+            else:
+                node._children = []
+        while parents:
+            parents.pop()._children = lists.pop()
+
+    def add_child(self, child: Node) -> None:
+        raise TypeError("SharedNode is read-only")
+
+    def remove_child(self, child: Node) -> None:
+        raise TypeError("SharedNode is read-only")
+
+    def add_label(self, label: str) -> None:
+        raise TypeError("SharedNode is read-only")
+
+    def remove_label(self, label: str) -> None:
+        raise TypeError("SharedNode is read-only")
+
+    def replace(self, **changes: Any) -> Node:  # type: ignore[override]
+        raise TypeError("SharedNode is read-only")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        raise TypeError("SharedNode cannot be pickled; send the SharedMindMapView, which is attached again by name")
+
+
+class SharedMindMapView(MindMap):
+    """Read-only mind map attached to a shared memory block
+
+    Call ``close()`` (or use the view as a context manager) when done; nodes
+    of a closed view can no longer be read.
+    """
+
+    def __init__(self, name: str) -> None:
+        # MindMap.__init__ is not called: fields are read from the shared block
+        self._layout = _Layout(_open_block(name))
+        layout = self._layout
+        roots = [SharedNode(layout, index) for index in layout.roots]
+        self.name: str = name
+        self.title: str = layout.string(layout.title_index)
+        self.topic_node: Optional[TopicNode] = roots[0] if layout.has_topic else None
+        self.detached_nodes: List[SharedNode] = roots[1:] if layout.has_topic else roots  # type: ignore[assignment]
+        self._relations: Optional[List[Relation]] = None
+        self._relation_index = None
+        self._relation_index_state = None
+
+    @property
+    def relations(self) -> List[Relation]:  # type: ignore[override]
+        if self._relations is None:
+            layout, records = self._layout, self._layout.relations
+            self._relations = [
+                Relation(
+                    layout.string(records[offset + 1]),
+                    layout.string(records[offset + 2]),
+                    layout.string(records[offset]),
+                    layout.string(records[offset + 3]),
+                )
+                for offset in range(0, len(records), 4)
+            ]
+        return self._relations
+
+    def close(self) -> None:
+        """Release the mapping of the shared block"""
+        self._layout.release()
+
+    def __enter__(self) -> "SharedMindMapView":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return attach, (self.name,)
+
+
+_TRACK_PARAMETER = "track" in inspect.signature(shared_memory.SharedMemory).parameters
+_register_lock = threading.Lock()
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    """Open an existing block without registering it with the resource tracker
+
+    Only the publisher owns the block. Before Python 3.13 attaching registers
+    it too, and the tracker of a process not started by the publisher would
+    unlink the block when that process exits.
+    """
+    if _TRACK_PARAMETER:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    with _register_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None  # type: ignore[assignment]
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register  # type: ignore[assignment]
+
+
+def publish(mindmap: MindMap, name: Optional[str] = None) -> SharedMindMap:
+    """Publish a mind map to shared memory for worker processes
+
+    Args:
+        mindmap: Mind map to publish
+        name: Name of the shared memory block (default: a random name)
+
+    Returns:
+        SharedMindMap owning the block; pass its ``name`` (or the object itself) to workers
+    """
+    return SharedMindMap(mindmap, name)
+
+
+def attach(name: str) -> SharedMindMapView:
+    """Attach to a published mind map
+
+    Args:
+        name: Name of the shared memory block
+
+    Returns:
+        Read-only view usable wherever a MindMap is accepted
+
+    Raises:
+        FileNotFoundError: If no block has the name
+        ValueError: If the block does not hold a published mind map
+    """
+    return SharedMindMapView(name)
@@ -0,0 +1,133 @@
+"""Content-based format detection
+
+Formats are recognised from the first few KB of data, so files with wrong or
+missing extensions can be loaded without trial parsing. For XMind archives
+only the zip central directory is read to tell XMind Zen (``content.json``)
+from legacy XMind (``content.xml``).
+"""
+
+import csv
+import os
+import zipfile
+from typing import BinaryIO, Optional, Union
+
+#: Number of leading bytes inspected
+SNIFF_SIZE = 4096
+
+#: XMind Zen and later, sheets in content.json
+XMIND_ZEN = "zen"
+#: XMind 8 and earlier, sheets in content.xml
+XMIND_LEGACY = "legacy"
+
+_ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+_BOMS = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+_CSV_DELIMITERS = ",;\t|"
+
+
+def sniff_bytes(head: bytes) -> Optional[str]:
+    """Detect the format of serialized mind map data from its first bytes
+
+    Args:
+        head: Leading bytes of the data, SNIFF_SIZE is enough
+
+    Returns:
+        Format type ("xmind", "sqlite", "json", "html", "md", "csv") or None if unrecognised
+    """
+    if head.startswith(_ZIP_MAGIC):
+        return "xmind"
+    if head.startswith(_SQLITE_MAGIC):
+        return "sqlite"
+
+    for bom in _BOMS:
+        if head.startswith(bom):
+            head = head[len(bom) :]
+            break
+    # The head may end inside a multi-byte character
+    text = head.decode("utf-8", errors="ignore").lstrip()
+    if not text:
+        return None
+
+    if text[0] in "{[":
+        return "json"
+
+    if text[0] == "<":
+        lowered = text.lower()
+        if lowered.startswith("<!doctype html") or "<html" in lowered or "<h1" in lowered:
+            return "html"
+        return None
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if lines[0].startswith("#"):
+        return "md"
+    if _looks_like_csv(lines):
+        return "csv"
+    if any(line.startswith("#") for line in lines):
+        return "md"
+    return None
+
+
+def _looks_like_csv(lines: list) -> bool:
+    """Check for the converter's header, or rows with a consistent field count"""
+    # The last line may be cut off by the read limit
+    complete = lines[:-1] if len(lines) > 1 else lines
+    header = [field.strip().lower() for field in next(csv.reader(complete[:1]))]
+    if header[:2] == ["parent", "child"]:
+        return True
+    if len(complete) < 2:
+        return False
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(complete), delimiters=_CSV_DELIMITERS)
+    except csv.Error:
+        return False
+    counts = {len(row) for row in csv.reader(complete, dialect)}
+    return len(counts) == 1 and counts.pop() >= 2
+
+
+def sniff(source: Union[str, BinaryIO]) -> Optional[str]:
+    """Detect the format of a file or seekable binary stream
+
+    Only SNIFF_SIZE bytes are read; a stream is returned to its starting position.
+
+    Args:
+        source: File path or seekable binary stream
+
+    Returns:
+        Format type or None if unrecognised
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return sniff_bytes(f.read(SNIFF_SIZE))
+
+    start = source.tell()
+    try:
+        return sniff_bytes(source.read(SNIFF_SIZE))
+    finally:
+        source.seek(start)
+
+
+def sniff_xmind_variant(source: Union[str, BinaryIO]) -> Optional[str]:
+    """Tell XMind Zen from legacy XMind using only the zip central directory
+
+    Zen files may carry a compatibility content.xml, so content.json decides.
+
+    Args:
+        source: File path or seekable binary stream of an XMind archive
+
+    Returns:
+        XMIND_ZEN, XMIND_LEGACY, or None if the data is not an XMind archive
+    """
+    start = None if isinstance(source, (str, os.PathLike)) else source.tell()
+    try:
+        with zipfile.ZipFile(source) as zf:
+            names = set(zf.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return None
+    finally:
+        if start is not None:
+            source.seek(start)
+    if "content.json" in names:
+        return XMIND_ZEN
+    if "content.xml" in names:
+        return XMIND_LEGACY
+    return None
@@ -0,0 +1,119 @@
+"""Single-pass mind map statistics"""
+
+from typing import Any, Dict, List, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import MindMap, Node
+
+
+class MindMapStats:
+    """Size and shape statistics of a mind map
+
+    Depth and fan-out figures describe the topic tree; detached trees are
+    reported separately in ``detached_tree_sizes``.
+    """
+
+    def __init__(self) -> None:
+        self.node_count: int = 0
+        self.topic_node_count: int = 0
+        self.depth: int = 0
+        self.depth_histogram: Dict[int, int] = {}
+        self.leaf_count: int = 0
+        self.max_fanout: int = 0
+        self.mean_fanout: float = 0.0
+        self.title_bytes: int = 0
+        self.notes_bytes: int = 0
+        self.label_counts: Dict[str, int] = {}
+        self.detached_tree_sizes: List[int] = []
+        self.relation_count: int = 0
+        self.dangling_relation_count: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a JSON-serializable dictionary"""
+        return {
+            "node_count": self.node_count,
+            "topic_node_count": self.topic_node_count,
+            "depth": self.depth,
+            "depth_histogram": {str(depth): count for depth, count in sorted(self.depth_histogram.items())},
+            "leaf_count": self.leaf_count,
+            "max_fanout": self.max_fanout,
+            "mean_fanout": self.mean_fanout,
+            "title_bytes": self.title_bytes,
+            "notes_bytes": self.notes_bytes,
+            "label_counts": dict(sorted(self.label_counts.items(), key=lambda item: (-item[1], item[0]))),
+            "detached_tree_sizes": list(self.detached_tree_sizes),
+            "relation_count": self.relation_count,
+            "dangling_relation_count": self.dangling_relation_count,
+        }
+
+    def __repr__(self) -> str:
+        """Detailed representation of statistics"""
+        return (
+            f"MindMapStats(node_count={self.node_count}, depth={self.depth}, max_fanout={self.max_fanout}, "
+            f"relations={self.relation_count}, dangling_relations={self.dangling_relation_count})"
+        )
+
+
+def collect_stats(mindmap: "MindMap") -> MindMapStats:
+    """Compute statistics in one iterative pass over every node
+
+    Args:
+        mindmap: MindMap to measure
+
+    Returns:
+        MindMapStats object
+    """
+    stats = MindMapStats()
+    node_ids: Set[str] = set()
+    label_counts = stats.label_counts
+    histogram = stats.depth_histogram
+    internal_nodes = 0
+    child_total = 0
+
+    # Tree index 0 is the topic tree, 1.. are detached trees
+    roots: List[Tuple["Node", int]] = []
+    if mindmap.topic_node is not None:
+        roots.append((mindmap.topic_node, 0))
+    roots.extend((node, index + 1) for index, node in enumerate(mindmap.detached_nodes))
+    stats.detached_tree_sizes = [0] * len(mindmap.detached_nodes)
+
+    for root, tree in roots:
+        stack: List[Tuple["Node", int]] = [(root, 1)]
+        size = 0
+        while stack:
+            node, depth = stack.pop()
+            size += 1
+            node_ids.add(node.id)
+            stats.title_bytes += len(node.title.encode("utf-8"))
+            if node.notes:
+                stats.notes_bytes += len(node.notes.encode("utf-8"))
+            for label in node.labels:
+                label_counts[label] = label_counts.get(label, 0) + 1
+
+            children = node.children
+            if tree == 0:
+                histogram[depth] = histogram.get(depth, 0) + 1
+                if children:
+                    internal_nodes += 1
+                    child_total += len(children)
+                    if len(children) > stats.max_fanout:
+                        stats.max_fanout = len(children)
+                else:
+                    stats.leaf_count += 1
+            for child in children:
+                stack.append((child, depth + 1))
+
+        if tree == 0:
+            stats.topic_node_count = size
+        else:
+            stats.detached_tree_sizes[tree - 1] = size
+        stats.node_count += size
+
+    stats.depth = max(histogram) if histogram else 0
+    stats.mean_fanout = child_total / internal_nodes if internal_nodes else 0.0
+
+    stats.relation_count = len(mindmap.relations)
+    stats.dangling_relation_count = sum(
+        1 for relation in mindmap.relations if relation.source_id not in node_ids or relation.target_id not in node_ids
+    )
+    return stats
@@ -0,0 +1,276 @@
+"""Watch a directory and re-convert mind maps whose content changed"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .core import CoreConverter
+from .exceptions import XMindConverterError
+
+STATE_FILE = ".xmind-converter-state.json"
+_STATE_VERSION = 1
+
+_worker: Optional[CoreConverter] = None
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _convert_if_changed(
+    input_path: str, known_digest: Optional[str], targets: Sequence[Tuple[str, str]]
+) -> Tuple[str, bool, Optional[str]]:
+    """Hash a file and convert it to every target unless it is unchanged
+
+    Runs in a worker process, so hashing large files never blocks the polling loop.
+
+    Returns:
+        Tuple of (sha256 digest, whether the file was converted, error message)
+    """
+    global _worker
+    try:
+        digest = _file_digest(input_path)
+    except OSError as e:
+        return "", False, str(e)
+    if digest == known_digest and all(os.path.exists(path) for _, path in targets):
+        return digest, False, None
+
+    if _worker is None:
+        _worker = CoreConverter()
+    try:
+        mindmap = _worker.load_from(input_path)
+        for format_type, output_path in targets:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            _worker.convert_to(mindmap, format_type, output_path)
+    except (XMindConverterError, OSError) as e:
+        return digest, False, str(e)
+    return digest, True, None
+
+
+class WatchResult:
+    """Outcome of re-converting one changed file"""
+
+    def __init__(self, path: str, outputs: List[str], error: Optional[str] = None) -> None:
+        self.path: str = path
+        self.outputs: List[str] = outputs
+        self.error: Optional[str] = error
+
+    def __repr__(self) -> str:
+        """Detailed representation of result"""
+        return f"WatchResult(path='{self.path}', outputs={self.outputs}, error={self.error!r})"
+
+
+class Watcher:
+    """Poll a source directory and mirror converted files into a destination directory
+
+    A file is converted once its mtime and size have been stable for
+    ``debounce`` seconds, so rapid successive saves trigger one conversion.
+    Files whose mtime changed but whose SHA-256 digest did not are skipped.
+    Stat and digest state is persisted in ``DST_DIR/.xmind-converter-state.json``,
+    so a restarted watcher only converts what changed while it was down.
+
+    Polling uses ``os.scandir``, which returns file types without extra system
+    calls, and only stats files with a watched extension.
+    """
+
+    def __init__(
+        self,
+        src_dir: str,
+        dst_dir: str,
+        formats: Sequence[str] = ("md",),
+        extensions: Sequence[str] = (".xmind",),
+        debounce: float = 0.5,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Create watcher
+
+        Args:
+            src_dir: Directory to watch, including subdirectories
+            dst_dir: Directory receiving converted files, mirroring the source layout
+            formats: Output formats, e.g. ("md", "html")
+            extensions: Source file extensions to watch
+            debounce: Seconds a file must stay unchanged before it is converted
+            workers: Number of worker processes (default: CPU count)
+            executor: Executor to run conversions in instead of a private process pool
+        """
+        self.src_dir = os.path.abspath(src_dir)
+        self.dst_dir = os.path.abspath(dst_dir)
+        self.formats = [format_type.lower() for format_type in formats]
+        self.extensions = tuple(extension.lower() for extension in extensions)
+        self.debounce = debounce
+        self.state_path = os.path.join(self.dst_dir, STATE_FILE)
+
+        self._own_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=workers)
+        self._max_in_flight = 2 * (workers or os.cpu_count() or 1)
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Tuple[int, int, float]] = {}
+        self._in_flight: Dict[str, Tuple[Future, Tuple[int, int]]] = {}
+        self._failed: Dict[str, Tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._load_state()
+
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get("version") == _STATE_VERSION and state.get("formats") == self.formats:
+            self._files = state.get("files", {})
+
+    def _save_state(self) -> None:
+        os.makedirs(self.dst_dir, exist_ok=True)
+        state = {"version": _STATE_VERSION, "formats": self.formats, "files": self._files}
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Get (mtime_ns, size) of every watched file, keyed by path relative to the source directory"""
+        result: Dict[str, Tuple[int, int]] = {}
+        extensions = self.extensions
+        stack = [(self.src_dir, "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path != self.dst_dir:
+                                stack.append((entry.path, prefix + entry.name + os.sep))
+                        elif entry.name.lower().endswith(extensions):
+                            stat = entry.stat()
+                            result[prefix + entry.name] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return result
+
+    def _targets(self, relative_path: str) -> List[Tuple[str, str]]:
+        base = os.path.splitext(os.path.join(self.dst_dir, relative_path))[0]
+        return [(format_type, f"{base}.{format_type}") for format_type in self.formats]
+
+    def poll(self, force: bool = False) -> List[WatchResult]:
+        """Scan once, start conversions of settled files and collect finished ones
+
+        Args:
+            force: Ignore the debounce delay
+
+        Returns:
+            Results of conversions that finished since the last poll
+        """
+        now = time.monotonic()
+        current = self.scan()
+
+        for relative_path in list(self._files):
+            if relative_path not in current:
+                del self._files[relative_path]
+        for pending_map in (self._pending, self._failed):
+            for relative_path in list(pending_map):
+                if relative_path not in current:
+                    del pending_map[relative_path]
+
+        ready: List[str] = []
+        for relative_path, stat in current.items():
+            known = self._files.get(relative_path)
+            settled = known is not None and (known["mtime_ns"], known["size"]) == stat
+            if settled or self._failed.get(relative_path) == stat:
+                self._pending.pop(relative_path, None)
+                continue
+            pending = self._pending.get(relative_path)
+            if pending is None or pending[:2] != stat:
+                self._pending[relative_path] = (stat[0], stat[1], now)
+                if not force:
+                    continue
+            if force or now - self._pending[relative_path][2] >= self.debounce:
+                ready.append(relative_path)
+
+        for relative_path in ready:
+            if relative_path in self._in_flight or len(self._in_flight) >= self._max_in_flight:
+                continue
+            known = self._files.get(relative_path)
+            future = self._executor.submit(
+                _convert_if_changed,
+                os.path.join(self.src_dir, relative_path),
+                known["sha256"] if known else None,
+                self._targets(relative_path),
+            )
+            self._in_flight[relative_path] = (future, current[relative_path])
+            del self._pending[relative_path]
+
+        return self._collect(wait=force)
+
+    def _collect(self, wait: bool) -> List[WatchResult]:
+        results: List[WatchResult] = []
+        changed = False
+        for relative_path, (future, stat) in list(self._in_flight.items()):
+            if not wait and not future.done():
+                continue
+            del self._in_flight[relative_path]
+            try:
+                digest, converted, error = future.result()
+            except Exception as e:
+                digest, converted, error = "", False, str(e)
+
+            if error is None:
+                self._files[relative_path] = {"mtime_ns": stat[0], "size": stat[1], "sha256": digest}
+                self._failed.pop(relative_path, None)
+                changed = True
+            else:
+                # Retry only after the file changes again
+                self._failed[relative_path] = stat
+            if converted or error is not None:
+                outputs = [path for _, path in self._targets(relative_path)] if converted else []
+                results.append(WatchResult(relative_path, outputs, error))
+        if changed:
+            self._save_state()
+        return results
+
+    def run_once(self) -> List[WatchResult]:
+        """Convert every changed file without debouncing and wait for completion"""
+        results = self.poll(force=True)
+        while self._in_flight or self._pending:
+            results.extend(self.poll(force=True))
+        return results
+
+    def run(self, interval: float = 1.0, callback: Optional[Callable[[WatchResult], None]] = None) -> None:
+        """Poll until stop() is called
+
+        Args:
+            interval: Seconds between directory scans
+            callback: Called with every WatchResult
+        """
+        while not self._stop.is_set():
+            for result in self.poll():
+                if callback is not None:
+                    callback(result)
+            self._stop.wait(interval)
+
+    def stop(self) -> None:
+        """Stop a running watch loop"""
+        self._stop.set()
+
+    def close(self) -> None:
+        """Wait for running conversions and shut down the private worker pool"""
+        self._collect(wait=True)
+        if self._own_executor:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()